@@ -0,0 +1,48 @@
+"""Admission request context"""
+import sys
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+from app.dryrun.evaluator import is_dry_run
+
+
+@dataclass(frozen=True, slots=True)
+class AdmissionContext:
+    """Fields of an admission request, extracted once and shared by all evaluators"""
+    uid: str
+    kind: str  # lowercased, interned
+    name: str
+    namespace: str
+    operation: str  # uppercased
+    username: str
+    groups: Tuple[str, ...]
+    annotations: Dict[str, str]
+    object_name: Optional[str]  # metadata.name of the submitted object
+    dry_run: bool
+    
+    @classmethod
+    def from_request(cls, request: Dict[str, Any], default_username: str = "") -> "AdmissionContext":
+        """
+        Build context from an AdmissionReview request
+        
+        Args:
+            request: The "request" field of an AdmissionReview
+            default_username: Username to use when userInfo has none
+        
+        Returns:
+            AdmissionContext
+        """
+        user_info = request.get("userInfo") or {}
+        metadata = (request.get("object") or {}).get("metadata") or {}
+        return cls(
+            uid=request.get("uid", ""),
+            kind=sys.intern((request.get("kind") or {}).get("kind", "").lower()),
+            name=request.get("name", ""),
+            namespace=request.get("namespace", ""),
+            operation=request.get("operation", "").upper(),
+            username=user_info.get("username", default_username),
+            groups=tuple(user_info.get("groups") or ()),
+            annotations=metadata.get("annotations") or {},
+            object_name=metadata.get("name"),
+            dry_run=is_dry_run(request)
+        )
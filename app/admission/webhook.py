@@ -4,18 +4,23 @@ import time
 from typing import Dict, Any
 from datetime import datetime, timezone
 
-from app.freeze.evaluator import is_freeze_active
+from app.freeze.evaluator import is_freeze_active_cached
 from app.bypass.evaluator import check_bypass
 from app.metrics.collector import (
     record_admission_request,
     record_freeze_status,
     record_bypass_used
 )
-from app.api.routes import get_exemption_manager
-from app.dryrun.evaluator import is_dry_run, evaluate_dry_run, create_dry_run_response
+from app.api import routes as _routes
+from app.admission.context import AdmissionContext
+from app.dryrun.evaluator import evaluate_dry_run, create_dry_run_response
+from app.utils.background import fire_and_forget
 
 logger = logging.getLogger(__name__)
 
+ADMISSION_API_VERSION = "admission.k8s.io/v1"
+ADMISSION_KIND = "AdmissionReview"
+
 
 async def handle_admission_review(
     body: Dict[str, Any],
@@ -31,127 +36,98 @@ async def handle_admission_review(
     Returns:
         AdmissionReview response
     """
-    start_time = time.time()
-    request = body.get("request", {})
-    uid = request.get("uid", "")
-    kind = request.get("kind", {})
-    resource_kind = kind.get("kind", "").lower()
+    start_ns = time.perf_counter_ns()
+    # Walk the request dict once; evaluators below read from the context
+    ctx = AdmissionContext.from_request(body.get("request", {}))
+    uid = ctx.uid
+    # Interned so lookups against the (also interned) monitored tables can short-circuit on identity
+    resource_kind = ctx.kind
     
     # Get resource info
-    namespace = request.get("namespace", "")
-    name = request.get("name", "")
-    operation = request.get("operation", "").upper()
+    namespace = ctx.namespace
+    name = ctx.name
+    operation = ctx.operation
     
     # Get user info
-    user_info = request.get("userInfo", {})
-    username = user_info.get("username", "")
-    groups = user_info.get("groups", [])
+    username = ctx.username
+    groups = ctx.groups
     
     # Structured logging
-    log_record = logging.LogRecord(
-        name=__name__,
-        level=logging.INFO,
-        pathname="",
-        lineno=0,
-        msg=f"Processing {operation} request",
-        args=(),
-        exc_info=None
-    )
-    log_record.request_id = uid
-    log_record.event = "admission_review"
-    log_record.resource = {
-        "kind": resource_kind,
-        "name": name,
-        "namespace": namespace
-    }
-    log_record.user = {
-        "username": username,
-        "groups": groups
-    }
-    logger.handle(log_record)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Processing %s request", operation, extra={
+            "request_id": uid,
+            "event": "admission_review",
+            "resource": {
+                "kind": resource_kind,
+                "name": name,
+                "namespace": namespace
+            },
+            "user": {
+                "username": username,
+                "groups": list(groups)
+            }
+        })
     
     # Get configuration
     config = config_loader.get_config()
     
+    # Lookup tables precomputed on config load (lowercased set + singular->plural map)
+    monitored_resources, kind_map, exempt_namespaces = config_loader.get_admission_lookups()
+    
     # Check if resource type is monitored
-    # Normalize resource_kind to plural form for comparison (e.g., "deployment" -> "deployments")
     # Kubernetes uses singular for resource kinds, but we store plural in config
-    resource_kind_normalized = resource_kind
-    if resource_kind.endswith('y'):
-        # "deployment" -> "deployments", "policy" -> "policies"
-        resource_kind_normalized = resource_kind[:-1] + 'ies' if resource_kind[-2] in 'aeiou' else resource_kind + 's'
-    elif not resource_kind.endswith('s'):
-        resource_kind_normalized = resource_kind + 's'
+    resource_kind_normalized = kind_map.get(resource_kind, resource_kind)
+    logger.info("Checking resource %s (normalized: %s) against monitored resources: %s", resource_kind, resource_kind_normalized, monitored_resources)
     
-    monitored_resources = [r.lower() for r in config.get("monitored_resources", ["deployments"])]
-    logger.info(f"Checking resource {resource_kind} (normalized: {resource_kind_normalized}) against monitored resources: {monitored_resources}")
-    
-    # Check both singular and plural forms
-    if resource_kind not in monitored_resources and resource_kind_normalized not in monitored_resources:
-        logger.info(f"Resource {resource_kind} not monitored, allowing {resource_kind}/{name} in {namespace}")
-        duration = time.time() - start_time
-        record_admission_request("allow", resource_kind, namespace, duration)
+    if resource_kind_normalized not in monitored_resources:
+        logger.info("Resource %s not monitored, allowing %s/%s in %s", resource_kind, resource_kind, name, namespace)
+        record_admission_request("allow", resource_kind, namespace, (time.perf_counter_ns() - start_ns) * 1e-9)
         return _allow_response(uid)
     
     # Check if dry-run mode
-    dry_run = is_dry_run(request)
-    logger.info(f"Dry-run check for {resource_kind}/{name}: {dry_run}")
+    dry_run = ctx.dry_run
+    logger.info("Dry-run check for %s/%s: %s", resource_kind, name, dry_run)
     
     # Check if namespace is exempt
-    exempt_namespaces = config.get("bypass_exempt_namespaces", [])
-    logger.info(f"Checking if namespace {namespace} is exempt: {exempt_namespaces}")
+    logger.info("Checking if namespace %s is exempt: %s", namespace, exempt_namespaces)
     if namespace in exempt_namespaces:
-        logger.info(f"Namespace {namespace} is exempt, allowing {resource_kind}/{name}")
-        duration = time.time() - start_time
-        record_admission_request("allow", resource_kind, namespace, duration)
+        logger.info("Namespace %s is exempt, allowing %s/%s", namespace, resource_kind, name)
+        record_admission_request("allow", resource_kind, namespace, (time.perf_counter_ns() - start_ns) * 1e-9)
         return _allow_response(uid)
     
-    # Get exemption manager if available
-    exemption_manager = None
-    try:
-        from app.api.routes import _exemption_manager
-        exemption_manager = _exemption_manager
-    except Exception:
-        pass  # Exemption manager not critical
+    # Get exemption manager if available (not critical)
+    exemption_manager = _routes._exemption_manager
     
     # Check bypass mechanisms first
     # Check annotation and user bypass (sync)
-    bypass_result = check_bypass(
-        request=request,
-        config=config,
-        username=username,
-        groups=groups,
-        exemption_manager=None  # Skip exemption check in sync function
-    )
+    bypass_result = check_bypass(ctx, config)
     
-    logger.info(f"Bypass check for {resource_kind}/{name} in {namespace}: allowed={bypass_result.get('allowed')}, reason={bypass_result.get('reason')}, type={bypass_result.get('type')}")
+    logger.info(
+        "Bypass check for %s/%s in %s: allowed=%s, reason=%s, type=%s",
+        resource_kind, name, namespace,
+        bypass_result.get('allowed'), bypass_result.get('reason'), bypass_result.get('type')
+    )
     
     # Check exemption separately (async)
     if not bypass_result["allowed"] and exemption_manager:
         try:
-            namespace = request.get("namespace", "")
-            object_data = request.get("object", {})
-            metadata = object_data.get("metadata", {})
-            resource_name = metadata.get("name")
-            
-            exemption = await exemption_manager.check_exemption(namespace, resource_name)
+            exemption = await exemption_manager.check_exemption(namespace, ctx.object_name)
             if exemption and exemption.is_valid():
                 # Exemptions remain valid for their entire duration and can be used multiple times
                 # We don't mark them as used anymore - they stay valid until expiration
                 
                 # Record history event for exemption usage (for audit purposes only)
                 try:
-                    from app.api.routes import get_history_tracker
-                    tracker = get_history_tracker()
+                    tracker = _routes.get_history_tracker()
                     tracker.record_event(
                         event_type="exemption_used",
                         reason=f"Exemption applied: {exemption.reason} (approved by: {exemption.approved_by})",
                         namespace=exemption.namespace,
                         triggered_by=username or "webhook"
                     )
-                    await tracker.save_to_configmap()
+                    tracker.mark_dirty()
                 except Exception as hist_error:
-                    logger.debug(f"Failed to save exemption usage history: {hist_error}")
+                    logger.debug("Failed to save exemption usage history: %s", hist_error)
                 
                 bypass_result = {
                     "allowed": True,
@@ -159,44 +135,35 @@ async def handle_admission_review(
                     "reason": f"Temporary exemption: {exemption.reason} (expires {exemption.expires_at.isoformat()})"
                 }
         except Exception as e:
-            logger.debug(f"Error checking exemption: {e}")
+            logger.debug("Error checking exemption: %s", e)
     
     if bypass_result["allowed"]:
         bypass_type = bypass_result.get("type", "unknown")
         record_bypass_used(bypass_type, namespace)
         
-        log_record = logging.LogRecord(
-            name=__name__,
-            level=logging.INFO,
-            pathname="",
-            lineno=0,
-            msg="Bypass granted",
-            args=(),
-            exc_info=None
-        )
-        log_record.request_id = uid
-        log_record.event = "bypass_granted"
-        log_record.resource = {"kind": resource_kind, "name": name, "namespace": namespace}
-        log_record.reason = bypass_result["reason"]
-        logger.handle(log_record)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Bypass granted", extra={
+                "request_id": uid,
+                "event": "bypass_granted",
+                "resource": {"kind": resource_kind, "name": name, "namespace": namespace},
+                "reason": bypass_result["reason"]
+            })
         
-        duration = time.time() - start_time
-        record_admission_request("allow", resource_kind, namespace, duration)
+        record_admission_request("allow", resource_kind, namespace, (time.perf_counter_ns() - start_ns) * 1e-9)
         return _allow_response(uid)
     
     # Check if freeze is active
-    freeze_active, freeze_window = is_freeze_active(config, namespace)
+    freeze_active, freeze_window = is_freeze_active_cached(config, namespace, config_loader.config_version)
     
     # Record freeze status
     record_freeze_status(freeze_active, namespace)
     
     # Debug logging
-    logger.info(f"Freeze check for {resource_kind}/{name} in {namespace}: active={freeze_active}, window={freeze_window}")
+    logger.info("Freeze check for %s/%s in %s: active=%s, window=%s", resource_kind, name, namespace, freeze_active, freeze_window)
     
     if not freeze_active:
-        logger.info(f"No freeze active, allowing {resource_kind}/{name} in {namespace}")
-        duration = time.time() - start_time
-        record_admission_request("allow", resource_kind, namespace, duration)
+        logger.info("No freeze active, allowing %s/%s in %s", resource_kind, name, namespace)
+        record_admission_request("allow", resource_kind, namespace, (time.perf_counter_ns() - start_ns) * 1e-9)
         return _allow_response(uid)
     
     # Freeze is active and no bypass - deny (or warn in dry-run)
@@ -212,69 +179,59 @@ async def handle_admission_review(
     if dry_run:
         # In dry-run, always allow but include warnings
         allowed, warnings = evaluate_dry_run(
-            request=request,
+            ctx=ctx,
             would_be_blocked=True,
             reason=freeze_message,
             bypass_available=False,
             bypass_type=None
         )
         
-        logger.info(f"Dry-run: Would block {resource_kind}/{name} in {namespace}: {freeze_message}")
+        logger.info("Dry-run: Would block %s/%s in %s: %s", resource_kind, name, namespace, freeze_message)
         
-        duration = time.time() - start_time
-        record_admission_request("allow", resource_kind, namespace, duration)
+        record_admission_request("allow", resource_kind, namespace, (time.perf_counter_ns() - start_ns) * 1e-9)
         
         return create_dry_run_response(uid, warnings)
     
     # Normal mode - deny
-    log_record = logging.LogRecord(
-        name=__name__,
-        level=logging.WARNING,
-        pathname="",
-        lineno=0,
-        msg="Deployment denied: Freeze active",
-        args=(),
-        exc_info=None
-    )
-    log_record.request_id = uid
-    log_record.event = "admission_denied"
-    log_record.resource = {"kind": resource_kind, "name": name, "namespace": namespace}
-    log_record.decision = "deny"
-    log_record.reason = "freeze_active"
-    log_record.freeze_window = freeze_window
-    logger.handle(log_record)
+    if logger.isEnabledFor(logging.WARNING):
+        logger.warning("Deployment denied: Freeze active", extra={
+            "request_id": uid,
+            "event": "admission_denied",
+            "resource": {"kind": resource_kind, "name": name, "namespace": namespace},
+            "decision": "deny",
+            "reason": "freeze_active",
+            "freeze_window": freeze_window
+        })
+    
+    record_admission_request("deny", resource_kind, namespace, (time.perf_counter_ns() - start_ns) * 1e-9)
     
-    duration = time.time() - start_time
-    record_admission_request("deny", resource_kind, namespace, duration)
+    # Side effects below run in the background so they don't add to admission latency
     
     # Send violation notification (Phase 4)
     try:
-        from app.api.routes import get_notification_manager
-        notif_mgr = get_notification_manager()
-        if notif_mgr:
-            await notif_mgr.send_notification("violation", {
+        notif_mgr = _routes.get_notification_manager()
+        if notif_mgr and notif_mgr.has_subscribers_for("violation"):
+            fire_and_forget(notif_mgr.send_notification("violation", {
                 "resource": f"{resource_kind}/{name}",
                 "namespace": namespace,
                 "user": username,
                 "freeze_window": freeze_window or "Manual Freeze"
-            })
+            }), "violation notification")
     except Exception as e:
-        logger.debug(f"Error sending violation notification: {e}")
+        logger.debug("Error sending violation notification: %s", e)
     
     # Audit log violation (Phase 4)
     try:
-        from app.api.routes import get_audit_logger
-        from app.audit.logger import AuditActor, AuditResource
-        audit = get_audit_logger()
-        if audit:
+        audit = _routes.get_audit_logger()
+        if audit and audit.enabled:
             actor = audit.create_actor(username, "serviceaccount" if "serviceaccount" in username else "user")
             resource = audit.create_resource(resource_kind, name, namespace)
-            await audit.log_event("violation", actor, resource, "denied", {
+            fire_and_forget(audit.log_event("violation", actor, resource, "denied", {
                 "freeze_window": freeze_window,
                 "reason": freeze_message
-            })
+            }), "violation audit event")
     except Exception as e:
-        logger.debug(f"Error logging audit event: {e}")
+        logger.debug("Error logging audit event: %s", e)
     
     return _deny_response(
         uid=uid,
@@ -285,28 +242,22 @@ async def handle_admission_review(
 
 def _allow_response(uid: str) -> Dict[str, Any]:
     """Create allow response"""
+    # Only the nested response varies per request; the envelope keys are constants
     return {
-        "apiVersion": "admission.k8s.io/v1",
-        "kind": "AdmissionReview",
-        "response": {
-            "uid": uid,
-            "allowed": True
-        }
+        "apiVersion": ADMISSION_API_VERSION,
+        "kind": ADMISSION_KIND,
+        "response": {"uid": uid, "allowed": True}
     }
 
 
 def _deny_response(uid: str, message: str, code: int = 403) -> Dict[str, Any]:
     """Create deny response"""
     return {
-        "apiVersion": "admission.k8s.io/v1",
-        "kind": "AdmissionReview",
+        "apiVersion": ADMISSION_API_VERSION,
+        "kind": ADMISSION_KIND,
         "response": {
             "uid": uid,
             "allowed": False,
-            "status": {
-                "code": code,
-                "message": message
-            }
+            "status": {"code": code, "message": message}
         }
     }
-
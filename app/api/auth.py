@@ -1,9 +1,17 @@
 """API authentication"""
+import asyncio
+import functools
 import logging
 import os
+import time
 import base64
-from typing import Optional, Dict, Any, List
-from datetime import datetime, timezone, timedelta
+import hashlib
+import hmac
+import secrets
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Optional, Dict, Any, FrozenSet, List, Mapping, Tuple
 from fastapi import Request, HTTPException, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
@@ -12,89 +20,175 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer(auto_error=False)
 
 # Cache for API keys (loaded from Secret)
-_api_keys: Dict[str, str] = {}
-_api_keys_last_load: Optional[datetime] = None
+# The snapshot is an immutable mapping that is replaced wholesale on reload, so readers
+# never observe a half-built dict and need no lock. It is keyed by the HMAC-SHA256 digest
+# of each key rather than the raw key, so lookups are fixed-length and keys aren't kept
+# in plain text
+_api_keys_snapshot: Mapping[bytes, str] = MappingProxyType({})
+_api_keys_last_load: Optional[float] = None  # time.monotonic() of last load
 _api_keys_cache_ttl: int = 30  # Reload every 30 seconds
+_api_keys_reload_lock = threading.Lock()
+# resourceVersion of the last decoded Secret and the keys decoded from it
+_api_keys_secret_rv: Optional[str] = None
+_api_keys_from_secret: Mapping[bytes, str] = MappingProxyType({})
+# Per-process secret used to digest API keys (keys are reloaded in-process, so it never needs to persist)
+_API_KEY_PEPPER = secrets.token_bytes(32)
 
+# Cache of successful TokenReview results, keyed by SHA-256 digest of the token
+# (raw tokens are never kept in memory); values are (time.monotonic() of review, user info)
+_token_review_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_token_review_cache_ttl: int = 60  # seconds
+_token_review_cache_max_size: int = 4096
 
-def _load_api_keys(force_reload: bool = False) -> Dict[str, str]:
+
+def _looks_like_jwt(token: str) -> bool:
+    """Check if a token has the shape of a JWT (base64url JSON header, three dot-separated parts)"""
+    return token.startswith("eyJ") and token.count(".") == 2
+
+
+def _api_key_digest(api_key: str) -> bytes:
+    """Digest an API key for storage in / lookup against the key snapshot"""
+    return hmac.new(_API_KEY_PEPPER, api_key.encode(), hashlib.sha256).digest()
+
+
+def _load_api_keys(force_reload: bool = False) -> Mapping[bytes, str]:
     """
     Load API keys from Secret or environment
     
+    Only one reload runs at a time; concurrent callers get the current snapshot.
+    
     Args:
         force_reload: If True, reload even if cache is still valid
     
     Returns:
-        Dictionary mapping API keys to usernames
+        Read-only mapping of API key digests to usernames
     """
-    global _api_keys, _api_keys_last_load
+    global _api_keys_snapshot, _api_keys_last_load, _api_keys_secret_rv, _api_keys_from_secret
     
     # Check if cache is still valid (unless force reload)
-    if not force_reload and _api_keys_last_load:
-        age = (datetime.now(timezone.utc) - _api_keys_last_load).total_seconds()
-        if age < _api_keys_cache_ttl:
-            return _api_keys
+    if not force_reload and _api_keys_last_load is not None:
+        if time.monotonic() - _api_keys_last_load < _api_keys_cache_ttl:
+            return _api_keys_snapshot
     
-    # Clear existing keys
-    _api_keys = {}
+    if not _api_keys_reload_lock.acquire(blocking=False):
+        # Another reload is in progress
+        return _api_keys_snapshot
     
     try:
-        from kubernetes import client
-        import base64
-        v1 = client.CoreV1Api()
-        namespace = os.getenv("NAMESPACE", "kube-freezer")
+        api_keys: Dict[bytes, str] = {}
         
         try:
-            # Try to load from Secret (more secure than ConfigMap)
-            secret = v1.read_namespaced_secret("kube-freezer-api-keys", namespace)
-            if secret.data:
-                for key, value in secret.data.items():
-                    if key.startswith("api_key_"):
-                        # Decode base64 value from Secret
-                        decoded_value = base64.b64decode(value).decode('utf-8')
-                        _api_keys[decoded_value] = key.replace("api_key_", "")
-            logger.info(f"Loaded {len(_api_keys)} API keys from Secret")
-            if _api_keys:
-                logger.debug(f"API key usernames: {list(_api_keys.values())}")
+            from app.utils.kubernetes import get_k8s_client
+            v1 = get_k8s_client()
+            namespace = os.getenv("NAMESPACE", "kube-freezer")
+            
+            try:
+                # Try to load from Secret (more secure than ConfigMap)
+                secret = v1.read_namespaced_secret("kube-freezer-api-keys", namespace)
+                resource_version = secret.metadata.resource_version if secret.metadata else None
+                if resource_version is not None and resource_version == _api_keys_secret_rv:
+                    # Secret unchanged since the last load, reuse the decoded keys
+                    api_keys.update(_api_keys_from_secret)
+                    logger.debug(f"API keys Secret unchanged (resourceVersion {resource_version})")
+                else:
+                    secret_keys: Dict[bytes, str] = {}
+                    if secret.data:
+                        for key, value in secret.data.items():
+                            if key.startswith("api_key_"):
+                                # Decode base64 value from Secret
+                                decoded_value = base64.b64decode(value).decode('utf-8')
+                                secret_keys[_api_key_digest(decoded_value)] = key.replace("api_key_", "")
+                    _api_keys_from_secret = MappingProxyType(secret_keys)
+                    _api_keys_secret_rv = resource_version
+                    api_keys.update(secret_keys)
+                    logger.info(f"Loaded {len(secret_keys)} API keys from Secret")
+                    if secret_keys:
+                        logger.debug(f"API key usernames: {list(secret_keys.values())}")
+            except Exception as e:
+                logger.warning(f"Could not load API keys from Secret: {e}", exc_info=True)
+            
+            # Also check environment variable (for testing/development)
+            env_key = os.getenv("API_KEY")
+            if env_key:
+                api_keys[_api_key_digest(env_key)] = "env-user"
+                logger.info("Loaded API key from environment")
+                
         except Exception as e:
-            logger.warning(f"Could not load API keys from Secret: {e}", exc_info=True)
+            logger.warning(f"Could not load API keys: {e}")
         
-        # Also check environment variable (for testing/development)
-        env_key = os.getenv("API_KEY")
-        if env_key:
-            _api_keys[env_key] = "env-user"
-            logger.info("Loaded API key from environment")
-            
-    except Exception as e:
-        logger.warning(f"Could not load API keys: {e}")
+        # Publish the new snapshot with a single reference swap
+        _api_keys_snapshot = MappingProxyType(api_keys)
+        _api_keys_last_load = time.monotonic()
+        return _api_keys_snapshot
+    finally:
+        _api_keys_reload_lock.release()
+
+
+async def _get_api_keys(force_reload: bool = False) -> Mapping[bytes, str]:
+    """
+    Get API keys without blocking the event loop
     
-    _api_keys_last_load = datetime.now(timezone.utc)
-    return _api_keys
+    Returns the cached snapshot directly while it is fresh; otherwise the
+    Secret read runs in a worker thread.
+    """
+    if not force_reload and _api_keys_last_load is not None:
+        if time.monotonic() - _api_keys_last_load < _api_keys_cache_ttl:
+            return _api_keys_snapshot
+    return await asyncio.to_thread(_load_api_keys, force_reload)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_auth_api():
+    """Get the shared AuthenticationV1Api client"""
+    from kubernetes import client
+    return client.AuthenticationV1Api()
 
 
 async def _validate_serviceaccount_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Validate Kubernetes ServiceAccount token by calling TokenReview API
     
+    Successful reviews are cached for _token_review_cache_ttl seconds so a
+    client reusing its token does not cost an API server round-trip per request.
+    
     Args:
         token: ServiceAccount token to validate
     
     Returns:
         UserInfo dict if valid, None otherwise
     """
+    token_hash = hashlib.sha256(token.encode()).digest()
+    now = time.monotonic()
+    cached = _token_review_cache.get(token_hash)
+    if cached is not None:
+        if now - cached[0] < _token_review_cache_ttl:
+            _token_review_cache.move_to_end(token_hash)
+            return cached[1]
+        del _token_review_cache[token_hash]
+    
+    user_info = await _review_serviceaccount_token(token)
+    if user_info is not None:
+        _token_review_cache[token_hash] = (now, user_info)
+        if len(_token_review_cache) > _token_review_cache_max_size:
+            _token_review_cache.popitem(last=False)  # Evict least recently used
+    return user_info
+
+
+async def _review_serviceaccount_token(token: str) -> Optional[Dict[str, Any]]:
+    """Call the TokenReview API for a token (uncached)"""
     try:
         from kubernetes import client
         from kubernetes.client.rest import ApiException
         
-        auth_api = client.AuthenticationV1Api()
+        auth_api = _get_auth_api()
         
         # Create TokenReview request
         token_review = client.V1TokenReview(
             spec=client.V1TokenReviewSpec(token=token)
         )
         
-        # Call TokenReview API
-        review = auth_api.create_token_review(body=token_review)
+        # Call TokenReview API in a worker thread (the kubernetes client is blocking)
+        review = await asyncio.to_thread(auth_api.create_token_review, body=token_review)
         
         if review.status.authenticated:
             return {
@@ -115,10 +209,31 @@ async def _validate_serviceaccount_token(token: str) -> Optional[Dict[str, Any]]
         return None
 
 
+def _get_allowed_serviceaccounts() -> FrozenSet[str]:
+    """
+    Get the API ServiceAccount allowlist as a frozenset
+    
+    Uses the application's ConfigLoader, which caches the set per loaded
+    config; falls back to a standalone loader before startup has finished.
+    """
+    try:
+        from app.api import routes
+        loader = routes._config_loader
+        if loader is None:
+            from app.config.loader import ConfigLoader
+            loader = ConfigLoader(
+                configmap_name=os.getenv("CONFIGMAP_NAME", "kube-freezer-config"),
+                namespace=os.getenv("NAMESPACE", "kube-freezer")
+            )
+        return loader.get_api_allowed_serviceaccounts()
+    except Exception:
+        return frozenset()
+
+
 async def _check_serviceaccount_authorization(
     username: str,
     groups: List[str],
-    config: Optional[Dict[str, Any]] = None
+    allowed_users: Optional[FrozenSet[str]] = None
 ) -> bool:
     """
     Check if ServiceAccount is authorized to use the API
@@ -126,30 +241,14 @@ async def _check_serviceaccount_authorization(
     Args:
         username: ServiceAccount username (e.g., system:serviceaccount:namespace:name)
         groups: Groups from token
-        config: Optional config dict (if not provided, will try to load)
+        allowed_users: Optional allowlist (if not provided, will try to load)
     
     Returns:
         True if authorized, False otherwise
     """
-    # Load config if not provided
-    if config is None:
-        try:
-            from app.config.loader import ConfigLoader
-            import os
-            loader = ConfigLoader(
-                configmap_name=os.getenv("CONFIGMAP_NAME", "kube-freezer-config"),
-                namespace=os.getenv("NAMESPACE", "kube-freezer")
-            )
-            # Try to get config (may fail if not initialized, that's OK)
-            try:
-                config = loader.get_config()
-            except Exception:
-                config = {}
-        except Exception:
-            config = {}
-    
-    # Get allowed ServiceAccounts from config
-    allowed_users = config.get("api_allowed_serviceaccounts", [])
+    # Load allowlist if not provided
+    if allowed_users is None:
+        allowed_users = _get_allowed_serviceaccounts()
     
     # Security: Deny by default - only allow ServiceAccounts in the allowlist
     # If no allowlist configured, deny all access
@@ -160,16 +259,13 @@ async def _check_serviceaccount_authorization(
         )
         return False
     
-    # Check if username is in allowlist
+    # Check if username or any group is in allowlist
     if username in allowed_users:
         logger.debug(f"ServiceAccount {username} is authorized (in allowlist)")
         return True
-    
-    # Check if any group is in allowlist
-    for group in groups:
-        if group in allowed_users:
-            logger.debug(f"ServiceAccount {username} is authorized (group {group} in allowlist)")
-            return True
+    if not allowed_users.isdisjoint(groups):
+        logger.debug(f"ServiceAccount {username} is authorized (group in allowlist)")
+        return True
     
     logger.warning(f"ServiceAccount {username} is NOT authorized (not in allowlist)")
     return False
@@ -222,27 +318,17 @@ async def verify_token(
         )
     
     # Method 1: Try ServiceAccount token validation (Kubernetes TokenReview API)
-    user_info = await _validate_serviceaccount_token(token)
+    # Only JWT-shaped tokens can be ServiceAccount tokens; skip the API server call for API keys
+    user_info = await _validate_serviceaccount_token(token) if _looks_like_jwt(token) else None
     if user_info:
         username = user_info.get("username", "serviceaccount")
         groups = user_info.get("groups", [])
         
         # Check authorization (is this ServiceAccount allowed to use the API?)
-        try:
-            from app.config.loader import ConfigLoader
-            import os
-            loader = ConfigLoader(
-                configmap_name=os.getenv("CONFIGMAP_NAME", "kube-freezer-config"),
-                namespace=os.getenv("NAMESPACE", "kube-freezer")
-            )
-            config = loader.get_config()
-        except Exception:
-            config = {}
-        
-        is_authorized = await _check_serviceaccount_authorization(username, groups, config)
+        allowed_users = _get_allowed_serviceaccounts()
+        is_authorized = await _check_serviceaccount_authorization(username, groups, allowed_users)
         if not is_authorized:
-            allowed_list = config.get("api_allowed_serviceaccounts", [])
-            if not allowed_list:
+            if not allowed_users:
                 raise HTTPException(
                     status_code=403,
                     detail="API access is restricted. No ServiceAccounts are authorized. "
@@ -252,7 +338,7 @@ async def verify_token(
                 raise HTTPException(
                     status_code=403,
                     detail=f"ServiceAccount '{username}' is not authorized to use this API. "
-                           f"Authorized ServiceAccounts: {', '.join(allowed_list)}. "
+                           f"Authorized ServiceAccounts: {', '.join(sorted(allowed_users))}. "
                            "Contact administrator to add your ServiceAccount to 'api_allowed_serviceaccounts' in ConfigMap."
                 )
         
@@ -261,20 +347,21 @@ async def verify_token(
     
     # Method 2: Check API keys from Secret
     # Try loading API keys (will use cache if recent, or reload if stale)
-    api_keys = _load_api_keys()
+    token_digest = _api_key_digest(token)
+    api_keys = await _get_api_keys()
     logger.debug(f"Checking API key. Loaded {len(api_keys)} keys. Token length: {len(token)}")
-    if token in api_keys:
-        username = api_keys[token]
+    username = api_keys.get(token_digest)
+    if username is not None:
         logger.info(f"API key validated for user: {username}")
         return username
     
     # If token not found, try force reloading (in case Secret was just created)
     # This handles the case where Secret is created after pod startup
     logger.debug("Token not found in cached keys, force reloading...")
-    api_keys = _load_api_keys(force_reload=True)
+    api_keys = await _get_api_keys(force_reload=True)
     logger.debug(f"After reload: {len(api_keys)} keys loaded")
-    if token in api_keys:
-        username = api_keys[token]
+    username = api_keys.get(token_digest)
+    if username is not None:
         logger.info(f"API key validated for user: {username} (after reload)")
         return username
     
@@ -1,27 +1,46 @@
 """Rate limiting for API endpoints"""
+import asyncio
 import time
 import logging
-from typing import Dict, Tuple
-from collections import defaultdict
-from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from fastapi.responses import ORJSONResponse
 
 logger = logging.getLogger(__name__)
 
 
 class RateLimiter:
-    """Simple in-memory rate limiter"""
+    """Simple in-memory token-bucket rate limiter"""
     
-    def __init__(self, requests_per_minute: int = 60):
+    # Maximum idle buckets evicted from the front of a shard per flush
+    _EVICTIONS_PER_FLUSH = 4
+    
+    def __init__(self, requests_per_minute: int = 60, shard_count: int = 16):
         """
         Initialize rate limiter
         
+        Each client gets a bucket holding up to requests_per_minute tokens,
+        refilled continuously at requests_per_minute / 60 tokens per second.
+        
+        Buckets are spread over shard_count dicts kept in least-recently-used
+        order. The decision itself is made immediately against the bucket;
+        the bookkeeping (moving touched buckets to the back of their shard and
+        evicting buckets that have refilled from the front) is batched and
+        applied once per event-loop tick, so a burst of requests pays for it
+        once rather than per request.
+        
         Args:
             requests_per_minute: Maximum requests per minute per client
+            shard_count: Number of bucket shards (rounded up to a power of two)
         """
         self.requests_per_minute = requests_per_minute
-        self._requests: Dict[str, list] = defaultdict(list)
-        self._cleanup_interval = 300  # Clean up every 5 minutes
-        self._last_cleanup = time.time()
+        self._refill_rate = requests_per_minute / 60.0  # tokens per second
+        shard_count = 1 << max(0, shard_count - 1).bit_length()
+        self._shard_mask = shard_count - 1
+        # Per-client [tokens, last_refill (time.monotonic())], one dict per shard
+        self._shards: List[Dict[str, List[float]]] = [{} for _ in range(shard_count)]
+        # Clients touched since the last flush (dict for ordered de-duplication)
+        self._touched: Dict[str, None] = {}
+        self._flush_scheduled = False
     
     def is_allowed(self, client_id: str) -> Tuple[bool, int]:
         """
@@ -33,98 +52,135 @@ class RateLimiter:
         Returns:
             Tuple of (is_allowed, remaining_requests)
         """
-        now = time.time()
-        
-        # Cleanup old entries periodically
-        if now - self._last_cleanup > self._cleanup_interval:
-            self._cleanup()
-            self._last_cleanup = now
+        now = time.monotonic()
+        shard = self._shards[hash(client_id) & self._shard_mask]
         
-        # Get requests in the last minute
-        cutoff = now - 60
-        recent_requests = [
-            req_time for req_time in self._requests[client_id]
-            if req_time > cutoff
-        ]
-        
-        # Update requests list
-        self._requests[client_id] = recent_requests
+        bucket = shard.get(client_id)
+        if bucket is None:
+            # New clients start with a full bucket (and are inserted at the back)
+            bucket = shard[client_id] = [float(self.requests_per_minute), now]
+        else:
+            # Refill for the time elapsed since the last request
+            bucket[0] = min(
+                float(self.requests_per_minute),
+                bucket[0] + (now - bucket[1]) * self._refill_rate
+            )
+            bucket[1] = now
+        self._touched[client_id] = None
+        self._schedule_flush()
         
         # Check if limit exceeded
-        if len(recent_requests) >= self.requests_per_minute:
-            remaining = 0
-            return False, remaining
-        
-        # Add current request
-        self._requests[client_id].append(now)
-        remaining = self.requests_per_minute - len(self._requests[client_id])
+        if bucket[0] < 1.0:
+            return False, 0
         
-        return True, remaining
+        # Consume a token for the current request
+        bucket[0] -= 1.0
+        return True, int(bucket[0])
+    
+    def _schedule_flush(self):
+        """Apply pending bookkeeping at the end of the current event-loop tick"""
+        if self._flush_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not running inside an event loop, apply immediately
+            self._flush()
+            return
+        self._flush_scheduled = True
+        loop.call_soon(self._flush)
     
-    def _cleanup(self):
-        """Clean up old request records"""
-        now = time.time()
-        cutoff = now - 120  # Keep last 2 minutes
+    def _flush(self):
+        """Move touched buckets to the back of their shard and evict refilled ones from the front"""
+        self._flush_scheduled = False
+        now = time.monotonic()
+        shards_to_trim = set()
         
-        for client_id in list(self._requests.keys()):
-            self._requests[client_id] = [
-                req_time for req_time in self._requests[client_id]
-                if req_time > cutoff
-            ]
-            
-            # Remove empty entries
-            if not self._requests[client_id]:
-                del self._requests[client_id]
+        for client_id in self._touched:
+            shard_index = hash(client_id) & self._shard_mask
+            shard = self._shards[shard_index]
+            bucket = shard.pop(client_id, None)
+            if bucket is not None:
+                shard[client_id] = bucket
+            shards_to_trim.add(shard_index)
+        self._touched.clear()
+        
+        for shard_index in shards_to_trim:
+            shard = self._shards[shard_index]
+            for _ in range(self._EVICTIONS_PER_FLUSH):
+                if not shard:
+                    break
+                oldest_id = next(iter(shard))
+                if not self._is_full(shard[oldest_id], now):
+                    break
+                del shard[oldest_id]
+    
+    def _is_full(self, bucket: List[float], now: float) -> bool:
+        """Check if a bucket has refilled completely (equivalent to an unseen client)"""
+        return bucket[0] + (now - bucket[1]) * self._refill_rate >= self.requests_per_minute
 
 
 # Global rate limiter instance
 _rate_limiter = RateLimiter(requests_per_minute=60)
 
 
-def get_client_id(request) -> str:
-    """Get client identifier from request"""
-    # Try to get from X-Forwarded-For header (if behind proxy)
-    forwarded = request.headers.get("X-Forwarded-For", "")
-    if forwarded:
-        # Take first IP in chain
-        return forwarded.split(",")[0].strip()
+def _get_scope_client_id(scope) -> str:
+    """Get client identifier from an ASGI scope (first X-Forwarded-For IP, else the peer address)"""
+    for name, value in scope["headers"]:
+        if name == b"x-forwarded-for":
+            if value:
+                # Take first IP in chain
+                return value.decode("latin-1").split(",")[0].strip()
+            break
     
-    # Fall back to direct client IP
-    if hasattr(request.client, "host"):
-        return request.client.host
+    client = scope.get("client")
+    if client:
+        return client[0]
     
     return "unknown"
 
 
-def check_rate_limit(request) -> bool:
+class RateLimitMiddleware:
     """
-    Check rate limit for request
-    
-    Args:
-        request: FastAPI request object
-    
-    Returns:
-        True if allowed, False if rate limited
+    ASGI middleware applying the global rate limit to mutating API requests
     
-    Raises:
-        HTTPException: If rate limit exceeded
+    Runs before routing, so a rejected request is answered with 429 without
+    authenticating it or reading and validating its body. Safe methods (GET,
+    HEAD, OPTIONS) and paths outside path_prefix are not limited.
     """
-    from fastapi import HTTPException
     
-    client_id = get_client_id(request)
-    allowed, remaining = _rate_limiter.is_allowed(client_id)
+    _UNLIMITED_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
     
-    if not allowed:
-        logger.warning(f"Rate limit exceeded for client {client_id}")
-        raise HTTPException(
-            status_code=429,
-            detail=f"Rate limit exceeded. Maximum {_rate_limiter.requests_per_minute} requests per minute.",
-            headers={
-                "X-RateLimit-Limit": str(_rate_limiter.requests_per_minute),
-                "X-RateLimit-Remaining": "0",
-                "Retry-After": "60"
-            }
-        )
+    def __init__(self, app, path_prefix: str = "/api/v1/", limiter: RateLimiter = _rate_limiter):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.limiter = limiter
     
-    return True
-
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in self._UNLIMITED_METHODS
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        client_id = _get_scope_client_id(scope)
+        allowed, _ = self.limiter.is_allowed(client_id)
+        if not allowed:
+            logger.warning(f"Rate limit exceeded for client {client_id}")
+            response = ORJSONResponse(
+                status_code=429,
+                content={
+                    "detail": f"Rate limit exceeded. Maximum {self.limiter.requests_per_minute} requests per minute."
+                },
+                headers={
+                    "X-RateLimit-Limit": str(self.limiter.requests_per_minute),
+                    "X-RateLimit-Remaining": "0",
+                    "Retry-After": "60"
+                }
+            )
+            await response(scope, receive, send)
+            return
+        
+        await self.app(scope, receive, send)
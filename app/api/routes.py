@@ -1,13 +1,23 @@
 """REST API routes"""
+from __future__ import annotations
+
+import asyncio
 import logging
+import os
 import time
-from typing import Dict, Any, Optional, List
+from typing import Any, Coroutine
 from datetime import datetime, timezone
-from fastapi import APIRouter, HTTPException, Depends, Request
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse
+from kubernetes.client.rest import ApiException
+from pydantic import BaseModel, ConfigDict, ValidationError
 
+from app.admission.context import AdmissionContext
+from app.bypass.evaluator import check_bypass
+from app.cache.configmap_cache import ConfigMapCache
 from app.config.loader import ConfigLoader
-from app.freeze.evaluator import is_freeze_active
+from app.freeze.evaluator import is_freeze_active_cached
+from app.freeze.schedule import get_active_schedules, parse_schedules
 from app.utils.kubernetes import get_k8s_client
 from app.metrics.collector import (
     record_api_request,
@@ -17,13 +27,22 @@ from app.metrics.collector import (
 from app.exemptions.manager import ExemptionManager, Exemption
 from app.history.tracker import HistoryTracker
 from app.api.auth import verify_token, optional_auth
-from app.api.ratelimit import check_rate_limit
+from app.api.routing import ORJSONRoute
 from app.templates.engine import TemplateEngine
 from app.dryrun.evaluator import evaluate_dry_run
+from app.utils.schedules import (
+    load_schedules,
+    modify_schedules,
+    remove_schedule as delete_schedule,
+    _order_schedule
+)
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse, route_class=ORJSONRoute)
+
+NAMESPACE = os.getenv("NAMESPACE", "kube-freezer")
+TEMPLATES_CONFIGMAP_NAME = "kube-freezer-templates"
 
 
 # Global references (set by main.py)
@@ -33,6 +52,7 @@ _history_tracker: HistoryTracker = None
 _notification_manager = None
 _audit_logger = None
 _template_engine: TemplateEngine = None
+_configmap_cache: ConfigMapCache = None
 
 def set_notification_manager(manager):
     """Set notification manager"""
@@ -63,6 +83,11 @@ def get_template_engine() -> TemplateEngine:
         raise HTTPException(status_code=503, detail="Template engine not initialized")
     return _template_engine
 
+def set_configmap_cache(cache: ConfigMapCache):
+    """Set the ConfigMap cache"""
+    global _configmap_cache
+    _configmap_cache = cache
+
 def set_config_loader(loader: ConfigLoader):
     """Set the global config loader"""
     global _config_loader
@@ -97,38 +122,125 @@ def get_history_tracker() -> HistoryTracker:
     return _history_tracker
 
 
+# FastAPI runs plain `def` dependencies in the threadpool, so resolving the sync
+# getters above cost a thread hop per dependency per request. Routes depend on
+# these async wrappers instead, which resolve inline on the event loop.
+async def _config_loader_dep() -> ConfigLoader:
+    """Async dependency to get config loader"""
+    return get_config_loader()
+
+async def _exemption_manager_dep() -> ExemptionManager:
+    """Async dependency to get exemption manager"""
+    return get_exemption_manager()
+
+async def _history_tracker_dep() -> HistoryTracker:
+    """Async dependency to get history tracker"""
+    return get_history_tracker()
+
+async def _template_engine_dep() -> TemplateEngine:
+    """Async dependency to get template engine"""
+    return get_template_engine()
+
+
+# Request bodies: drop unknown fields and make the parsed models immutable
+_REQUEST_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True)
+
+
+def _read_configmap(v1, name: str, namespace: str):
+    """Read a ConfigMap from the watch-backed cache, falling back to the API server"""
+    if _configmap_cache is not None:
+        cm = _configmap_cache.get(namespace, name)
+        if cm is not None:
+            return cm
+    return v1.read_namespaced_config_map(name=name, namespace=namespace)
+
+
+def _update_configmap_data(v1, name: str, namespace: str, updates: dict[str, str]):
+    """
+    Apply updates to a ConfigMap's data
+    
+    The ConfigMap is read from the cache; the patch carries its resourceVersion,
+    so a stale cached copy is rejected with 409 and retried once against a
+    fresh read from the API server.
+    """
+    cm = _read_configmap(v1, name, namespace)
+    cm.data.update(updates)
+    try:
+        v1.patch_namespaced_config_map(name=name, namespace=namespace, body=cm)
+    except ApiException as e:
+        if e.status != 409:
+            raise
+        cm = v1.read_namespaced_config_map(name=name, namespace=namespace)
+        cm.data.update(updates)
+        v1.patch_namespaced_config_map(name=name, namespace=namespace, body=cm)
+
+
+async def _run_side_effects(side_effects: list[Coroutine[Any, Any, Any]]):
+    """
+    Run independent post-mutation side effects (notifications, audit) concurrently
+    
+    Scheduled as a background task, so it runs after the response has been
+    sent. Failures are logged rather than raised: the mutation has already
+    been applied.
+    """
+    if not side_effects:
+        return
+    results = await asyncio.gather(*side_effects, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Post-mutation side effect failed: {result}", exc_info=result)
+
+
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, accepting a trailing 'Z' for UTC"""
+    try:
+        # Python 3.11+ accepts the 'Z' suffix directly
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
 class FreezeEnableRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+    
     until: str  # ISO 8601 timestamp
     reason: str = "Manual freeze enabled"
-    namespaces: List[str] = []
+    namespaces: list[str] = []
 
 
 class FreezeDisableRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+    
     reason: str = "Manual freeze disabled"
 
 
 class ExemptionCreateRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+    
     namespace: str
     duration_minutes: int
     reason: str
     approved_by: str
-    resource_name: Optional[str] = None
+    resource_name: str | None = None
 
 
 class ScheduleRemoveRequest(BaseModel):
-    reason: Optional[str] = "Schedule removed via API"
+    model_config = _REQUEST_MODEL_CONFIG
+    
+    reason: str | None = "Schedule removed via API"
 
 
 @router.get("/freeze/status")
 async def get_freeze_status(
     request: Request,
-    config_loader: ConfigLoader = Depends(get_config_loader)
+    config_loader: ConfigLoader = Depends(_config_loader_dep)
 ):
     """Get current freeze status"""
-    start_time = time.time()
+    start_time = time.monotonic()
+    now = datetime.now(timezone.utc)
     try:
         config = config_loader.get_config()
-        freeze_active, freeze_window = is_freeze_active(config)
+        freeze_active, freeze_window = is_freeze_active_cached(config, None, config_loader.config_version)
         
         response = {
             "active": freeze_active,
@@ -141,12 +253,15 @@ async def get_freeze_status(
         }
         
         # Check schedules
-        freeze_schedules = config.get("freeze_schedule", [])
+        freeze_schedules = config.get("parsed_freeze_schedule")
+        if freeze_schedules is None:
+            freeze_schedules = parse_schedules(config.get("freeze_schedule", []))
         if freeze_schedules:
-            from app.freeze.schedule import get_active_schedules
             active_schedules = get_active_schedules(freeze_schedules)
             response["schedules"] = []
-            for s in active_schedules:
+            for active in active_schedules:
+                # Report the schedule as configured rather than its parsed form
+                s = active.get("original", active)
                 # Order: name, start, end, cron, namespaces, message
                 schedule_info = {
                     "name": s.get("name"),
@@ -166,7 +281,7 @@ async def get_freeze_status(
         freeze_until = config.get("freeze_until")
         if freeze_until:
             if isinstance(freeze_until, str):
-                freeze_until = datetime.fromisoformat(freeze_until.replace("Z", "+00:00"))
+                freeze_until = _parse_iso(freeze_until)
             
             if freeze_until.tzinfo is None:
                 freeze_until = freeze_until.replace(tzinfo=timezone.utc)
@@ -174,20 +289,19 @@ async def get_freeze_status(
             response["freeze_until"] = freeze_until.isoformat()
             
             if freeze_active:
-                now = datetime.now(timezone.utc)
                 remaining = freeze_until - now
                 response["remaining"] = str(remaining)
         
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/status", "GET", 200, duration)
         
         return {
             "success": True,
             "data": response,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now.isoformat()
         }
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/status", "GET", 500, duration)
         logger.error(f"Error getting freeze status: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -196,39 +310,35 @@ async def get_freeze_status(
 @router.post("/freeze/enable")
 async def enable_freeze(
     request: FreezeEnableRequest,
-    http_request: Request,
-    config_loader: ConfigLoader = Depends(get_config_loader),
+    background: BackgroundTasks,
+    config_loader: ConfigLoader = Depends(_config_loader_dep),
     _: str = Depends(verify_token)  # Require authentication
 ):
     """Enable freeze by updating ConfigMap"""
-    check_rate_limit(http_request)  # Check rate limit
-    start_time = time.time()
+    start_time = time.monotonic()
+    now = datetime.now(timezone.utc)
     try:
         # Validate timestamp
         try:
-            freeze_until = datetime.fromisoformat(request.until.replace("Z", "+00:00"))
+            freeze_until = _parse_iso(request.until)
             if freeze_until.tzinfo is None:
                 freeze_until = freeze_until.replace(tzinfo=timezone.utc)
         except ValueError as e:
             raise HTTPException(status_code=400, detail=f"Invalid timestamp format: {e}")
-        
-        # Update ConfigMap
-        v1 = get_k8s_client()
-        cm = v1.read_namespaced_config_map(
-            name=config_loader.configmap_name,
-            namespace=config_loader.namespace
-        )
+        freeze_until_iso = freeze_until.isoformat()
         
         # Update freeze settings
-        cm.data["freeze_enabled"] = "true"
-        cm.data["freeze_until"] = freeze_until.isoformat()
+        updates = {
+            "freeze_enabled": "true",
+            "freeze_until": freeze_until_iso
+        }
         if request.reason:
-            cm.data["freeze_message"] = f"{request.reason} - Freeze until {freeze_until.isoformat()}"
+            updates["freeze_message"] = f"{request.reason} - Freeze until {freeze_until_iso}"
         
-        v1.patch_namespaced_config_map(
-            name=config_loader.configmap_name,
-            namespace=config_loader.namespace,
-            body=cm
+        # Update ConfigMap
+        v1 = get_k8s_client()
+        await asyncio.to_thread(
+            _update_configmap_data, v1, config_loader.configmap_name, config_loader.namespace, updates
         )
         
         # Reload config
@@ -245,54 +355,58 @@ async def enable_freeze(
             tracker.record_event(
                 event_type="enabled",
                 reason=request.reason,
-                duration_minutes=int((freeze_until - datetime.now(timezone.utc)).total_seconds() / 60),
+                duration_minutes=int(freeze_until.timestamp() - now.timestamp()) // 60,
                 triggered_by="api"
             )
-            # Persist to ConfigMap
-            await tracker.save_to_configmap()
+            # Persist to ConfigMap (debounced)
+            tracker.mark_dirty()
         except Exception as hist_error:
             logger.warning(f"Failed to save history event: {hist_error}", exc_info=True)
             # Don't fail the request, but log the error
         
+        side_effects = []
+        
         # Send notification (Phase 4)
         notif_mgr = get_notification_manager()
-        if notif_mgr:
-            await notif_mgr.send_notification("freeze_enabled", {
+        if notif_mgr and notif_mgr.has_subscribers_for("freeze_enabled"):
+            side_effects.append(notif_mgr.send_notification("freeze_enabled", {
                 "freeze_window": "Manual Freeze",
-                "until": freeze_until.isoformat(),
+                "until": freeze_until_iso,
                 "reason": request.reason,
                 "namespace": ", ".join(request.namespaces) if request.namespaces else "All"
-            })
+            }))
         
         # Audit log (Phase 4)
         audit = get_audit_logger()
-        if audit:
-            from app.audit.logger import AuditActor, AuditResource
+        if audit and audit.enabled:
             actor = audit.create_actor("api-user", "system")
             resource = audit.create_resource("freeze_window", "Manual Freeze")
-            await audit.log_event("freeze_enabled", actor, resource, "success", {
-                "until": freeze_until.isoformat(),
+            side_effects.append(audit.log_event("freeze_enabled", actor, resource, "success", {
+                "until": freeze_until_iso,
                 "reason": request.reason
-            })
+            }, timestamp=now))
+        
+        if side_effects:
+            background.add_task(_run_side_effects, side_effects)
         
-        logger.info(f"Freeze enabled until {freeze_until.isoformat()}: {request.reason}")
+        logger.info(f"Freeze enabled until {freeze_until_iso}: {request.reason}")
         
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/enable", "POST", 200, duration)
         
         return {
             "success": True,
-            "message": f"Freeze enabled until {freeze_until.isoformat()}",
+            "message": f"Freeze enabled until {freeze_until_iso}",
             "data": {
-                "freeze_until": freeze_until.isoformat(),
+                "freeze_until": freeze_until_iso,
                 "reason": request.reason
             },
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now.isoformat()
         }
     except HTTPException:
         raise
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/enable", "POST", 500, duration)
         logger.error(f"Error enabling freeze: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -301,30 +415,23 @@ async def enable_freeze(
 @router.post("/freeze/disable")
 async def disable_freeze(
     request: FreezeDisableRequest,
-    http_request: Request,
-    config_loader: ConfigLoader = Depends(get_config_loader),
+    background: BackgroundTasks,
+    config_loader: ConfigLoader = Depends(_config_loader_dep),
     _: str = Depends(verify_token)  # Require authentication
 ):
     """Disable freeze by updating ConfigMap"""
-    check_rate_limit(http_request)  # Check rate limit
-    start_time = time.time()
+    start_time = time.monotonic()
+    now = datetime.now(timezone.utc)
     try:
-        # Update ConfigMap
-        v1 = get_k8s_client()
-        cm = v1.read_namespaced_config_map(
-            name=config_loader.configmap_name,
-            namespace=config_loader.namespace
-        )
-        
         # Disable freeze
-        cm.data["freeze_enabled"] = "false"
+        updates = {"freeze_enabled": "false"}
         if request.reason:
-            cm.data["freeze_message"] = f"Freeze disabled: {request.reason}"
+            updates["freeze_message"] = f"Freeze disabled: {request.reason}"
         
-        v1.patch_namespaced_config_map(
-            name=config_loader.configmap_name,
-            namespace=config_loader.namespace,
-            body=cm
+        # Update ConfigMap
+        v1 = get_k8s_client()
+        await asyncio.to_thread(
+            _update_configmap_data, v1, config_loader.configmap_name, config_loader.namespace, updates
         )
         
         # Reload config
@@ -343,32 +450,36 @@ async def disable_freeze(
                 reason=request.reason,
                 triggered_by="api"
             )
-            # Persist to ConfigMap
-            await tracker.save_to_configmap()
+            # Persist to ConfigMap (debounced)
+            tracker.mark_dirty()
         except Exception as hist_error:
             logger.warning(f"Failed to save history event: {hist_error}", exc_info=True)
             # Don't fail the request, but log the error
         
+        side_effects = []
+        
         # Send notification (Phase 4)
         notif_mgr = get_notification_manager()
-        if notif_mgr:
-            await notif_mgr.send_notification("freeze_disabled", {
+        if notif_mgr and notif_mgr.has_subscribers_for("freeze_disabled"):
+            side_effects.append(notif_mgr.send_notification("freeze_disabled", {
                 "reason": request.reason
-            })
+            }))
         
         # Audit log (Phase 4)
         audit = get_audit_logger()
-        if audit:
-            from app.audit.logger import AuditActor, AuditResource
+        if audit and audit.enabled:
             actor = audit.create_actor("api-user", "system")
             resource = audit.create_resource("freeze_window", "Manual Freeze")
-            await audit.log_event("freeze_disabled", actor, resource, "success", {
+            side_effects.append(audit.log_event("freeze_disabled", actor, resource, "success", {
                 "reason": request.reason
-            })
+            }, timestamp=now))
+        
+        if side_effects:
+            background.add_task(_run_side_effects, side_effects)
         
         logger.info(f"Freeze disabled: {request.reason}")
         
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/disable", "POST", 200, duration)
         
         return {
@@ -377,10 +488,10 @@ async def disable_freeze(
             "data": {
                 "reason": request.reason
             },
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now.isoformat()
         }
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/disable", "POST", 500, duration)
         logger.error(f"Error disabling freeze: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -390,30 +501,33 @@ async def disable_freeze(
 @router.get("/freeze/exemptions")
 async def list_exemptions(
     request: Request,
-    namespace: Optional[str] = None,
+    namespace: str | None = None,
     active_only: bool = False,
-    exemption_manager: ExemptionManager = Depends(get_exemption_manager),
+    exemption_manager: ExemptionManager = Depends(_exemption_manager_dep),
     _: str = Depends(verify_token)  # Require authentication
 ):
     """List temporary exemptions"""
-    start_time = time.time()
+    start_time = time.monotonic()
+    now = datetime.now(timezone.utc)
     try:
         exemptions = await exemption_manager.list_exemptions(
             namespace=namespace,
             active_only=active_only
         )
         
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/exemptions", "GET", 200, duration)
         
-        return {
+        # orjson serializes the dataclasses (and their datetimes, in isoformat) natively,
+        # so return the response directly instead of building per-item dicts for jsonable_encoder
+        return ORJSONResponse(content={
             "success": True,
-            "data": [ex.to_dict() for ex in exemptions],
+            "data": exemptions,
             "count": len(exemptions),
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
+            "timestamp": now.isoformat()
+        })
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/exemptions", "GET", 500, duration)
         logger.error(f"Error listing exemptions: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -422,13 +536,13 @@ async def list_exemptions(
 @router.post("/freeze/exemptions")
 async def create_exemption(
     request: ExemptionCreateRequest,
-    http_request: Request,
-    exemption_manager: ExemptionManager = Depends(get_exemption_manager),
+    background: BackgroundTasks,
+    exemption_manager: ExemptionManager = Depends(_exemption_manager_dep),
     _: str = Depends(verify_token)  # Require authentication
 ):
     """Create a temporary exemption"""
-    check_rate_limit(http_request)
-    start_time = time.time()
+    start_time = time.monotonic()
+    now = datetime.now(timezone.utc)
     try:
         exemption = await exemption_manager.create_exemption(
             namespace=request.namespace,
@@ -452,14 +566,14 @@ async def create_exemption(
                 duration_minutes=request.duration_minutes,
                 triggered_by="api"
             )
-            await tracker.save_to_configmap()
+            tracker.mark_dirty()
         except Exception as hist_error:
             logger.warning(f"Failed to save history event: {hist_error}", exc_info=True)
         
         # Send notification (Phase 4)
         notif_mgr = get_notification_manager()
-        if notif_mgr:
-            await notif_mgr.send_notification("exemption_created", {
+        if notif_mgr and notif_mgr.has_subscribers_for("exemption_created"):
+            background.add_task(_run_side_effects, [notif_mgr.send_notification("exemption_created", {
                 "exemption_id": exemption.id,
                 "namespace": request.namespace,
                 "resource_name": request.resource_name,
@@ -467,18 +581,18 @@ async def create_exemption(
                 "reason": request.reason,
                 "approved_by": request.approved_by,
                 "expires_at": exemption.expires_at.isoformat()
-            })
+            })])
         
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/exemptions", "POST", 201, duration)
         
         return {
             "success": True,
             "data": exemption.to_dict(),
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now.isoformat()
         }
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/exemptions", "POST", 500, duration)
         logger.error(f"Error creating exemption: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -488,28 +602,29 @@ async def create_exemption(
 async def get_exemption(
     exemption_id: str,
     request: Request,
-    exemption_manager: ExemptionManager = Depends(get_exemption_manager),
+    exemption_manager: ExemptionManager = Depends(_exemption_manager_dep),
     _: str = Depends(verify_token)  # Require authentication
 ):
     """Get a specific exemption"""
-    start_time = time.time()
+    start_time = time.monotonic()
+    now = datetime.now(timezone.utc)
     try:
         exemption = await exemption_manager.get_exemption(exemption_id)
         if not exemption:
             raise HTTPException(status_code=404, detail="Exemption not found")
         
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/exemptions/{id}", "GET", 200, duration)
         
         return {
             "success": True,
             "data": exemption.to_dict(),
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now.isoformat()
         }
     except HTTPException:
         raise
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/exemptions/{id}", "GET", 500, duration)
         logger.error(f"Error getting exemption: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -518,13 +633,12 @@ async def get_exemption(
 @router.delete("/freeze/exemptions/{exemption_id}")
 async def delete_exemption(
     exemption_id: str,
-    http_request: Request,
-    exemption_manager: ExemptionManager = Depends(get_exemption_manager),
+    exemption_manager: ExemptionManager = Depends(_exemption_manager_dep),
     _: str = Depends(verify_token)  # Require authentication
 ):
     """Delete a temporary exemption"""
-    check_rate_limit(http_request)
-    start_time = time.time()
+    start_time = time.monotonic()
+    now = datetime.now(timezone.utc)
     try:
         # Get exemption details before deletion for history
         exemption = await exemption_manager.get_exemption(exemption_id)
@@ -545,22 +659,22 @@ async def delete_exemption(
                 namespace=exemption.namespace,
                 triggered_by="api"
             )
-            await tracker.save_to_configmap()
+            tracker.mark_dirty()
         except Exception as hist_error:
             logger.warning(f"Failed to save history event: {hist_error}", exc_info=True)
         
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/exemptions/{id}", "DELETE", 200, duration)
         
         return {
             "success": True,
             "message": "Exemption deleted",
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now.isoformat()
         }
     except HTTPException:
         raise
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/exemptions/{id}", "DELETE", 500, duration)
         logger.error(f"Error deleting exemption: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -570,27 +684,27 @@ async def delete_exemption(
 @router.get("/freeze/schedules")
 async def list_schedules(
     request: Request,
-    config_loader: ConfigLoader = Depends(get_config_loader),
+    config_loader: ConfigLoader = Depends(_config_loader_dep),
     _: str = Depends(verify_token)  # Require authentication
 ):
     """List all freeze schedules (from separate ConfigMap, NOT managed by Helm)"""
-    start_time = time.time()
+    start_time = time.monotonic()
+    now = datetime.now(timezone.utc)
     try:
         # Load schedules from separate ConfigMap
-        from app.utils.schedules import load_schedules
-        schedules = load_schedules()
+        schedules = await asyncio.to_thread(load_schedules)
         
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/schedules", "GET", 200, duration)
         
         return {
             "success": True,
             "data": schedules,
             "count": len(schedules),
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now.isoformat()
         }
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/schedules", "GET", 500, duration)
         logger.error(f"Error listing schedules: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -600,25 +714,28 @@ async def list_schedules(
 async def remove_schedule(
     schedule_name: str,
     http_request: Request,
-    config_loader: ConfigLoader = Depends(get_config_loader),
+    background: BackgroundTasks,
+    config_loader: ConfigLoader = Depends(_config_loader_dep),
     _: str = Depends(verify_token)  # Require authentication
 ):
     """Remove a specific freeze schedule (including template-applied schedules)"""
-    check_rate_limit(http_request)
-    start_time = time.time()
+    start_time = time.monotonic()
+    now = datetime.now(timezone.utc)
     try:
         # Parse request body for optional reason
         reason = "Schedule removed via API"
-        try:
-            body = await http_request.json()
-            if body and isinstance(body, dict) and "reason" in body:
-                reason = body.get("reason", reason)
-        except Exception:
-            pass  # No body or invalid JSON, use default reason
+        # DELETE usually carries no body; skip parsing (and the decode error) entirely
+        content_length = http_request.headers.get("content-length")
+        if content_length and content_length != "0":
+            try:
+                body = await http_request.json()
+                if body and isinstance(body, dict) and "reason" in body:
+                    reason = body.get("reason", reason)
+            except ValueError:
+                pass  # Invalid JSON, use default reason
         
         # Remove schedule from separate ConfigMap (NOT managed by Helm)
-        from app.utils.schedules import remove_schedule, load_schedules
-        success = remove_schedule(schedule_name)
+        success = await asyncio.to_thread(delete_schedule, schedule_name)
         
         if not success:
             raise HTTPException(
@@ -627,7 +744,7 @@ async def remove_schedule(
             )
         
         # Get remaining schedules count
-        current_schedules = load_schedules()
+        current_schedules = await asyncio.to_thread(load_schedules)
         
         # Reload config
         try:
@@ -645,34 +762,38 @@ async def remove_schedule(
                 reason=reason or f"Schedule '{schedule_name}' removed",
                 triggered_by="api"
             )
-            # Persist to ConfigMap
-            await tracker.save_to_configmap()
+            # Persist to ConfigMap (debounced)
+            tracker.mark_dirty()
         except Exception as hist_error:
             logger.warning(f"Failed to save history event: {hist_error}", exc_info=True)
             # Don't fail the request, but log the error
         
+        side_effects = []
+        
         # Send notification
         notif_mgr = get_notification_manager()
-        if notif_mgr:
-            await notif_mgr.send_notification("schedule_removed", {
+        if notif_mgr and notif_mgr.has_subscribers_for("schedule_removed"):
+            side_effects.append(notif_mgr.send_notification("schedule_removed", {
                 "schedule_name": schedule_name,
                 "reason": reason
-            })
+            }))
         
         # Audit log
         audit = get_audit_logger()
-        if audit:
-            from app.audit.logger import AuditActor, AuditResource
+        if audit and audit.enabled:
             actor = audit.create_actor("api-user", "system")
             resource = audit.create_resource("freeze_schedule", schedule_name)
-            await audit.log_event("schedule_removed", actor, resource, "success", {
+            side_effects.append(audit.log_event("schedule_removed", actor, resource, "success", {
                 "schedule_name": schedule_name,
                 "reason": reason
-            })
+            }, timestamp=now))
+        
+        if side_effects:
+            background.add_task(_run_side_effects, side_effects)
         
         logger.info(f"Schedule '{schedule_name}' removed: {reason}")
         
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/schedules/{name}", "DELETE", 200, duration)
         
         return {
@@ -683,12 +804,12 @@ async def remove_schedule(
                 "reason": reason,
                 "remaining_schedules": len(current_schedules)
             },
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now.isoformat()
         }
     except HTTPException:
         raise
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/schedules/{name}", "DELETE", 500, duration)
         logger.error(f"Error removing schedule: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -698,14 +819,15 @@ async def remove_schedule(
 @router.get("/freeze/history")
 async def get_freeze_history(
     request: Request,
-    event_type: Optional[str] = None,
-    namespace: Optional[str] = None,
+    event_type: str | None = None,
+    namespace: str | None = None,
     limit: int = 100,
-    history_tracker: HistoryTracker = Depends(get_history_tracker),
+    history_tracker: HistoryTracker = Depends(_history_tracker_dep),
     _: str = Depends(verify_token)  # Require authentication
 ):
     """Get freeze history"""
-    start_time = time.time()
+    start_time = time.monotonic()
+    now = datetime.now(timezone.utc)
     try:
         events = history_tracker.get_history(
             event_type=event_type,
@@ -713,17 +835,19 @@ async def get_freeze_history(
             limit=limit
         )
         
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/history", "GET", 200, duration)
         
-        return {
+        # orjson serializes the dataclasses (and their datetimes, in isoformat) natively,
+        # so return the response directly instead of building per-item dicts for jsonable_encoder
+        return ORJSONResponse(content={
             "success": True,
-            "data": [event.to_dict() for event in events],
+            "data": events,
             "count": len(events),
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
+            "timestamp": now.isoformat()
+        })
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/history", "GET", 500, duration)
         logger.error(f"Error getting history: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -733,99 +857,99 @@ async def get_freeze_history(
 @router.get("/freeze/templates")
 async def list_templates(
     request: Request,
-    template_engine: TemplateEngine = Depends(get_template_engine),
+    template_engine: TemplateEngine = Depends(_template_engine_dep),
     _: str = Depends(verify_token)  # Require authentication
 ):
     """List available freeze templates (from ConfigMap)"""
-    start_time = time.time()
+    start_time = time.monotonic()
+    now = datetime.now(timezone.utc)
     try:
         templates = template_engine.list_templates()
         if not templates:
             logger.warning("No templates configured. Configure templates in ConfigMap 'kube-freezer-templates'")
         
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/templates", "GET", 200, duration)
         
         return {
             "success": True,
             "data": templates,
             "count": len(templates),
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now.isoformat()
         }
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/templates", "GET", 500, duration)
         logger.error(f"Error listing templates: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 class TemplateApplyRequest(BaseModel):
+    model_config = _REQUEST_MODEL_CONFIG
+    
     template_name: str
-    parameters: Optional[Dict[str, Any]] = None
+    parameters: dict[str, Any] | None = None
+
+
+class OverrideSchedule(BaseModel):
+    """Schedule passed directly via the override_schedule template parameter"""
+    model_config = _REQUEST_MODEL_CONFIG
+    
+    name: str | None = None
+    start: str
+    end: str
+    cron: str
+    namespaces: list[str] | None = None
+    message: str | None = None
 
 
 @router.post("/freeze/templates/reload")
 async def reload_templates(
-    http_request: Request,
-    template_engine: TemplateEngine = Depends(get_template_engine),
+    template_engine: TemplateEngine = Depends(_template_engine_dep),
     _: str = Depends(verify_token)  # Require authentication
 ):
     """Reload templates from ConfigMap"""
-    check_rate_limit(http_request)
-    start_time = time.time()
+    start_time = time.monotonic()
+    now = datetime.now(timezone.utc)
     try:
-        from kubernetes import client
-        from app.utils.kubernetes import get_k8s_client
-        import os
+        v1 = get_k8s_client()
+        template_cm = await asyncio.to_thread(_read_configmap, v1, TEMPLATES_CONFIGMAP_NAME, NAMESPACE)
+        template_config = {"templates": template_cm.data.get("templates", "")}
         
-        v1 = client.CoreV1Api()
-        namespace = os.getenv("NAMESPACE", "kube-freezer")
+        # Clear existing templates
+        template_engine.templates.clear()
         
-        try:
-            template_cm = v1.read_namespaced_config_map("kube-freezer-templates", namespace)
-            template_config = {"templates": template_cm.data.get("templates", "")}
-            
-            # Clear existing templates
-            template_engine.templates.clear()
-            
-            # Reload templates
-            template_engine.load_templates_from_config(template_config)
-            
-            duration = time.time() - start_time
-            record_api_request("/freeze/templates/reload", "POST", 200, duration)
-            
-            return {
-                "success": True,
-                "message": f"Reloaded {len(template_engine.templates)} templates",
-                "count": len(template_engine.templates),
-                "templates": list(template_engine.templates.keys()),
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            }
-        except Exception as e:
-            duration = time.time() - start_time
-            record_api_request("/freeze/templates/reload", "POST", 500, duration)
-            logger.error(f"Error reloading templates: {e}", exc_info=True)
-            raise HTTPException(status_code=500, detail=f"Failed to reload templates: {str(e)}")
-    except HTTPException:
-        raise
+        # Reload templates
+        template_engine.load_templates_from_config(template_config)
+        
+        duration = time.monotonic() - start_time
+        record_api_request("/freeze/templates/reload", "POST", 200, duration)
+        
+        return {
+            "success": True,
+            "message": f"Reloaded {len(template_engine.templates)} templates",
+            "count": len(template_engine.templates),
+            "templates": list(template_engine.templates.keys()),
+            "timestamp": now.isoformat()
+        }
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/templates/reload", "POST", 500, duration)
         logger.error(f"Error reloading templates: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=f"Failed to reload templates: {str(e)}")
 
 
 @router.post("/freeze/templates/apply")
 async def apply_template(
     request: TemplateApplyRequest,
-    http_request: Request,
-    template_engine: TemplateEngine = Depends(get_template_engine),
-    config_loader: ConfigLoader = Depends(get_config_loader),
+    background: BackgroundTasks,
+    template_engine: TemplateEngine = Depends(_template_engine_dep),
+    config_loader: ConfigLoader = Depends(_config_loader_dep),
     _: str = Depends(verify_token)  # Require authentication
 ):
     """Apply a freeze template - stores schedule directly in ConfigMap"""
-    check_rate_limit(http_request)
-    start_time = time.time()
+    start_time = time.monotonic()
+    now = datetime.now(timezone.utc)
     try:
         parameters = request.parameters or {}
         
@@ -837,35 +961,21 @@ async def apply_template(
             if not isinstance(freeze_config, dict):
                 raise HTTPException(status_code=400, detail="override_schedule must be a dictionary")
             
-            # Validate schedule format (must have cron)
-            if "cron" not in freeze_config:
-                raise HTTPException(
-                    status_code=400, 
-                    detail="override_schedule must contain 'cron' field"
-                )
-            
-            # Validate cron format - requires start and end dates
-            if "start" not in freeze_config or "end" not in freeze_config:
-                raise HTTPException(
-                    status_code=400,
-                    detail="'cron' schedule requires both 'start' and 'end' date fields"
-                )
-            
-            # Create ordered config: name, start, end, cron, namespaces, message
-            ordered_config = {
-                "name": freeze_config.get("name"),
-                "start": freeze_config.get("start"),
-                "end": freeze_config.get("end"),
-                "cron": freeze_config["cron"],
-            }
-            
-            if freeze_config.get("namespaces"):
-                ordered_config["namespaces"] = freeze_config.get("namespaces")
-            
-            if freeze_config.get("message"):
-                ordered_config["message"] = freeze_config.get("message")
+            try:
+                override = OverrideSchedule.model_validate(freeze_config)
+            except ValidationError as e:
+                missing = {err["loc"][0] for err in e.errors() if err["type"] == "missing"}
+                if "cron" in missing:
+                    detail = "override_schedule must contain 'cron' field"
+                elif missing:
+                    # Validate cron format - requires start and end dates
+                    detail = "'cron' schedule requires both 'start' and 'end' date fields"
+                else:
+                    detail = f"Invalid override_schedule: {e}"
+                raise HTTPException(status_code=400, detail=detail)
             
-            freeze_config = ordered_config
+            # Ordered config: name, start, end, cron, namespaces, message
+            freeze_config = _order_schedule(override.model_dump())
         else:
             # Apply template normally (with variable substitution)
             freeze_config = template_engine.apply_template(
@@ -877,37 +987,34 @@ async def apply_template(
         # This prevents schedules from being deleted during Helm upgrades
         schedule_name = freeze_config.get("name", "unknown")
         try:
-            from app.utils.schedules import add_schedule, load_schedules, save_schedules
-            from app.utils.schedules import _order_schedule  # Import internal function for updates
-            # Check if schedule already exists
-            existing_schedules = load_schedules()
-            existing_names = [s.get("name") for s in existing_schedules if s.get("name")]
-            is_update = schedule_name in existing_names
+            ordered_schedule = _order_schedule(freeze_config)
+            merge_result = {}
             
-            if is_update:
-                # Update existing schedule
-                ordered_schedule = _order_schedule(freeze_config)
-                updated_schedules = []
-                for s in existing_schedules:
-                    if s.get("name") == schedule_name:
-                        updated_schedules.append(ordered_schedule)
-                    else:
-                        updated_schedules.append(s)
-                success = save_schedules(updated_schedules)
-            else:
-                # Add new schedule
-                success = add_schedule(freeze_config)
+            def _merge(existing_schedules):
+                # Runs against the latest ConfigMap state on every conflict retry
+                name_to_index = {s["name"]: i for i, s in enumerate(existing_schedules) if s.get("name")}
+                index = name_to_index.get(schedule_name)
+                if index is not None:
+                    # Update existing schedule in place
+                    existing_schedules[index] = ordered_schedule
+                else:
+                    existing_schedules.append(ordered_schedule)
+                merge_result["is_update"] = index is not None
+                return existing_schedules
             
-            if not success:
+            saved_schedules = await asyncio.to_thread(modify_schedules, _merge)
+            
+            if saved_schedules is None:
                 raise HTTPException(status_code=500, detail="Failed to save schedule to ConfigMap")
+            is_update = merge_result["is_update"]
+            event_type = "schedule_modified" if is_update else "schedule_added"
             
-            # Reload config to refresh schedules
-            await config_loader.load_config()
+            # Refresh the in-memory schedules with what was just saved instead of re-reading both ConfigMaps
+            config_loader.update_schedules(saved_schedules)
             
             # Record history
             try:
                 tracker = get_history_tracker()
-                event_type = "schedule_modified" if is_update else "schedule_added"
                 tracker.record_event(
                     event_type=event_type,
                     reason=f"Schedule '{schedule_name}' {'updated' if is_update else 'added'}",
@@ -915,55 +1022,58 @@ async def apply_template(
                     namespace=", ".join(freeze_config.get("namespaces", [])) if freeze_config.get("namespaces") else None,
                     triggered_by="api"
                 )
-                # Persist to ConfigMap
-                await tracker.save_to_configmap()
+                # Persist to ConfigMap (debounced)
+                tracker.mark_dirty()
             except Exception as hist_error:
                 logger.warning(f"Failed to save history event: {hist_error}", exc_info=True)
                 # Don't fail the request, but log the error
             
+            side_effects = []
+            
             # Send notification
             notif_mgr = get_notification_manager()
-            if notif_mgr:
-                await notif_mgr.send_notification(
-                    "schedule_modified" if is_update else "schedule_added",
+            if notif_mgr and notif_mgr.has_subscribers_for(event_type):
+                side_effects.append(notif_mgr.send_notification(
+                    event_type,
                     {
                         "schedule_name": schedule_name,
                         "schedule": freeze_config
                     }
-                )
+                ))
             
             # Audit log
             audit = get_audit_logger()
-            if audit:
-                from app.audit.logger import AuditActor, AuditResource
+            if audit and audit.enabled:
                 actor = audit.create_actor("api-user", "system")
                 resource = audit.create_resource("freeze_schedule", schedule_name)
-                event_type_audit = "schedule_modified" if is_update else "schedule_added"
-                await audit.log_event(event_type_audit, actor, resource, "success", {
+                side_effects.append(audit.log_event(event_type, actor, resource, "success", {
                     "schedule_name": schedule_name,
                     "schedule": freeze_config
-                })
+                }, timestamp=now))
+            
+            if side_effects:
+                background.add_task(_run_side_effects, side_effects)
         except HTTPException:
             raise
         except Exception as update_error:
             logger.error(f"Could not save schedule to ConfigMap: {update_error}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Failed to save schedule: {str(update_error)}")
         
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/templates/apply", "POST", 200, duration)
         
         return {
             "success": True,
             "data": freeze_config,
             "message": f"Schedule stored in freeze_schedule ConfigMap",
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now.isoformat()
         }
     except HTTPException:
         raise
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/freeze/templates/apply", "POST", 500, duration)
         logger.error(f"Error applying template: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -971,28 +1081,26 @@ async def apply_template(
 
 # Dry-run API
 class DryRunRequest(BaseModel):
-    request: Dict[str, Any]
+    model_config = _REQUEST_MODEL_CONFIG
+    
+    request: dict[str, Any]
 
 
 @router.post("/dryrun/evaluate")
 async def evaluate_dry_run_request(
     dryrun_request: DryRunRequest,
-    http_request: Request,
-    config_loader: ConfigLoader = Depends(get_config_loader),
-    exemption_manager: ExemptionManager = Depends(get_exemption_manager)
+    config_loader: ConfigLoader = Depends(_config_loader_dep),
+    exemption_manager: ExemptionManager = Depends(_exemption_manager_dep)
 ):
     """Evaluate an admission request in dry-run mode"""
-    check_rate_limit(http_request)
-    start_time = time.time()
+    start_time = time.monotonic()
+    now = datetime.now(timezone.utc)
     try:
-        from app.dryrun.evaluator import evaluate_dry_run, is_dry_run
-        from app.freeze.evaluator import is_freeze_active
-        from app.bypass.evaluator import check_bypass
-        
         admission_request = dryrun_request.request
+        ctx = AdmissionContext.from_request(admission_request, default_username="system:serviceaccount")
         
         # Check if it's actually a dry-run request
-        if not is_dry_run(admission_request):
+        if not ctx.dry_run:
             raise HTTPException(
                 status_code=400,
                 detail="Request is not in dry-run mode"
@@ -1002,27 +1110,24 @@ async def evaluate_dry_run_request(
         config = config_loader.get_config()
         
         # Check if freeze is active
-        freeze_active, freeze_window = is_freeze_active(config)
+        freeze_active, freeze_window = is_freeze_active_cached(config, None, config_loader.config_version)
         
-        # Check bypass (extract user info from request)
-        user_info = admission_request.get("userInfo", {})
-        username = user_info.get("username", "system:serviceaccount")
-        groups = user_info.get("groups", [])
-        bypass_result = check_bypass(admission_request, config, username, groups)
+        # Check bypass (user info comes from the request context)
+        bypass_result = check_bypass(ctx, config)
         
         # Normalize bypass result (check_bypass returns "allowed", but we need "bypassed")
         bypassed = bypass_result.get("allowed", False)
         
         # Evaluate dry-run
         allowed, warnings = evaluate_dry_run(
-            request=admission_request,
+            ctx=ctx,
             would_be_blocked=freeze_active and not bypassed,
             reason=config.get("freeze_message", "Freeze is active"),
             bypass_available=bypassed,
             bypass_type=bypass_result.get("type")
         )
         
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/dryrun/evaluate", "POST", 200, duration)
         
         return {
@@ -1035,12 +1140,12 @@ async def evaluate_dry_run_request(
                 "bypass_available": bypassed,
                 "bypass_type": bypass_result.get("type")
             },
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now.isoformat()
         }
     except HTTPException:
         raise
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         record_api_request("/dryrun/evaluate", "POST", 500, duration)
         logger.error(f"Error evaluating dry-run: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
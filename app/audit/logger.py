@@ -1,13 +1,29 @@
 """Advanced audit logger"""
+import asyncio
 import logging
-import json
-import uuid
-from typing import Dict, Any, List, Optional
+import secrets
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+
+import httpx
+import orjson
+
+from app.metrics.collector import record_audit_event_dropped
 
 logger = logging.getLogger(__name__)
 
+# Compliance tags attached to each audit event type
+_COMPLIANCE_TAGS: Dict[str, Tuple[str, ...]] = {
+    "freeze_enabled": ("soc2", "audit"),
+    "freeze_disabled": ("soc2", "audit"),
+    "violation": ("soc2", "security", "audit"),
+    "exemption_created": ("soc2", "audit"),
+    "exemption_deleted": ("soc2", "audit"),
+    "config_changed": ("soc2", "audit")
+}
+_DEFAULT_TAGS: Tuple[str, ...] = ("audit",)
+
 
 @dataclass
 class AuditActor:
@@ -19,7 +35,14 @@ class AuditActor:
     session_id: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        data = {"type": self.type, "identity": self.identity}
+        if self.ip_address is not None:
+            data["ip_address"] = self.ip_address
+        if self.user_agent is not None:
+            data["user_agent"] = self.user_agent
+        if self.session_id is not None:
+            data["session_id"] = self.session_id
+        return data
 
 
 @dataclass
@@ -31,7 +54,12 @@ class AuditResource:
     cluster: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        data = {"type": self.type, "name": self.name}
+        if self.namespace is not None:
+            data["namespace"] = self.namespace
+        if self.cluster is not None:
+            data["cluster"] = self.cluster
+        return data
 
 
 @dataclass
@@ -44,15 +72,21 @@ class AuditEvent:
     resource: AuditResource
     outcome: str  # success, failure, denied
     details: Dict[str, Any]
-    compliance_tags: List[str]  # soc2, hipaa, etc.
+    compliance_tags: Tuple[str, ...]  # soc2, hipaa, etc.
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        data = asdict(self)
-        data["timestamp"] = self.timestamp.isoformat()
-        data["actor"] = self.actor.to_dict()
-        data["resource"] = self.resource.to_dict()
-        return data
+        # Built directly rather than via asdict(), which deep-copies every field
+        return {
+            "event_id": self.event_id,
+            "timestamp": self.timestamp.isoformat(),
+            "event_type": self.event_type,
+            "actor": self.actor.to_dict(),
+            "resource": self.resource.to_dict(),
+            "outcome": self.outcome,
+            "details": self.details,
+            "compliance_tags": self.compliance_tags
+        }
 
 
 class AuditSink:
@@ -61,21 +95,75 @@ class AuditSink:
     async def write(self, event: AuditEvent):
         """Write audit event"""
         raise NotImplementedError
+    
+    async def close(self):
+        """Flush pending events and release resources"""
 
 
 class FileAuditSink(AuditSink):
-    """File-based audit sink"""
+    """
+    File-based audit sink
+    
+    write() only serializes the event and queues the line. A single background
+    task drains the queue in batches and appends each batch with one write
+    from a worker thread, so file I/O never blocks the event loop and the file
+    is opened once instead of per event.
+    """
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, max_queue_size: int = 10000, batch_size: int = 256):
         self.file_path = file_path
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._file = None
     
     async def write(self, event: AuditEvent):
-        """Write audit event to file"""
-        try:
-            with open(self.file_path, "a") as f:
-                f.write(json.dumps(event.to_dict()) + "\n")
-        except Exception as e:
-            logger.error(f"Error writing audit event to file: {e}", exc_info=True)
+        """Queue audit event for writing to file"""
+        if self._writer_task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._writer_task = asyncio.create_task(self._drain())
+        # Waits only when the queue is full (backpressure rather than dropping audit events)
+        await self._queue.put(orjson.dumps(event.to_dict()))
+    
+    async def _drain(self):
+        """Write queued lines in batches"""
+        queue = self._queue
+        while True:
+            lines = [await queue.get()]
+            while len(lines) < self.batch_size:
+                try:
+                    lines.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await asyncio.to_thread(self._write_lines, b"\n".join(lines) + b"\n")
+            except Exception as e:
+                logger.error(f"Error writing {len(lines)} audit events to file: {e}", exc_info=True)
+            finally:
+                for _ in lines:
+                    queue.task_done()
+    
+    def _write_lines(self, data: bytes):
+        """Append data to the audit file (runs in a worker thread)"""
+        if self._file is None:
+            self._file = open(self.file_path, "ab", buffering=1 << 16)
+        self._file.write(data)
+        self._file.flush()
+    
+    async def close(self):
+        """Write out queued events and close the file"""
+        if self._writer_task is not None:
+            await self._queue.join()
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
 
 
 class ExternalAuditSink(AuditSink):
@@ -84,77 +172,129 @@ class ExternalAuditSink(AuditSink):
     def __init__(self, endpoint: str, auth: Optional[Dict[str, str]] = None):
         self.endpoint = endpoint
         self.auth = auth
+        headers = {"Content-Type": "application/json"}
+        if auth:
+            if "bearer" in auth:
+                headers["Authorization"] = f"Bearer {auth['bearer']}"
+            elif "api_key" in auth:
+                headers["X-API-Key"] = auth["api_key"]
+        # One client for the sink's lifetime so keep-alive connections (and TLS sessions) are reused
+        self._client = httpx.AsyncClient(
+            timeout=10.0,
+            headers=headers,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+        )
     
     async def write(self, event: AuditEvent):
         """Write audit event to external system"""
         try:
-            import httpx
-            headers = {}
-            if self.auth:
-                if "bearer" in self.auth:
-                    headers["Authorization"] = f"Bearer {self.auth['bearer']}"
-                elif "api_key" in self.auth:
-                    headers["X-API-Key"] = self.auth["api_key"]
-            
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    self.endpoint,
-                    json=event.to_dict(),
-                    headers=headers
-                )
-                response.raise_for_status()
+            response = await self._client.post(self.endpoint, content=orjson.dumps(event.to_dict()))
+            response.raise_for_status()
         except Exception as e:
             logger.error(f"Error writing audit event to external system: {e}", exc_info=True)
+    
+    async def close(self):
+        """Close the HTTP client"""
+        await self._client.aclose()
 
 
 class AuditLogger:
-    """Advanced audit logger"""
+    """
+    Advanced audit logger
+    
+    log_event() only builds the event and puts it on a bounded queue; a
+    background task hands queued events to the sinks. A slow or unreachable
+    sink therefore never blocks request handling. When the queue is full the
+    event is dropped and counted instead of applying backpressure.
+    """
     
-    def __init__(self, sinks: Optional[List[AuditSink]] = None, enabled: bool = True):
+    def __init__(self, sinks: Optional[List[AuditSink]] = None, enabled: bool = True, max_queue_size: int = 5000):
         self.enabled = enabled
         self.sinks = sinks or []
-        self.compliance_tags_map = {
-            "freeze_enabled": ["soc2", "audit"],
-            "freeze_disabled": ["soc2", "audit"],
-            "violation": ["soc2", "security", "audit"],
-            "exemption_created": ["soc2", "audit"],
-            "exemption_deleted": ["soc2", "audit"],
-            "config_changed": ["soc2", "audit"]
-        }
+        self.max_queue_size = max_queue_size
+        self.dropped_events = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_task: Optional[asyncio.Task] = None
     
     def add_sink(self, sink: AuditSink):
         """Add audit sink"""
         self.sinks.append(sink)
     
+    async def close(self):
+        """Deliver queued events, then flush and close all sinks"""
+        if self._worker_task is not None:
+            await self._queue.join()
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+        for sink in self.sinks:
+            try:
+                await sink.close()
+            except Exception as e:
+                logger.error(f"Error closing audit sink: {e}", exc_info=True)
+    
     async def log_event(
         self,
         event_type: str,
         actor: AuditActor,
         resource: AuditResource,
         outcome: str,
-        details: Dict[str, Any]
+        details: Dict[str, Any],
+        timestamp: Optional[datetime] = None
     ):
-        """Log audit event"""
+        """
+        Log audit event
+        
+        Args:
+            timestamp: Time of the event (defaults to now); callers that already
+                took the request time pass it to avoid another clock read
+        """
         if not self.enabled:
             return
         
         event = AuditEvent(
-            event_id=str(uuid.uuid4()),
-            timestamp=datetime.now(timezone.utc),
+            event_id=secrets.token_hex(16),
+            timestamp=timestamp or datetime.now(timezone.utc),
             event_type=event_type,
             actor=actor,
             resource=resource,
             outcome=outcome,
             details=details,
-            compliance_tags=self.compliance_tags_map.get(event_type, ["audit"])
+            compliance_tags=_COMPLIANCE_TAGS.get(event_type, _DEFAULT_TAGS)
         )
         
-        # Write to all sinks
-        for sink in self.sinks:
+        if self._worker_task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker_task = asyncio.create_task(self._process())
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped_events += 1
+            record_audit_event_dropped()
+            logger.warning(
+                f"Audit queue full ({self.max_queue_size} events), dropped {event_type} event "
+                f"({self.dropped_events} dropped in total)"
+            )
+    
+    async def _process(self):
+        """Write queued events to the sinks"""
+        queue = self._queue
+        while True:
+            event = await queue.get()
             try:
-                await sink.write(event)
-            except Exception as e:
-                logger.error(f"Error writing to audit sink: {e}", exc_info=True)
+                # Write to all sinks concurrently, so one slow sink doesn't delay the others
+                results = await asyncio.gather(
+                    *[sink.write(event) for sink in self.sinks],
+                    return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error(f"Error writing to audit sink: {result}", exc_info=result)
+            finally:
+                queue.task_done()
     
     def create_actor(
         self,
@@ -1,16 +1,21 @@
 """Bypass mechanism evaluation"""
 import logging
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, List, Optional, Sequence, Tuple
+
+from app.admission.context import AdmissionContext
 
 logger = logging.getLogger(__name__)
 
+# (bypass_allowed_users list the set was built from, set). ConfigLoader.get_config()
+# hands out views of the same config (and list) until the next reload, so the
+# list's identity tells us when to rebuild.
+_allowed_users_cache: Optional[Tuple[List[str], FrozenSet[str]]] = None
+
 
 def check_bypass(
-    request: Dict[str, Any],
-    config: Dict[str, Any],
-    username: str,
-    groups: List[str],
-    exemption_manager: Optional[Any] = None
+    ctx: AdmissionContext,
+    config: Dict[str, Any]
 ) -> Dict[str, Any]:
     """
     Check if request should bypass freeze (synchronous bypass mechanisms only)
@@ -22,17 +27,14 @@ def check_bypass(
     Note: Temporary exemption check is handled separately in the async webhook handler
     
     Args:
-        request: Admission request
+        ctx: Admission request context
         config: Configuration dictionary
-        username: Username from userInfo
-        groups: Groups from userInfo
-        exemption_manager: Optional (not used in sync function, kept for compatibility)
     
     Returns:
         Dict with 'allowed' (bool), 'reason' (str), and 'type' (str)
     """
     # 1. Check annotation bypass
-    annotation_result = _check_annotation_bypass(request, config)
+    annotation_result = _check_annotation_bypass(ctx.annotations, config)
     if annotation_result["allowed"]:
         return annotation_result
     
@@ -40,7 +42,7 @@ def check_bypass(
     # This function only handles sync bypass mechanisms (annotation, user allowlist)
     
     # 2. Check user allowlist
-    user_result = _check_user_allowlist(username, groups, config)
+    user_result = _check_user_allowlist(ctx.username, ctx.groups, config)
     if user_result["allowed"]:
         return user_result
     
@@ -48,28 +50,35 @@ def check_bypass(
     return {"allowed": False, "reason": "No bypass mechanism matched"}
 
 
+# Accepted spellings of the bypass annotation value (avoids lowercasing per request)
+_BYPASS_TRUE_VALUES = frozenset(("true", "True", "TRUE"))
+
+
+@lru_cache(maxsize=8)
+def _get_bypass_keys(annotation_key: str) -> Tuple[str, str]:
+    """Get the (bypass, reason) annotation keys for a configured bypass annotation key"""
+    return annotation_key, f"{annotation_key.rsplit('/', 1)[0]}/emergency-reason"
+
+
 def _check_annotation_bypass(
-    request: Dict[str, Any],
+    annotations: Dict[str, str],
     config: Dict[str, Any]
 ) -> Dict[str, Any]:
     """Check if annotation bypass is present"""
-    annotation_key = config.get(
+    if not annotations:
+        return {"allowed": False, "reason": "No bypass annotation found"}
+    
+    bypass_key, reason_key = _get_bypass_keys(config.get(
         "bypass_annotation_key",
         "admission-controller.io/emergency-bypass"
-    )
-    
-    # Get object from request
-    object_data = request.get("object", {})
-    metadata = object_data.get("metadata", {})
-    annotations = metadata.get("annotations", {})
+    ))
     
     # Check for bypass annotation
-    bypass_value = annotations.get(annotation_key, "").lower()
-    if bypass_value == "true":
-        reason = annotations.get(
-            f"{annotation_key.rsplit('/', 1)[0]}/emergency-reason",
-            "Emergency bypass annotation present"
-        )
+    bypass_value = annotations.get(bypass_key)
+    if bypass_value is not None and (
+        bypass_value in _BYPASS_TRUE_VALUES or bypass_value.lower() == "true"
+    ):
+        reason = annotations.get(reason_key, "Emergency bypass annotation present")
         return {
             "allowed": True,
             "type": "annotation",
@@ -79,9 +88,20 @@ def _check_annotation_bypass(
     return {"allowed": False, "reason": "No bypass annotation found"}
 
 
+def _get_allowed_users_set(allowed_users: List[str]) -> FrozenSet[str]:
+    """Get bypass_allowed_users as a frozenset, rebuilt only when the config list changes"""
+    global _allowed_users_cache
+    cache = _allowed_users_cache
+    if cache is not None and cache[0] is allowed_users:
+        return cache[1]
+    allowed_set = frozenset(allowed_users)
+    _allowed_users_cache = (allowed_users, allowed_set)
+    return allowed_set
+
+
 def _check_user_allowlist(
     username: str,
-    groups: List[str],
+    groups: Sequence[str],
     config: Dict[str, Any]
 ) -> Dict[str, Any]:
     """Check if user is in allowlist"""
@@ -90,22 +110,23 @@ def _check_user_allowlist(
     if not allowed_users:
         return {"allowed": False, "reason": "No users in allowlist"}
     
+    allowed_set = _get_allowed_users_set(allowed_users)
+    
     # Check username
-    if username in allowed_users:
+    if username in allowed_set:
         return {
             "allowed": True,
             "type": "user",
             "reason": f"User {username} is in bypass allowlist"
         }
     
-    # Check groups
-    for group in groups:
-        if group in allowed_users:
-            return {
-                "allowed": True,
-                "type": "group",
-                "reason": f"Group {group} is in bypass allowlist"
-            }
+    # Check groups (report the first matching group, in request order)
+    if not allowed_set.isdisjoint(groups):
+        group = next(g for g in groups if g in allowed_set)
+        return {
+            "allowed": True,
+            "type": "group",
+            "reason": f"Group {group} is in bypass allowlist"
+        }
     
     return {"allowed": False, "reason": f"User {username} not in allowlist"}
-
@@ -0,0 +1 @@
+"""In-memory caches of Kubernetes objects"""
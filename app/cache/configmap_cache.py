@@ -0,0 +1,168 @@
+"""Watch-backed in-memory ConfigMap cache"""
+import copy
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from kubernetes import client, watch
+from kubernetes.client.rest import ApiException
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigMapCache:
+    """
+    Keeps a fixed set of ConfigMaps in memory, kept current by watches
+    
+    One daemon thread per ConfigMap lists it once (by metadata.name field
+    selector, which is what the resourceNames-scoped RBAC rules allow) and then
+    follows a watch from the list's resourceVersion, re-listing when the watch
+    expires (410 Gone). Reads are served from memory, so request handlers make
+    no API server round-trip to read a ConfigMap; only writes go to the API server.
+    """
+    
+    def __init__(
+        self,
+        namespace: str,
+        k8s_client: client.CoreV1Api,
+        names: Iterable[str],
+        watch_timeout: int = 300
+    ):
+        """
+        Initialize ConfigMap cache
+        
+        Args:
+            namespace: Namespace of the cached ConfigMaps
+            k8s_client: Kubernetes CoreV1Api client
+            names: Names of the ConfigMaps to cache (others are never listed or watched)
+            watch_timeout: Server-side timeout of each watch request (seconds)
+        """
+        self.namespace = namespace
+        self._v1 = k8s_client
+        self._watch_timeout = watch_timeout
+        self._store: Dict[Tuple[str, str], client.V1ConfigMap] = {}
+        self._lock = threading.Lock()
+        # Set per name once its initial list has completed
+        self._synced: Dict[str, threading.Event] = {name: threading.Event() for name in names}
+        self._stop_event = threading.Event()
+        self._watches: Dict[str, watch.Watch] = {}
+        self._threads: List[threading.Thread] = []
+    
+    def start(self):
+        """Start one background list/watch thread per ConfigMap"""
+        if self._threads:
+            return
+        for name in self._synced:
+            thread = threading.Thread(
+                target=self._run, args=(name,), name=f"configmap-cache-{name}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+    
+    def stop(self):
+        """Stop the background list/watch threads"""
+        self._stop_event.set()
+        for w in list(self._watches.values()):
+            w.stop()
+    
+    def is_synced(self, name: Optional[str] = None) -> bool:
+        """
+        Check if the initial list has completed
+        
+        Args:
+            name: ConfigMap to check (all cached ConfigMaps when omitted)
+        """
+        if name is None:
+            return all(synced.is_set() for synced in self._synced.values())
+        synced = self._synced.get(name)
+        return synced is not None and synced.is_set()
+    
+    def get(self, namespace: str, name: str) -> Optional[client.V1ConfigMap]:
+        """
+        Get a ConfigMap from the cache
+        
+        Args:
+            namespace: ConfigMap namespace
+            name: ConfigMap name
+        
+        Returns:
+            Deep copy of the cached ConfigMap (safe to mutate), or None if the
+            ConfigMap is not cached, has not synced yet or does not exist
+        """
+        cm = self.peek(namespace, name)
+        return copy.deepcopy(cm) if cm is not None else None
+    
+    def peek(self, namespace: str, name: str) -> Optional[client.V1ConfigMap]:
+        """
+        Get a ConfigMap from the cache without copying it
+        
+        The returned object is shared with the cache and must not be modified.
+        
+        Returns:
+            The cached ConfigMap, or None if the ConfigMap is not cached, has
+            not synced yet or does not exist
+        """
+        if namespace != self.namespace or not self.is_synced(name):
+            return None
+        with self._lock:
+            return self._store.get((namespace, name))
+    
+    def _run(self, name: str):
+        """List, then watch from the list's resourceVersion until stopped"""
+        field_selector = f"metadata.name={name}"
+        resource_version = None
+        while not self._stop_event.is_set():
+            try:
+                if resource_version is None:
+                    resource_version = self._list(name, field_selector)
+                
+                w = self._watches[name] = watch.Watch()
+                for event in w.stream(
+                    self._v1.list_namespaced_config_map,
+                    namespace=self.namespace,
+                    field_selector=field_selector,
+                    resource_version=resource_version,
+                    timeout_seconds=self._watch_timeout,
+                    allow_watch_bookmarks=True
+                ):
+                    if self._stop_event.is_set():
+                        break
+                    cm = event["object"]
+                    if event["type"] == "BOOKMARK":
+                        # Carries only a newer resourceVersion to resume from
+                        resource_version = cm.metadata.resource_version
+                        continue
+                    key = (self.namespace, name)
+                    with self._lock:
+                        if event["type"] == "DELETED":
+                            self._store.pop(key, None)
+                        else:
+                            self._store[key] = cm
+                    resource_version = cm.metadata.resource_version
+            except ApiException as e:
+                if e.status == 410:
+                    # Watch expired, re-list to resync
+                    logger.debug(f"ConfigMap {name} watch expired, re-listing")
+                    resource_version = None
+                else:
+                    logger.warning(f"Error watching ConfigMap {name} in {self.namespace}: {e}")
+                    resource_version = None
+                    self._stop_event.wait(5)  # Wait before retrying
+            except Exception as e:
+                logger.warning(f"Unexpected error in ConfigMap cache watch for {name}: {e}", exc_info=True)
+                resource_version = None
+                self._stop_event.wait(5)  # Wait before retrying
+        logger.info(f"ConfigMap cache watch for {name} stopped")
+    
+    def _list(self, name: str, field_selector: str) -> str:
+        """Replace the cached copy of a ConfigMap with a fresh list and return its resourceVersion"""
+        cm_list = self._v1.list_namespaced_config_map(namespace=self.namespace, field_selector=field_selector)
+        key = (self.namespace, name)
+        with self._lock:
+            if cm_list.items:
+                self._store[key] = cm_list.items[0]
+            else:
+                self._store.pop(key, None)
+        self._synced[name].set()
+        logger.debug(f"ConfigMap cache synced {name} in {self.namespace} (exists: {bool(cm_list.items)})")
+        return cm_list.metadata.resource_version
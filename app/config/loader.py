@@ -1,15 +1,37 @@
 """ConfigMap loader with Kubernetes Watch API"""
 import asyncio
+import fnmatch
 import logging
-from typing import Dict, Optional, Any
+import math
+import re
+import sys
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Any, Tuple
 from datetime import datetime, timezone
 import yaml
 
 from kubernetes import client, watch
 from kubernetes.client.rest import ApiException
 
+from app.freeze.schedule import parse_schedules
 from app.utils.kubernetes import get_k8s_client
 
+try:
+    from app.metrics.collector import (
+        record_config_reload_success as _RECORD_SUCCESS,
+        record_config_reload_error as _RECORD_ERROR,
+    )
+except Exception:  # Metrics not critical
+    _RECORD_SUCCESS = _RECORD_ERROR = lambda: None
+
+try:
+    # libyaml-backed loader (bundled with the PyYAML wheels), several times faster
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,12 +51,19 @@ class ConfigLoader:
         self.cache_ttl = cache_ttl
         self.use_watch = use_watch
         self._config: Optional[Dict[str, Any]] = None
+        self._config_view: Optional[Mapping[str, Any]] = None  # Read-only view of _config handed to callers
+        self._config_version = 0  # Bumped every time a new config is installed
+        self._last_rv: Optional[str] = None  # resourceVersion of the ConfigMap the config was parsed from
         self._last_load: Optional[datetime] = None
         self._k8s_client = None
         self._watch_task = None
         self._watch_stop_event = None
         self._ready = False
         self._reload_errors = 0
+        # (config the lookups were built from, monitored set, kind->monitored map, exempt namespaces)
+        self._lookup_cache: Optional[Tuple[Dict[str, Any], FrozenSet[str], Dict[str, str], "NamespaceMatcher"]] = None
+        # (config the set was built from, api_allowed_serviceaccounts set)
+        self._allowed_sa_cache: Optional[Tuple[Dict[str, Any], FrozenSet[str]]] = None
     
     async def start(self):
         """Start the config loader"""
@@ -60,71 +89,138 @@ class ConfigLoader:
             except asyncio.CancelledError:
                 pass
     
+    def _set_config(self, config: Dict[str, Any], resource_version: Optional[str] = None):
+        """
+        Install a new config and bump the config version
+        
+        Args:
+            config: Config to install
+            resource_version: resourceVersion of the ConfigMap it was parsed from (None for defaults)
+        """
+        # Parse freeze schedules once per installed config instead of on every freeze check
+        config["parsed_freeze_schedule"] = parse_schedules(config.get("freeze_schedule") or [])
+        self._config = config
+        self._config_view = MappingProxyType(config)
+        self._config_version += 1
+        self._last_rv = resource_version
+    
+    @property
+    def config_version(self) -> int:
+        """Version counter that changes whenever the config is (re)loaded"""
+        return self._config_version
+    
     def is_ready(self) -> bool:
         """Check if config loader is ready"""
         return self._ready and self._config is not None
     
     async def _watch_loop(self):
-        """Watch ConfigMap for changes using Kubernetes Watch API"""
-        import concurrent.futures
-        v1 = self._k8s_client
+        """
+        Watch ConfigMap for changes using Kubernetes Watch API
+        
+        The kubernetes client's watch stream is blocking, so it runs in a daemon
+        thread that hands each event to the event loop as soon as it arrives;
+        reloads happen in real time instead of after the watch window closes.
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        thread_stop = threading.Event()
         w = watch.Watch()
-        loop = asyncio.get_event_loop()
-        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        thread = threading.Thread(
+            target=self._stream_events,
+            args=(w, thread_stop, loop, events),
+            name="config-watch",
+            daemon=True
+        )
+        thread.start()
         
-        while not self._watch_stop_event.is_set():
-            try:
-                # Run the blocking stream() call in a thread pool to avoid blocking the event loop
-                def get_stream():
-                    return list(w.stream(
-                        v1.list_namespaced_config_map,
-                        namespace=self.namespace,
-                        field_selector=f"metadata.name={self.configmap_name}",
-                        timeout_seconds=60
-                    ))
-                
-                # Get events in a non-blocking way
-                stream_future = loop.run_in_executor(executor, get_stream)
+        try:
+            while not self._watch_stop_event.is_set():
+                event = await events.get()
                 try:
-                    events = await asyncio.wait_for(stream_future, timeout=65)
-                except asyncio.TimeoutError:
-                    continue  # Timeout, check stop event and retry
-                
-                for event in events:
-                    if self._watch_stop_event.is_set():
-                        break
+                    if isinstance(event, Exception):
+                        raise event
                     
                     event_type = event['type']
                     if event_type in ['ADDED', 'MODIFIED']:
+                        metadata = event['object'].metadata
+                        if metadata is not None and metadata.resource_version == self._last_rv and self._config is not None:
+                            # Already loaded this version (e.g. the initial ADDED event)
+                            logger.debug(f"ConfigMap {event_type.lower()} at loaded resourceVersion, skipping reload")
+                            continue
                         logger.info(f"ConfigMap {event_type.lower()}, reloading config...")
                         await self.load_config()
                     elif event_type == 'DELETED':
                         logger.warning("ConfigMap deleted, using default config")
-                        self._config = self._get_default_config()
+                        self._set_config(self._get_default_config())
                         self._last_load = datetime.now(timezone.utc)
-                
-            except ApiException as e:
-                if e.status == 404:
-                    logger.warning(f"ConfigMap not found, using defaults")
-                    self._config = self._get_default_config()
-                    await asyncio.sleep(5)  # Wait before retrying
-                else:
-                    logger.error(f"Error watching ConfigMap: {e}", exc_info=True)
+                    
+                except ApiException as e:
+                    if e.status == 404:
+                        logger.warning(f"ConfigMap not found, using defaults")
+                        self._set_config(self._get_default_config())
+                    else:
+                        logger.error(f"Error watching ConfigMap: {e}", exc_info=True)
+                        self._reload_errors += 1
+                except Exception as e:
+                    logger.error(f"Unexpected error in watch loop: {e}", exc_info=True)
                     self._reload_errors += 1
-                    await asyncio.sleep(5)  # Wait before retrying
-            except Exception as e:
-                logger.error(f"Unexpected error in watch loop: {e}", exc_info=True)
-                self._reload_errors += 1
-                try:
-                    from app.metrics.collector import record_config_reload_error
-                    record_config_reload_error()
-                except Exception:
-                    pass  # Metrics not critical
-                await asyncio.sleep(5)  # Wait before retrying
+                    _RECORD_ERROR()
+        finally:
+            thread_stop.set()
+            w.stop()
+            logger.info("ConfigMap watch stopped")
+    
+    def _stream_events(
+        self,
+        w: watch.Watch,
+        stop: threading.Event,
+        loop: asyncio.AbstractEventLoop,
+        events: asyncio.Queue
+    ):
+        """
+        Run the blocking watch and forward events (or errors) to the event loop (watch thread)
         
-        w.stop()
-        executor.shutdown(wait=False)
-        logger.info("ConfigMap watch stopped")
+        Each watch resumes from the last resourceVersion seen (initially the one
+        load_config parsed), so re-establishing it only streams changes made
+        since. Bookmark events keep that version current while the ConfigMap is
+        idle. When the version has expired (410 Gone) the watch restarts without
+        one and the API server replays the current object as ADDED.
+        """
+        v1 = self._k8s_client
+        resource_version = self._last_rv
+        try:
+            while not stop.is_set():
+                try:
+                    kwargs = {"resource_version": resource_version} if resource_version else {}
+                    for event in w.stream(
+                        v1.list_namespaced_config_map,
+                        namespace=self.namespace,
+                        field_selector=f"metadata.name={self.configmap_name}",
+                        timeout_seconds=60,
+                        allow_watch_bookmarks=True,
+                        **kwargs
+                    ):
+                        if stop.is_set():
+                            break
+                        metadata = event['object'].metadata
+                        if metadata is not None and metadata.resource_version:
+                            resource_version = metadata.resource_version
+                        if event['type'] == 'BOOKMARK':
+                            # Only advances the resourceVersion to resume from; nothing to reload
+                            continue
+                        loop.call_soon_threadsafe(events.put_nowait, event)
+                except ApiException as e:
+                    if e.status == 410:
+                        logger.debug("ConfigMap watch resourceVersion expired, restarting watch")
+                        resource_version = None
+                        continue
+                    loop.call_soon_threadsafe(events.put_nowait, e)
+                    stop.wait(5)  # Wait before retrying
+                except Exception as e:
+                    loop.call_soon_threadsafe(events.put_nowait, e)
+                    stop.wait(5)  # Wait before retrying
+        except RuntimeError:
+            pass  # Event loop closed during shutdown
     
     async def _refresh_loop(self):
         """Background task to refresh config periodically (fallback)"""
@@ -155,7 +251,7 @@ class ConfigLoader:
             except ApiException as e:
                 if e.status == 404:
                     logger.warning(f"ConfigMap {self.configmap_name} not found in namespace {self.namespace}, using defaults")
-                    self._config = self._get_default_config()
+                    self._set_config(self._get_default_config())
                     return self._config
                 elif attempt < max_retries - 1:
                     logger.warning(f"Failed to load ConfigMap (attempt {attempt + 1}/{max_retries}): {e}. Retrying in {retry_delay}s...")
@@ -164,7 +260,7 @@ class ConfigLoader:
                 else:
                     logger.error(f"Failed to load ConfigMap after {max_retries} attempts: {e}")
                     logger.warning("Using default configuration. ConfigMap will be retried in background.")
-                    self._config = self._get_default_config()
+                    self._set_config(self._get_default_config())
                     return self._config
             except Exception as e:
                 if attempt < max_retries - 1:
@@ -174,13 +270,21 @@ class ConfigLoader:
                 else:
                     logger.error(f"Failed to load ConfigMap after {max_retries} attempts: {e}")
                     logger.warning("Using default configuration. ConfigMap will be retried in background.")
-                    self._config = self._get_default_config()
+                    self._set_config(self._get_default_config())
                     return self._config
         
         # Continue with successful load
         if cm is None:
             logger.warning("ConfigMap not loaded, using defaults")
-            self._config = self._get_default_config()
+            self._set_config(self._get_default_config())
+            return self._config
+        
+        resource_version = cm.metadata.resource_version if cm.metadata else None
+        if resource_version is not None and resource_version == self._last_rv and self._config is not None:
+            # ConfigMap unchanged since the last parse; only the schedules ConfigMap may have moved
+            schedules = self._load_freeze_schedule()
+            if schedules != self._config.get("freeze_schedule"):
+                self.update_schedules(schedules)
             return self._config
             
         try:
@@ -200,6 +304,7 @@ class ConfigLoader:
                     )
                 except ValueError as e:
                     logger.warning(f"Invalid freeze_until format: {freeze_until_str}, error: {e}")
+            config_data["freeze_until_ts"] = _freeze_until_timestamp(config_data["freeze_until"])
             
             # Parse freeze_message
             config_data["freeze_message"] = cm.data.get(
@@ -214,92 +319,23 @@ class ConfigLoader:
             )
             
             # Parse bypass_allowed_users
-            bypass_users_str = cm.data.get("bypass_allowed_users", "")
-            config_data["bypass_allowed_users"] = [
-                line.strip()
-                for line in bypass_users_str.split("\n")
-                if line.strip()
-            ]
+            config_data["bypass_allowed_users"] = _split_lines(cm.data.get("bypass_allowed_users", ""))
             
             # Parse api_allowed_serviceaccounts (for API authorization)
-            api_allowed_str = cm.data.get("api_allowed_serviceaccounts", "")
-            config_data["api_allowed_serviceaccounts"] = [
-                line.strip()
-                for line in api_allowed_str.split("\n")
-                if line.strip() and not line.strip().startswith("#")
-            ]
+            config_data["api_allowed_serviceaccounts"] = _split_lines(
+                cm.data.get("api_allowed_serviceaccounts", ""), skip_comments=True
+            )
             
             # Parse bypass_exempt_namespaces
-            exempt_ns_str = cm.data.get("bypass_exempt_namespaces", "")
-            config_data["bypass_exempt_namespaces"] = [
-                line.strip()
-                for line in exempt_ns_str.split("\n")
-                if line.strip()
-            ]
+            config_data["bypass_exempt_namespaces"] = _split_lines(cm.data.get("bypass_exempt_namespaces", ""))
             
-            # Parse monitored_resources
+            # Parse monitored_resources (memoized by the raw string, which rarely changes)
             monitored_str = cm.data.get("monitored_resources", "deployments")
             if isinstance(monitored_str, str):
-                # Strip whitespace and try to parse as YAML
-                monitored_str = monitored_str.strip()
-                # Try to parse as YAML list
-                try:
-                    parsed = yaml.safe_load(monitored_str)
-                    if isinstance(parsed, list):
-                        config_data["monitored_resources"] = parsed
-                        logger.debug(f"Parsed monitored_resources as YAML list: {parsed}")
-                    elif isinstance(parsed, str):
-                        # If YAML parser returned a string, try to extract list items from YAML format
-                        # Handle cases like "- deployments\n- statefulsets"
-                        lines = parsed.split('\n')
-                        resources = []
-                        for line in lines:
-                            line = line.strip()
-                            if line.startswith('-'):
-                                resource = line[1:].strip()
-                                if resource:
-                                    resources.append(resource)
-                        
-                        if resources:
-                            config_data["monitored_resources"] = resources
-                            logger.debug(f"Extracted monitored_resources from YAML string: {resources}")
-                        else:
-                            # Fallback to comma split
-                            config_data["monitored_resources"] = [
-                                r.strip() for r in parsed.split(",") if r.strip()
-                            ] or ["deployments"]
-                    else:
-                        # Fallback to default
-                        config_data["monitored_resources"] = ["deployments"]
-                        logger.warning(f"Unexpected type for monitored_resources: {type(parsed)}, using default")
-                except yaml.YAMLError as e:
-                    logger.warning(f"Failed to parse monitored_resources as YAML: {e}, trying to extract from string")
-                    # Try to extract list items from YAML-like format
-                    lines = monitored_str.split('\n')
-                    resources = []
-                    for line in lines:
-                        line = line.strip()
-                        if line.startswith('-'):
-                            resource = line[1:].strip()
-                            if resource:
-                                resources.append(resource)
-                    
-                    if resources:
-                        config_data["monitored_resources"] = resources
-                        logger.debug(f"Extracted monitored_resources from YAML-like string: {resources}")
-                    else:
-                        # Fall back to comma split
-                        config_data["monitored_resources"] = [
-                            r.strip() for r in monitored_str.split(",") if r.strip()
-                        ] or ["deployments"]
+                config_data["monitored_resources"] = list(_parse_monitored_resources(monitored_str))
             else:
                 config_data["monitored_resources"] = ["deployments"]
             
-            # Ensure monitored_resources is always a list of strings
-            if not isinstance(config_data.get("monitored_resources"), list):
-                logger.error(f"monitored_resources is not a list: {config_data.get('monitored_resources')}, type: {type(config_data.get('monitored_resources'))}")
-                config_data["monitored_resources"] = ["deployments"]
-            
             logger.info(f"Final monitored_resources: {config_data.get('monitored_resources')}")
             
             # Parse fail_closed
@@ -307,39 +343,40 @@ class ConfigLoader:
             
             # Load freeze_schedule from separate ConfigMap (NOT managed by Helm)
             # This prevents schedules from being deleted during Helm upgrades
-            try:
-                from app.utils.schedules import load_schedules
-                schedules = load_schedules()
-                config_data["freeze_schedule"] = schedules
-                logger.debug(f"Loaded {len(schedules)} schedules from separate ConfigMap")
-            except Exception as e:
-                logger.warning(f"Could not load schedules from separate ConfigMap: {e}")
-                config_data["freeze_schedule"] = []
+            config_data["freeze_schedule"] = self._load_freeze_schedule()
             
-            self._config = config_data
+            self._set_config(config_data, resource_version)
             self._last_load = datetime.now(timezone.utc)
             self._reload_errors = 0  # Reset error count on successful load
             
             # Record metrics
-            try:
-                from app.metrics.collector import record_config_reload_success
-                record_config_reload_success()
-            except Exception:
-                pass  # Metrics not critical
+            _RECORD_SUCCESS()
             
             logger.info(f"Config loaded successfully. Freeze enabled: {config_data['freeze_enabled']}")
             return config_data
         except Exception as e:
             logger.error(f"Error parsing ConfigMap: {e}", exc_info=True)
             # Use defaults instead of raising
-            self._config = self._get_default_config()
+            self._set_config(self._get_default_config())
             return self._config
     
+    def _load_freeze_schedule(self) -> List[Dict[str, Any]]:
+        """Load freeze_schedule from the separate schedules ConfigMap"""
+        try:
+            from app.utils.schedules import load_schedules
+            schedules = load_schedules()
+            logger.debug(f"Loaded {len(schedules)} schedules from separate ConfigMap")
+            return schedules
+        except Exception as e:
+            logger.warning(f"Could not load schedules from separate ConfigMap: {e}")
+            return []
+    
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration"""
         return {
             "freeze_enabled": False,
             "freeze_until": None,
+            "freeze_until_ts": math.inf,
             "freeze_message": "Deployment freeze is active.",
             "bypass_annotation_key": "admission-controller.io/emergency-bypass",
             "bypass_allowed_users": [],
@@ -350,14 +387,174 @@ class ConfigLoader:
             "freeze_schedule": []
         }
     
+    def update_schedules(self, schedules: List[Dict[str, Any]]):
+        """
+        Install a freeze_schedule list that was just saved to the schedules ConfigMap
+        
+        Avoids re-reading both ConfigMaps after a local write; the config
+        version is bumped so cached lookups and freeze decisions are rebuilt.
+        """
+        config = dict(self._config if self._config is not None else self._get_default_config())
+        config["freeze_schedule"] = schedules
+        self._set_config(config, self._last_rv)
+    
     def get_reload_errors(self) -> int:
         """Get count of config reload errors"""
         return self._reload_errors
     
-    def get_config(self) -> Dict[str, Any]:
-        """Get current configuration (cached)"""
-        if self._config is None:
+    def get_config(self) -> Mapping[str, Any]:
+        """
+        Get current configuration (cached)
+        
+        Returns a read-only view of the installed config rather than a copy;
+        every reload installs a new dict, so a view never changes under a caller.
+        """
+        if self._config_view is None:
             logger.warning("Config not loaded, using defaults")
             return self._get_default_config()
-        return self._config.copy()
+        return self._config_view
+    
+    def get_admission_lookups(self) -> Tuple[FrozenSet[str], Dict[str, str], "NamespaceMatcher"]:
+        """
+        Get precomputed lookup tables for the admission hot path
+        
+        Rebuilt only when the underlying config object changes (every reload
+        assigns a new dict), so the webhook does no per-request normalization.
+        
+        Returns:
+            Tuple of (monitored resources set, kind-to-monitored-resource map, exempt namespaces matcher)
+        """
+        config = self._config if self._config is not None else self._get_default_config()
+        cache = self._lookup_cache
+        if cache is not None and cache[0] is config:
+            return cache[1], cache[2], cache[3]
+        
+        monitored = frozenset(
+            sys.intern(str(r).strip().lower())
+            for r in config.get("monitored_resources", ["deployments"]) if str(r).strip()
+        )
+        # Map both singular kinds and the plural names themselves to the monitored entry
+        # e.g. "deployment" -> "deployments", "networkpolicy" -> "networkpolicies"
+        kind_map: Dict[str, str] = {}
+        for resource in monitored:
+            kind_map[resource] = resource
+            for singular in _singular_forms(resource):
+                kind_map.setdefault(sys.intern(singular), resource)
+        exempt = NamespaceMatcher(config.get("bypass_exempt_namespaces", []))
+        
+        self._lookup_cache = (config, monitored, kind_map, exempt)
+        return monitored, kind_map, exempt
+
+    
+    def get_api_allowed_serviceaccounts(self) -> FrozenSet[str]:
+        """Get the API ServiceAccount/group allowlist as a frozenset (cached per loaded config)"""
+        config = self._config if self._config is not None else self._get_default_config()
+        cache = self._allowed_sa_cache
+        if cache is not None and cache[0] is config:
+            return cache[1]
+        
+        allowed = frozenset(config.get("api_allowed_serviceaccounts", []))
+        self._allowed_sa_cache = (config, allowed)
+        return allowed
+
+
+class NamespaceMatcher:
+    """
+    Matches namespaces against a list of names and glob patterns (e.g. "team-*")
+    
+    Literal names go into a frozenset; patterns are compiled once into a single
+    regex alternation, so a lookup is one set probe plus at most one fullmatch.
+    Supports the `in` operator like the plain list it replaces.
+    """
+    
+    __slots__ = ("literals", "_pattern")
+    
+    def __init__(self, entries):
+        literals = set()
+        patterns = []
+        for entry in entries:
+            if any(c in entry for c in "*?["):
+                patterns.append(entry)
+            else:
+                literals.add(entry)
+        self.literals: FrozenSet[str] = frozenset(literals)
+        self._pattern = re.compile("|".join(fnmatch.translate(p) for p in patterns)) if patterns else None
+    
+    def __contains__(self, namespace: str) -> bool:
+        if namespace in self.literals:
+            return True
+        return self._pattern is not None and self._pattern.fullmatch(namespace) is not None
+    
+    def __bool__(self) -> bool:
+        return bool(self.literals) or self._pattern is not None
+    
+    def __repr__(self) -> str:
+        patterns = self._pattern.pattern if self._pattern is not None else None
+        return f"NamespaceMatcher(literals={sorted(self.literals)}, patterns={patterns!r})"
+
+
+def _freeze_until_timestamp(freeze_until: Optional[datetime]) -> float:
+    """POSIX timestamp of freeze_until (naive values are UTC), or infinity when unset"""
+    if freeze_until is None:
+        return math.inf
+    if freeze_until.tzinfo is None:
+        freeze_until = freeze_until.replace(tzinfo=timezone.utc)
+    return freeze_until.timestamp()
+
+
+def _split_lines(value: str, *, skip_comments: bool = False) -> List[str]:
+    """Split a newline-separated ConfigMap value into stripped, non-empty lines"""
+    lines = (line.strip() for line in value.splitlines())
+    if skip_comments:
+        return [line for line in lines if line and not line.startswith("#")]
+    return [line for line in lines if line]
+
+
+@lru_cache(maxsize=32)
+def _parse_monitored_resources(raw: str) -> Tuple[Any, ...]:
+    """
+    Parse the monitored_resources ConfigMap value
+    
+    Accepts a YAML list, "- item" lines or a comma-separated string and falls
+    back to ("deployments",). Returns a tuple so the cached result can't be
+    mutated by callers.
+    """
+    # Strip whitespace and try to parse as YAML
+    raw = raw.strip()
+    try:
+        parsed = yaml.load(raw, Loader=_YamlLoader)
+    except yaml.YAMLError as e:
+        logger.warning(f"Failed to parse monitored_resources as YAML: {e}, trying to extract from string")
+        # Try to extract list items from YAML-like format
+        parsed = raw
+    
+    if isinstance(parsed, list):
+        logger.debug(f"Parsed monitored_resources as YAML list: {parsed}")
+        return tuple(parsed)
+    if isinstance(parsed, str):
+        # Handle cases like "- deployments\n- statefulsets"
+        resources = _extract_list_items(parsed)
+        if resources:
+            logger.debug(f"Extracted monitored_resources from YAML string: {resources}")
+            return tuple(resources)
+        # Fall back to comma split
+        return tuple(r.strip() for r in parsed.split(",") if r.strip()) or ("deployments",)
+    
+    logger.warning(f"Unexpected type for monitored_resources: {type(parsed)}, using default")
+    return ("deployments",)
+
+
+def _extract_list_items(value: str) -> List[str]:
+    """Extract the items of a YAML-style "- item" list, one item per line"""
+    return [item for item in (line[1:].strip() for line in _split_lines(value) if line.startswith("-")) if item]
+
 
+def _singular_forms(resource: str) -> Tuple[str, ...]:
+    """Candidate singular kinds for a plural resource name"""
+    if resource.endswith("ies"):
+        return (resource[:-3] + "y",)
+    if resource.endswith(("sses", "xes", "ches", "shes")):
+        return (resource[:-2],)
+    if resource.endswith("s"):
+        return (resource[:-1],)
+    return ()
@@ -1,9 +1,15 @@
 """Dry-run evaluation"""
 import logging
-from typing import Dict, Any, Tuple, Optional, List
+from typing import TYPE_CHECKING, Dict, Any, Tuple, Optional, Sequence
+
+if TYPE_CHECKING:
+    from app.admission.context import AdmissionContext
 
 logger = logging.getLogger(__name__)
 
+# Shared result for the common case of a request that would not be blocked
+_EMPTY_WARNINGS: Tuple[()] = ()
+
 
 def is_dry_run(request: Dict[str, Any]) -> bool:
     """
@@ -15,29 +21,23 @@ def is_dry_run(request: Dict[str, Any]) -> bool:
     Returns:
         True if dry-run mode
     """
-    dry_run = request.get("dryRun")
-    if dry_run is None:
-        return False
-    # dryRun can be a boolean or a list/string
-    if isinstance(dry_run, bool):
-        return dry_run
-    if isinstance(dry_run, (list, str)):
-        return len(dry_run) > 0
-    return bool(dry_run)
+    # dryRun is normally a boolean but can be a list/string (non-empty means dry-run);
+    # truthiness covers every case, including a missing value
+    return bool(request.get("dryRun"))
 
 
 def evaluate_dry_run(
-    request: Dict[str, Any],
+    ctx: "AdmissionContext",
     would_be_blocked: bool,
     reason: Optional[str] = None,
     bypass_available: bool = False,
     bypass_type: Optional[str] = None
-) -> Tuple[bool, Dict[str, Any]]:
+) -> Tuple[bool, Sequence[Dict[str, Any]]]:
     """
     Evaluate request in dry-run mode
     
     Args:
-        request: Admission request
+        ctx: AdmissionContext of the request
         would_be_blocked: Whether request would be blocked
         reason: Reason for blocking
         bypass_available: Whether bypass is available
@@ -46,21 +46,19 @@ def evaluate_dry_run(
     Returns:
         Tuple of (allowed, warnings)
     """
-    warnings = []
-    
-    if would_be_blocked:
-        warnings.append({
-            "type": "FreezeActive",
-            "message": f"Would be blocked: {reason or 'Freeze is active'}",
-            "bypass_available": bypass_available,
-            "bypass_type": bypass_type
-        })
-    
     # In dry-run, always allow but include warnings
-    return True, warnings
+    if not would_be_blocked:
+        return True, _EMPTY_WARNINGS
+    
+    return True, [{
+        "type": "FreezeActive",
+        "message": f"Would be blocked: {reason or 'Freeze is active'}",
+        "bypass_available": bypass_available,
+        "bypass_type": bypass_type
+    }]
 
 
-def create_dry_run_response(uid: str, warnings: List[Dict[str, Any]]) -> Dict[str, Any]:
+def create_dry_run_response(uid: str, warnings: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
     """Create dry-run admission response with warnings"""
     return {
         "apiVersion": "admission.k8s.io/v1",
@@ -68,7 +66,7 @@ def create_dry_run_response(uid: str, warnings: List[Dict[str, Any]]) -> Dict[st
         "response": {
             "uid": uid,
             "allowed": True,  # Always allow in dry-run
-            "warnings": [w["message"] for w in warnings] if warnings else []
+            "warnings": [w["message"] for w in warnings] if warnings else _EMPTY_WARNINGS
         }
     }
 
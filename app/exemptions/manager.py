@@ -1,15 +1,26 @@
 """Temporary exemptions manager"""
+import asyncio
 import logging
+import os
+import time
 import uuid
-from typing import Dict, Any, List, Optional
+from operator import attrgetter
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
 from datetime import datetime, timezone, timedelta
-from dataclasses import dataclass, asdict
-import json
+from dataclasses import dataclass, field
+
+import orjson
+from kubernetes import client
+
+from app.utils.background import fire_and_forget
 
 logger = logging.getLogger(__name__)
 
+# ConfigMap the exemptions are persisted in
+EXEMPTIONS_CONFIGMAP_NAME = "kube-freezer-exemptions"
 
-@dataclass
+
+@dataclass(slots=True)
 class Exemption:
     """Temporary exemption"""
     id: str
@@ -21,17 +32,29 @@ class Exemption:
     created_at: datetime
     expires_at: datetime
     used: bool = False
+    # Expiry as a POSIX timestamp, so expiry checks are a float comparison
+    _expires_ts: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._expires_ts = self.expires_at.timestamp()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        data = asdict(self)
-        data["created_at"] = self.created_at.isoformat()
-        data["expires_at"] = self.expires_at.isoformat()
-        return data
+        return {
+            "id": self.id,
+            "namespace": self.namespace,
+            "resource_name": self.resource_name,
+            "duration_minutes": self.duration_minutes,
+            "reason": self.reason,
+            "approved_by": self.approved_by,
+            "created_at": self.created_at.isoformat(),
+            "expires_at": self.expires_at.isoformat(),
+            "used": self.used
+        }
     
     def is_expired(self) -> bool:
         """Check if exemption is expired"""
-        return datetime.now(timezone.utc) >= self.expires_at
+        return time.time() >= self._expires_ts
     
     def is_valid(self) -> bool:
         """Check if exemption is valid (not expired)"""
@@ -39,24 +62,46 @@ class Exemption:
         return not self.is_expired()
 
 
+_expiry_key = attrgetter("_expires_ts")
+
+
 class ExemptionManager:
     """Manages temporary exemptions"""
     
-    def __init__(self, storage_backend: str = "memory"):
+    def __init__(self, storage_backend: str = "memory", save_delay: float = 0.1):
         """
         Initialize exemption manager
         
         Args:
             storage_backend: Storage backend ("memory" or "configmap")
+            save_delay: Seconds to wait after a change before persisting, so
+                changes made in the meantime are saved in one ConfigMap write
         """
         self.storage_backend = storage_backend
+        self.save_delay = save_delay
+        self._dirty = asyncio.Event()  # Set while there are changes not yet persisted
+        self._saves_in_flight = 0
+        self._flush_task: Optional[asyncio.Task] = None
         self._exemptions: Dict[str, Exemption] = {}
+        # Exemption ids indexed for check_exemption: namespace-wide ones by namespace,
+        # resource-specific ones by (namespace, resource_name)
+        self._by_namespace: Dict[str, Set[str]] = {}
+        self._by_resource: Dict[Tuple[str, str], Set[str]] = {}
         self._k8s_client = None
+        self._configmap_cache = None
+        self._loaded_rv: Optional[str] = None  # resourceVersion the in-memory exemptions were loaded from
+        # Newest resourceVersion written or read through the API that the ConfigMap
+        # cache has not reported yet; until it does, its copy may predate memory
+        self._cache_catchup_rv: Optional[str] = None
     
     def set_k8s_client(self, client):
         """Set Kubernetes client for ConfigMap storage"""
         self._k8s_client = client
     
+    def set_configmap_cache(self, configmap_cache):
+        """Set the watch-backed ConfigMap cache used for reads"""
+        self._configmap_cache = configmap_cache
+    
     async def create_exemption(
         self,
         namespace: str,
@@ -94,10 +139,11 @@ class ExemptionManager:
         )
         
         self._exemptions[exemption_id] = exemption
+        self._index(exemption)
         
         # Persist if using ConfigMap backend
         if self.storage_backend == "configmap":
-            await self._save_to_configmap()
+            self._mark_dirty()
         
         logger.info(
             f"Created exemption {exemption_id} for namespace {namespace} "
@@ -133,20 +179,19 @@ class ExemptionManager:
         if self.storage_backend == "configmap":
             await self._load_from_configmap()
         
-        exemptions = list(self._exemptions.values())
+        exemptions: Iterable[Exemption] = self._exemptions.values()
         
         # Filter by namespace
         if namespace:
-            exemptions = [e for e in exemptions if e.namespace == namespace]
+            exemptions = (e for e in exemptions if e.namespace == namespace)
         
         # Filter active only
         if active_only:
-            exemptions = [e for e in exemptions if e.is_valid()]
+            now_ts = time.time()
+            exemptions = (e for e in exemptions if e._expires_ts > now_ts)
         
-        # Sort by expires_at (soonest first)
-        exemptions.sort(key=lambda e: e.expires_at)
-        
-        return exemptions
+        # Sort by expires_at (soonest first), materializing the filtered list once
+        return sorted(exemptions, key=_expiry_key)
     
     async def check_exemption(
         self,
@@ -163,18 +208,25 @@ class ExemptionManager:
         Returns:
             Exemption if found and valid, None otherwise
         """
-        exemptions = await self.list_exemptions(namespace=namespace, active_only=True)
-        
-        for exemption in exemptions:
-            # Check if resource-specific exemption matches
-            if exemption.resource_name:
-                if resource_name and exemption.resource_name == resource_name:
-                    return exemption
-            else:
-                # Namespace-wide exemption
-                return exemption
-        
-        return None
+        # Load from ConfigMap if needed
+        if self.storage_backend == "configmap":
+            await self._load_from_configmap()
+        
+        # Namespace-wide exemptions, plus those for this specific resource
+        candidates: Iterable[str] = self._by_namespace.get(namespace, ())
+        if resource_name:
+            candidates = [*candidates, *self._by_resource.get((namespace, resource_name), ())]
+        
+        # Of the matching active exemptions, return the one expiring soonest
+        match = None
+        for exemption_id in candidates:
+            exemption = self._exemptions.get(exemption_id)
+            if exemption is None or exemption.is_expired():
+                continue
+            if match is None or exemption._expires_ts < match._expires_ts:
+                match = exemption
+        
+        return match
     
     async def use_exemption(self, exemption_id: str) -> bool:
         """
@@ -192,7 +244,7 @@ class ExemptionManager:
             
             # Persist if using ConfigMap backend
             if self.storage_backend == "configmap":
-                await self._save_to_configmap()
+                self._mark_dirty()
             
             logger.info(f"Exemption {exemption_id} marked as used")
             return True
@@ -210,11 +262,11 @@ class ExemptionManager:
             True if exemption was deleted, False otherwise
         """
         if exemption_id in self._exemptions:
-            del self._exemptions[exemption_id]
+            self._unindex(self._exemptions.pop(exemption_id))
             
             # Persist if using ConfigMap backend
             if self.storage_backend == "configmap":
-                await self._save_to_configmap()
+                self._mark_dirty()
             
             logger.info(f"Deleted exemption {exemption_id}")
             return True
@@ -228,91 +280,205 @@ class ExemptionManager:
         Returns:
             Number of exemptions cleaned up
         """
-        expired = [
-            eid for eid, exemption in self._exemptions.items()
-            if exemption.is_expired()
-        ]
-        
-        for eid in expired:
-            del self._exemptions[eid]
+        now_ts = time.time()
+        exemptions = self._exemptions
+        # Rebuild in one pass rather than deleting expired entries one by one
+        self._exemptions = {
+            eid: exemption for eid, exemption in exemptions.items()
+            if exemption._expires_ts > now_ts
+        }
+        expired_count = len(exemptions) - len(self._exemptions)
+        
+        if expired_count:
+            self._rebuild_index()
+            if self.storage_backend == "configmap":
+                self._mark_dirty()
         
-        if expired and self.storage_backend == "configmap":
-            await self._save_to_configmap()
+        return expired_count
+    
+    def start_flusher(self):
+        """Start the background task that persists exemption changes"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+    
+    async def stop_flusher(self):
+        """Stop the background flusher, persisting any pending changes first"""
+        if self._flush_task is None:
+            return
+        self._flush_task.cancel()
+        try:
+            await self._flush_task
+        except asyncio.CancelledError:
+            pass
+        self._flush_task = None
+        if self._dirty.is_set():
+            await self._flush()
+    
+    def _mark_dirty(self):
+        """
+        Request that exemptions be persisted
         
-        return len(expired)
+        Saves are debounced by save_delay, so a burst of changes results in a
+        single ConfigMap write. Without a running flusher the save is
+        scheduled immediately.
+        """
+        self._dirty.set()
+        if self._flush_task is None:
+            fire_and_forget(self._flush(), "exemptions save")
+    
+    async def _flush_loop(self):
+        """Persist exemptions once per save_delay window while changes are pending"""
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self.save_delay)
+            await self._flush()
+    
+    async def _flush(self):
+        """Persist pending changes"""
+        # Clear before saving so changes made during the write trigger another save
+        self._dirty.clear()
+        await self._save_to_configmap()
+    
+    def _index(self, exemption: Exemption):
+        """Add an exemption to the lookup indexes"""
+        if exemption.resource_name:
+            self._by_resource.setdefault((exemption.namespace, exemption.resource_name), set()).add(exemption.id)
+        else:
+            self._by_namespace.setdefault(exemption.namespace, set()).add(exemption.id)
+    
+    def _unindex(self, exemption: Exemption):
+        """Remove an exemption from the lookup indexes"""
+        if exemption.resource_name:
+            index, key = self._by_resource, (exemption.namespace, exemption.resource_name)
+        else:
+            index, key = self._by_namespace, exemption.namespace
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(exemption.id)
+            if not ids:
+                del index[key]
+    
+    def _rebuild_index(self):
+        """Rebuild the lookup indexes from scratch"""
+        self._by_namespace = {}
+        self._by_resource = {}
+        for exemption in self._exemptions.values():
+            self._index(exemption)
     
     async def _save_to_configmap(self):
         """Save exemptions to ConfigMap"""
-        if not self._k8s_client:
-            logger.warning("Kubernetes client not set, cannot save to ConfigMap")
-            return
-        
+        self._saves_in_flight += 1
         try:
-            from app.config.loader import ConfigLoader
-            import os
-            config_loader = ConfigLoader()
-            namespace = os.getenv("NAMESPACE", "kube-freezer")
+            if not self._k8s_client:
+                logger.warning("Kubernetes client not set, cannot save to ConfigMap")
+                return
             
-            v1 = self._k8s_client
-            cm_name = "kube-freezer-exemptions"
-            
-            # Serialize exemptions
-            exemptions_data = {
-                eid: exemption.to_dict()
-                for eid, exemption in self._exemptions.items()
-            }
-            
-            # Try to update existing ConfigMap
             try:
-                cm = v1.read_namespaced_config_map(cm_name, namespace)
-                cm.data["exemptions"] = json.dumps(exemptions_data)
-                v1.patch_namespaced_config_map(cm_name, namespace, cm)
-            except Exception:
-                # Create new ConfigMap
-                from kubernetes import client
-                cm = client.V1ConfigMap(
-                    metadata=client.V1ObjectMeta(name=cm_name),
-                    data={"exemptions": json.dumps(exemptions_data)}
-                )
-                v1.create_namespaced_config_map(namespace, cm)
-        except Exception as e:
-            logger.error(f"Error saving exemptions to ConfigMap: {e}", exc_info=True)
+                namespace = os.getenv("NAMESPACE", "kube-freezer")
+                
+                # Serialize exemptions (on the event loop, so the snapshot is consistent)
+                exemptions_json = orjson.dumps({
+                    eid: exemption.to_dict()
+                    for eid, exemption in self._exemptions.items()
+                }).decode()
+                
+                cm = await asyncio.to_thread(self._write_configmap, namespace, exemptions_json)
+                # Memory matches what was just written, no need to reload it; the
+                # ConfigMap cache is not trusted again until it has seen this write
+                self._loaded_rv = self._cache_catchup_rv = cm.metadata.resource_version
+            except Exception as e:
+                logger.error(f"Error saving exemptions to ConfigMap: {e}", exc_info=True)
+        finally:
+            self._saves_in_flight -= 1
+    
+    def _write_configmap(self, namespace: str, exemptions_json: str) -> client.V1ConfigMap:
+        """Write serialized exemptions to the ConfigMap (blocking, runs in a worker thread)"""
+        v1 = self._k8s_client
+        cm_name = EXEMPTIONS_CONFIGMAP_NAME
+        # Try to update existing ConfigMap
+        try:
+            cm = v1.read_namespaced_config_map(cm_name, namespace)
+            cm.data["exemptions"] = exemptions_json
+            return v1.patch_namespaced_config_map(cm_name, namespace, cm)
+        except Exception:
+            # Create new ConfigMap
+            cm = client.V1ConfigMap(
+                metadata=client.V1ObjectMeta(name=cm_name),
+                data={"exemptions": exemptions_json}
+            )
+            return v1.create_namespaced_config_map(namespace, cm)
     
     async def _load_from_configmap(self):
-        """Load exemptions from ConfigMap"""
+        """
+        Load exemptions from ConfigMap
+        
+        Reads come from the watch-backed ConfigMap cache when one is set, and
+        the stored JSON is only deserialized when the ConfigMap's resourceVersion
+        changes, so lookups normally cost no API round-trip and no parsing.
+        """
         if not self._k8s_client:
             return
         
+        if self._dirty.is_set() or self._saves_in_flight:
+            # Local changes not yet persisted; the ConfigMap is older than memory
+            return
+        
+        # A save completing while the ConfigMap is being read changes this
+        loaded_rv = self._loaded_rv
+        
         try:
-            from app.config.loader import ConfigLoader
-            import os
             namespace = os.getenv("NAMESPACE", "kube-freezer")
+            cm_name = EXEMPTIONS_CONFIGMAP_NAME
             
-            v1 = self._k8s_client
-            cm_name = "kube-freezer-exemptions"
+            cm = None
+            if self._configmap_cache is not None:
+                cm = self._configmap_cache.peek(namespace, cm_name)
+                if self._cache_catchup_rv is not None:
+                    if cm is not None and cm.metadata.resource_version == self._cache_catchup_rv:
+                        self._cache_catchup_rv = None
+                    else:
+                        # The cache hasn't seen the last write yet, read through the API
+                        cm = None
+                elif cm is None and self._configmap_cache.is_synced(cm_name):
+                    # ConfigMap doesn't exist yet, keep what we have
+                    return
+            if cm is None:
+                try:
+                    cm = await asyncio.to_thread(self._k8s_client.read_namespaced_config_map, cm_name, namespace)
+                except Exception:
+                    # ConfigMap doesn't exist yet, keep what we have
+                    return
+                if self._cache_catchup_rv is not None and self._loaded_rv == loaded_rv:
+                    # Another writer may have moved past our write; wait for the newest version
+                    self._cache_catchup_rv = cm.metadata.resource_version
             
-            try:
-                cm = v1.read_namespaced_config_map(cm_name, namespace)
-                exemptions_data = json.loads(cm.data.get("exemptions", "{}"))
-                
-                # Deserialize exemptions
-                self._exemptions = {}
-                for eid, data in exemptions_data.items():
-                    exemption = Exemption(
-                        id=data["id"],
-                        namespace=data["namespace"],
-                        resource_name=data.get("resource_name"),
-                        duration_minutes=data["duration_minutes"],
-                        reason=data["reason"],
-                        approved_by=data["approved_by"],
-                        created_at=datetime.fromisoformat(data["created_at"]),
-                        expires_at=datetime.fromisoformat(data["expires_at"]),
-                        used=data.get("used", False)
-                    )
-                    self._exemptions[eid] = exemption
-            except Exception:
-                # ConfigMap doesn't exist yet, start with empty
-                pass
+            resource_version = cm.metadata.resource_version if cm.metadata else None
+            if resource_version is not None and resource_version == self._loaded_rv:
+                return
+            
+            exemptions_data = orjson.loads((cm.data or {}).get("exemptions", "{}"))
+            
+            # Deserialize exemptions
+            exemptions = {}
+            for eid, data in exemptions_data.items():
+                exemption = Exemption(
+                    id=data["id"],
+                    namespace=data["namespace"],
+                    resource_name=data.get("resource_name"),
+                    duration_minutes=data["duration_minutes"],
+                    reason=data["reason"],
+                    approved_by=data["approved_by"],
+                    created_at=datetime.fromisoformat(data["created_at"]),
+                    expires_at=datetime.fromisoformat(data["expires_at"]),
+                    used=data.get("used", False)
+                )
+                exemptions[eid] = exemption
+            
+            if self._dirty.is_set() or self._saves_in_flight or self._loaded_rv != loaded_rv:
+                # Changed or saved locally while the ConfigMap was being read
+                return
+            self._exemptions = exemptions
+            self._rebuild_index()
+            self._loaded_rv = resource_version
         except Exception as e:
             logger.error(f"Error loading exemptions from ConfigMap: {e}", exc_info=True)
-
@@ -1,29 +1,107 @@
 """Freeze window evaluation"""
 import logging
+import time
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
 
-from app.freeze.schedule import get_active_schedules, parse_schedule
+from app.freeze.schedule import get_active_schedules, get_next_transition, parse_schedules
+from app.utils.clock import now_utc
 
 logger = logging.getLogger(__name__)
 
+# Decisions are reused until the next freeze state change, or for this many seconds
+# when the next change can't be predicted
+DECISION_CACHE_MIN_TTL = 0.5
+DECISION_CACHE_MAX_SIZE = 1024
+# (namespace, config version) -> (valid until (time.time()), (is_active, freeze_window_name))
+_decision_cache: Dict[Tuple[Optional[str], int], Tuple[float, Tuple[bool, Optional[str]]]] = {}
 
-def is_freeze_active(config: Dict[str, Any], namespace: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+
+def is_freeze_active_cached(
+    config: Dict[str, Any],
+    namespace: Optional[str],
+    config_version: int
+) -> Tuple[bool, Optional[str]]:
+    """
+    Cached variant of is_freeze_active for the admission hot path
+    
+    The decision depends only on the config and the current time, so it is
+    reused for the same namespace and config version until the next time a
+    schedule window opens or closes or freeze_until passes (500ms when that
+    time can't be predicted). In steady state this skips schedule evaluation
+    entirely.
+    
+    Args:
+        config: Configuration dictionary
+        namespace: Namespace to check
+        config_version: ConfigLoader.config_version the config belongs to
+    
+    Returns:
+        Tuple of (is_active, freeze_window_name)
+    """
+    key = (namespace, config_version)
+    cached = _decision_cache.get(key)
+    if cached is not None and time.time() < cached[0]:
+        return cached[1]
+    
+    # Evaluate and compute the next state change at the same instant, read from the
+    # precise clock: the cached clock lags by up to CLOCK_RESOLUTION, which would let
+    # a decision outlive the transition it was computed against
+    now_ts = time.time()
+    result = is_freeze_active(config, namespace, datetime.fromtimestamp(now_ts, timezone.utc))
+    valid_until = _get_next_change(config, namespace, now_ts)
+    if valid_until <= now_ts:
+        # Next change unknown, hold the decision briefly rather than re-evaluating every request
+        valid_until = now_ts + DECISION_CACHE_MIN_TTL
+    if len(_decision_cache) >= DECISION_CACHE_MAX_SIZE:
+        _decision_cache.clear()
+    _decision_cache[key] = (valid_until, result)
+    return result
+
+
+def _get_next_change(config: Dict[str, Any], namespace: Optional[str], now_ts: float) -> float:
+    """POSIX timestamp before which is_freeze_active(config, namespace) can't change"""
+    freeze_schedules = config.get("parsed_freeze_schedule")
+    if freeze_schedules is None:
+        return now_ts
+    next_change = get_next_transition(
+        freeze_schedules, now_ts, namespace, config.get("bypass_exempt_namespaces", [])
+    )
+    
+    if config.get("freeze_enabled", False):
+        freeze_until_ts = config.get("freeze_until_ts")
+        if freeze_until_ts is None:
+            return now_ts
+        if freeze_until_ts > now_ts:
+            next_change = min(next_change, freeze_until_ts)
+    return next_change
+
+
+def is_freeze_active(
+    config: Dict[str, Any],
+    namespace: Optional[str] = None,
+    current_time: Optional[datetime] = None
+) -> Tuple[bool, Optional[str]]:
     """
     Check if freeze is currently active
     
     Args:
         config: Configuration dictionary
         namespace: Namespace to check (for namespace-scoped freezes)
+        current_time: Time to evaluate at (defaults to the cached clock)
     
     Returns:
         Tuple of (is_active, freeze_window_name)
     """
-    # Check freeze schedules first (Phase 2)
-    freeze_schedules = config.get("freeze_schedule", [])
+    now = current_time if current_time is not None else now_utc()
+    
+    # Check freeze schedules first (Phase 2), pre-parsed by ConfigLoader
+    freeze_schedules = config.get("parsed_freeze_schedule")
+    if freeze_schedules is None:
+        freeze_schedules = parse_schedules(config.get("freeze_schedule", []))
     if freeze_schedules:
         exempt_namespaces = config.get("bypass_exempt_namespaces", [])
-        active_schedules = get_active_schedules(freeze_schedules, namespace, exempt_namespaces)
+        active_schedules = get_active_schedules(freeze_schedules, namespace, exempt_namespaces, now)
         if active_schedules:
             # Return first active schedule name
             schedule_name = active_schedules[0].get("name", "Active Schedule")
@@ -35,6 +113,13 @@ def is_freeze_active(config: Dict[str, Any], namespace: Optional[str] = None) ->
     if not freeze_enabled:
         return False, None
     
+    # Fast path: timestamp precomputed by ConfigLoader (infinity when freeze_until is unset)
+    freeze_until_ts = config.get("freeze_until_ts")
+    if freeze_until_ts is not None:
+        if now.timestamp() >= freeze_until_ts:
+            return False, None
+        return True, "Manual Freeze"
+    
     # Check freeze_until timestamp
     freeze_until = config.get("freeze_until")
     if freeze_until is None:
@@ -45,7 +130,8 @@ def is_freeze_active(config: Dict[str, Any], namespace: Optional[str] = None) ->
     # Parse freeze_until if it's a string
     if isinstance(freeze_until, str):
         try:
-            freeze_until = datetime.fromisoformat(freeze_until.replace("Z", "+00:00"))
+            iso_str = freeze_until[:-1] + "+00:00" if freeze_until.endswith("Z") else freeze_until
+            freeze_until = datetime.fromisoformat(iso_str)
         except ValueError as e:
             logger.error(f"Invalid freeze_until format: {freeze_until}, error: {e}")
             return False, None
@@ -54,9 +140,6 @@ def is_freeze_active(config: Dict[str, Any], namespace: Optional[str] = None) ->
     if freeze_until.tzinfo is None:
         freeze_until = freeze_until.replace(tzinfo=timezone.utc)
     
-    # Get current time (UTC)
-    now = datetime.now(timezone.utc)
-    
     # Check if freeze period has passed
     if now >= freeze_until:
         logger.debug(f"Freeze period expired. Now: {now}, Until: {freeze_until}")
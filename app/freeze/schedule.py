@@ -1,11 +1,32 @@
 """Freeze schedule parsing and evaluation using cron expressions"""
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timezone, timedelta
+import math
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, Any, List, Optional, Tuple
+from datetime import date, datetime, timezone, timedelta
 from croniter import croniter
 
+from app.utils.clock import now_utc
+
 logger = logging.getLogger(__name__)
 
+# Longest start-end range (in days) for which a schedule's fire table is precomputed
+FIRE_TABLE_MAX_DAYS = 400
+SECONDS_PER_DAY = 86400
+
+# Parsed schedules keyed by the fields parse_schedule reads (None for invalid ones)
+PARSED_SCHEDULE_CACHE_MAX_SIZE = 256
+_parsed_schedule_cache: Dict[Tuple[Any, ...], Optional[Dict[str, Any]]] = {}
+
+# (cron, UTC day, start, end) -> (first cron match that day, end of its freeze window),
+# or None when the cron doesn't match within the schedule that day
+_CronWindowKey = Tuple[str, date, datetime, datetime]
+_cron_window_cache: Dict[_CronWindowKey, Optional[Tuple[datetime, datetime]]] = {}
+# Cached keys in insertion order, so entries for past days can be evicted
+_cron_window_keys: Deque[_CronWindowKey] = deque()
+
 
 def parse_schedule(schedule_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
@@ -48,7 +69,7 @@ def parse_schedule(schedule_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
             end = _parse_datetime(end_str)
             if end is None:
                 logger.warning(f"Schedule {name}: invalid end date format")
-            return None
+                return None
         
         # Validate date range
         if start and end and end <= start:
@@ -68,8 +89,7 @@ def parse_schedule(schedule_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         
         # Validate cron expression
         try:
-            test_time = start
-            iter = croniter(cron, test_time)
+            _compile_cron(cron)
             # If we get here, cron is valid
         except Exception as e:
             logger.warning(f"Schedule {name}: invalid cron expression '{cron}': {e}")
@@ -91,9 +111,12 @@ def parse_schedule(schedule_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         # Add optional fields
         if namespaces:
             result["namespaces"] = namespaces
+            # O(1) membership test for the namespace check done on every evaluation
+            result["namespace_set"] = frozenset(namespaces)
         if schedule_config.get("message"):
             result["message"] = schedule_config.get("message")
         result["original"] = schedule_config
+        result["fire_times"] = _build_fire_times(cron, start, end)
         
         return result
     except Exception as e:
@@ -101,11 +124,68 @@ def parse_schedule(schedule_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         return None
 
 
+def _get_parsed_schedule(schedule_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    parse_schedule with the result cached by the schedule's fields
+    
+    The same schedule configs are evaluated on every freeze check, so each
+    distinct one is only parsed (and its cron expression validated) once.
+    The returned dict is shared and must not be modified.
+    """
+    namespaces = schedule_config.get("namespaces")
+    if isinstance(namespaces, list):
+        namespaces = tuple(namespaces)
+    key = (
+        schedule_config.get("name"),
+        schedule_config.get("start"),
+        schedule_config.get("end"),
+        schedule_config.get("cron"),
+        namespaces,
+        schedule_config.get("message"),
+    )
+    try:
+        return _parsed_schedule_cache[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable field values, parse without caching
+        return parse_schedule(schedule_config)
+    
+    parsed = parse_schedule(schedule_config)
+    if len(_parsed_schedule_cache) >= PARSED_SCHEDULE_CACHE_MAX_SIZE:
+        _parsed_schedule_cache.clear()
+    _parsed_schedule_cache[key] = parsed
+    return parsed
+
+
+def parse_schedules(schedules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Parse a freeze_schedule list, dropping invalid entries
+    
+    Called once per installed config (see ConfigLoader), so freeze checks
+    iterate ready-made schedules with datetime start/end values.
+    
+    Args:
+        schedules: Schedule configs as stored in the schedules ConfigMap
+    
+    Returns:
+        List of parsed schedule dicts (shared, must not be modified)
+    """
+    parsed = []
+    for schedule_config in schedules:
+        schedule = _get_parsed_schedule(schedule_config)
+        if schedule is not None:
+            parsed.append(schedule)
+    return parsed
+
+
+@lru_cache(maxsize=256)
 def _parse_datetime(dt_str: str) -> Optional[datetime]:
-    """Parse datetime string"""
+    """Parse datetime string (cached, only a handful of distinct strings are ever seen)"""
     try:
-        # Try ISO format
-        dt = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
+        # Try ISO format ("Z" only ever appears as the UTC designator at the end)
+        iso_str = dt_str[:-1] + "+00:00" if dt_str.endswith("Z") else dt_str
+        dt = datetime.fromisoformat(iso_str)
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
         return dt
@@ -135,77 +215,59 @@ def is_schedule_active(
     Check if a schedule is currently active using cron logic
     
     Args:
-        schedule: Parsed schedule dict
-        current_time: Current time (defaults to now)
+        schedule: Parsed schedule dict (from parse_schedule, not a raw config)
+        current_time: Current time (defaults to the cached clock)
         namespace: Namespace to check (for namespace-scoped schedules)
         exempt_namespaces: List of exempt namespaces (when schedule has empty namespaces list)
     
     Returns:
         True if schedule is active
+    
+    Raises:
+        ValueError: If the schedule was not parsed with parse_schedule
     """
-    if current_time is None:
-        current_time = datetime.now(timezone.utc)
+    # Check namespace scope first: most namespaces are filtered out without any time checks
+    if not _applies_to_namespace(schedule, namespace, exempt_namespaces):
+        return False
     
-    exempt_namespaces = exempt_namespaces or []
+    if current_time is None:
+        current_time = now_utc()
     
-    # Check namespace scope
-    namespaces = schedule.get("namespaces", [])
-    if namespaces and len(namespaces) > 0:
-        # Schedule has specific namespaces - check if namespace matches
-        if namespace and namespace not in namespaces:
-            return False
-    else:
-        # Schedule has no namespaces specified - applies to ALL namespaces EXCEPT exempt ones
-        if namespace and namespace in exempt_namespaces:
-            # This namespace is exempt, so don't apply the schedule
-            return False
+    # parse_schedule guarantees timezone-aware start/end datetimes and a cron expression
+    start = schedule["start"]
+    end = schedule["end"]
+    if not isinstance(start, datetime) or not isinstance(end, datetime):
+        raise ValueError("Schedule start/end must be datetimes; pass schedules through parse_schedule")
     
     # Use UTC for all time operations
     if current_time.tzinfo is None:
         current_time = current_time.replace(tzinfo=timezone.utc)
-    current_time_utc = current_time
     
     # Check if we're within the date range (start/end dates)
-    start = schedule.get("start")
-    end = schedule.get("end")
-    
-    # Convert string dates to datetime objects if needed
-    if start:
-        if isinstance(start, str):
-            start = _parse_datetime(start)
-            if start is None:
-                logger.warning(f"Schedule {schedule.get('name', 'Unknown')}: invalid start date format")
-                return False
-        # Ensure start is UTC
-        if start.tzinfo is None:
-            start = start.replace(tzinfo=timezone.utc)
-        if current_time_utc < start:
-            return False  # Before start date
-    else:
-        logger.warning(f"Schedule {schedule.get('name', 'Unknown')}: missing start date")
+    if current_time < start or current_time > end:
         return False
     
-    if end:
-        if isinstance(end, str):
-            end = _parse_datetime(end)
-            if end is None:
-                logger.warning(f"Schedule {schedule.get('name', 'Unknown')}: invalid end date format")
-                return False
-        # Ensure end is UTC
-        if end.tzinfo is None:
-            end = end.replace(tzinfo=timezone.utc)
-        if current_time_utc > end:
-            return False  # After end date
-    else:
-        logger.warning(f"Schedule {schedule.get('name', 'Unknown')}: missing end date")
-        return False
-    
-    # Cron is required - check if freeze is active when cron matches
-    cron = schedule.get("cron")
-    if not cron:
-        return False
+    # Check if freeze is active when cron matches
+    fire_times = schedule.get("fire_times")
+    if fire_times is not None:
+        return _check_fire_times(fire_times, current_time.timestamp(), end.timestamp())
+    return _check_cron_active(schedule["cron"], current_time, start, end)
 
-    return _check_cron_active(cron, current_time_utc, start, end)
+
+def _applies_to_namespace(
+    schedule: Dict[str, Any],
+    namespace: Optional[str],
+    exempt_namespaces: Optional[List[str]]
+) -> bool:
+    """Check if a schedule's namespace scope covers a namespace (None matches every schedule)"""
+    if not namespace:
+        return True
+    namespace_set = schedule.get("namespace_set")
+    if namespace_set is not None:
+        # Schedule has specific namespaces - check if namespace matches
+        return namespace in namespace_set
+    # Schedule has no namespaces specified - applies to ALL namespaces EXCEPT exempt ones
+    return not (exempt_namespaces and namespace in exempt_namespaces)
 
 
 def _check_cron_active(
@@ -230,92 +292,197 @@ def _check_cron_active(
       If cron matches at 2024-12-01 00:00:00, freeze is active all day (00:00:00 to 23:59:59)
     """
     try:
-        # Ensure start and end are datetime objects in UTC
-        if isinstance(start, str):
-            start = _parse_datetime(start)
-            if start is None:
-                return False
-        if isinstance(end, str):
-            end = _parse_datetime(end)
-            if end is None:
-                return False
-        
-        # Ensure UTC timezone
-        if start.tzinfo is None:
-            start = start.replace(tzinfo=timezone.utc)
-        if end.tzinfo is None:
-            end = end.replace(tzinfo=timezone.utc)
+        # start and end are timezone-aware datetimes (see parse_schedule)
         if current_time.tzinfo is None:
             current_time = current_time.replace(tzinfo=timezone.utc)
         
-        # Find the most recent cron match before or at current time
-        iter_current = croniter(cron, current_time)
-        cron_match = iter_current.get_prev(datetime)
-        
-        # If no match found or match is before start date, check next match
-        if cron_match < start:
-            iter_start = croniter(cron, start)
-            next_match = iter_start.get_next(datetime)
-            if next_match <= current_time and next_match <= end:
-                cron_match = next_match
-            else:
-                return False
-        
-        # If match is after end date or after current time, not active
-        if cron_match > end or cron_match > current_time:
+        # The freeze window for a day is fixed, so croniter only runs once per day
+        window = _get_cron_day_window(cron, current_time.date(), start, end)
+        if window is None:
             return False
         
-        # Calculate end of day for the cron match day (in UTC)
-        # Set to 23:59:59.999999 of the same day as the cron match
-        match_day_start = cron_match.replace(hour=0, minute=0, second=0, microsecond=0)
-        match_day_end = match_day_start + timedelta(days=1) - timedelta(microseconds=1)
-        
-        # Ensure we don't go beyond the overall end date
-        day_end = min(match_day_end, end)
-        
         # Check if current time is between cron match and end of that day (all in UTC)
-        if cron_match <= current_time <= day_end:
-            return True
-        
-        return False
+        cron_match, day_end = window
+        return cron_match <= current_time <= day_end
     except Exception as e:
         logger.error(f"Error checking cron active: {e}", exc_info=True)
         return False
 
 
+@lru_cache(maxsize=64)
+def _compile_cron(cron: str) -> croniter:
+    """
+    Parse a cron expression once and return a reusable iterator for it
+    
+    The iterator is shared: callers position it with set_current(..., force=True)
+    before each get_next() instead of constructing (and re-parsing) a new one.
+    """
+    return croniter(cron, datetime(1970, 1, 1, tzinfo=timezone.utc))
+
+
+def _build_fire_times(cron: str, start: datetime, end: datetime) -> Optional[Tuple[float, ...]]:
+    """
+    Precompute the start of every freeze window a schedule opens
+    
+    Only the first cron match of each UTC day matters (a window lasts until
+    the end of its day), so the table holds at most one POSIX timestamp per
+    day between start and end, in ascending order.
+    
+    Returns:
+        Sorted tuple of window start timestamps, or None when the date range is
+        longer than FIRE_TABLE_MAX_DAYS (such schedules use _check_cron_active)
+    """
+    if end - start > timedelta(days=FIRE_TABLE_MAX_DAYS):
+        return None
+    
+    start = start.astimezone(timezone.utc)
+    # get_next returns the first match strictly after the base time
+    iter_cron = _compile_cron(cron)
+    iter_cron.set_current(start - timedelta(seconds=1), force=True)
+    fire_times = []
+    while True:
+        cron_match = iter_cron.get_next(datetime)
+        if cron_match > end:
+            break
+        fire_times.append(cron_match.timestamp())
+        # Skip the rest of the match's day
+        next_day = datetime(cron_match.year, cron_match.month, cron_match.day, tzinfo=timezone.utc) + timedelta(days=1)
+        iter_cron.set_current(next_day - timedelta(seconds=1), force=True)
+    return tuple(fire_times)
+
+
+def _check_fire_times(fire_times: Tuple[float, ...], now_ts: float, end_ts: float) -> bool:
+    """
+    Check if a timestamp falls in a freeze window of a precomputed fire table
+    
+    The window opened by the latest match at or before now_ts lasts until the
+    end of that UTC day, capped at the schedule end.
+    """
+    index = bisect_right(fire_times, now_ts) - 1
+    if index < 0:
+        return False
+    return now_ts <= _window_end(fire_times[index], end_ts)
+
+
+def _window_end(cron_match: float, end_ts: float) -> float:
+    """End of the freeze window opened at cron_match: the end of its UTC day, capped at end_ts"""
+    return min(cron_match - cron_match % SECONDS_PER_DAY + SECONDS_PER_DAY - 1e-6, end_ts)
+
+
+def _get_cron_day_window(
+    cron: str,
+    day: date,
+    start: datetime,
+    end: datetime
+) -> Optional[Tuple[datetime, datetime]]:
+    """
+    Get the freeze window a cron expression opens on a UTC day (cached per day)
+    
+    The window runs from the day's first cron match at or after start until the
+    end of that day (capped at end). Any later match on the same day falls
+    inside it, so the "most recent match" is always covered by this window.
+    
+    Returns:
+        Tuple of (cron match, window end), or None if the cron doesn't match
+        between start and end on that day
+    """
+    key = (cron, day, start, end)
+    try:
+        return _cron_window_cache[key]
+    except KeyError:
+        pass
+    
+    day_start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    # get_next returns the first match strictly after the base time
+    base = max(day_start, start.astimezone(timezone.utc)) - timedelta(seconds=1)
+    iter_cron = _compile_cron(cron)
+    iter_cron.set_current(base, force=True)
+    cron_match = iter_cron.get_next(datetime)
+    
+    window = None
+    if cron_match < day_start + timedelta(days=1) and cron_match <= end:
+        # Set to 23:59:59.999999 of the same day as the cron match,
+        # but don't go beyond the overall end date
+        match_day_end = day_start + timedelta(days=1) - timedelta(microseconds=1)
+        window = (cron_match, min(match_day_end, end))
+    
+    # Evict windows of days before yesterday (their keys were inserted first)
+    oldest_day = day - timedelta(days=1)
+    while _cron_window_keys and _cron_window_keys[0][1] < oldest_day:
+        _cron_window_cache.pop(_cron_window_keys.popleft(), None)
+    _cron_window_cache[key] = window
+    _cron_window_keys.append(key)
+    return window
 
 
 def get_active_schedules(
     schedules: List[Dict[str, Any]],
     namespace: Optional[str] = None,
-    exempt_namespaces: Optional[List[str]] = None
+    exempt_namespaces: Optional[List[str]] = None,
+    current_time: Optional[datetime] = None
 ) -> List[Dict[str, Any]]:
     """
     Get all active schedules
     
     Args:
-        schedules: List of schedule configs
+        schedules: List of parsed schedules (see parse_schedules)
         namespace: Namespace to check
         exempt_namespaces: List of exempt namespaces (when schedule has empty namespaces list)
+        current_time: Time to evaluate at (defaults to the cached clock), shared by all schedules
     
     Returns:
         List of active schedule dicts
     """
     active = []
-    current_time = datetime.now(timezone.utc)
+    if current_time is None:
+        current_time = now_utc()
     exempt_namespaces = exempt_namespaces or []
     
-    for schedule_config in schedules:
-        # Parse schedule if needed (check if it has cron field)
-        if "cron" not in schedule_config:
-            parsed = parse_schedule(schedule_config)
-            if parsed is None:
-                continue
-            schedule = parsed
-        else:
-            schedule = schedule_config
-        
+    for schedule in schedules:
         if is_schedule_active(schedule, current_time, namespace, exempt_namespaces):
             active.append(schedule)
     
     return active
+
+
+def get_next_transition(
+    schedules: List[Dict[str, Any]],
+    now_ts: float,
+    namespace: Optional[str] = None,
+    exempt_namespaces: Optional[List[str]] = None
+) -> float:
+    """
+    Get the earliest time at which any of the schedules may turn on or off
+    
+    Until then get_active_schedules returns the same result for the namespace,
+    so callers can cache it. Based on the precomputed fire tables; a schedule
+    without one makes the result now_ts (i.e. not cacheable).
+    
+    Args:
+        schedules: List of parsed schedules (see parse_schedules)
+        now_ts: POSIX timestamp the schedules were evaluated at
+        namespace: Namespace to check
+        exempt_namespaces: List of exempt namespaces (when schedule has empty namespaces list)
+    
+    Returns:
+        POSIX timestamp of the next possible state change (infinity if none)
+    """
+    next_change = math.inf
+    for schedule in schedules:
+        if not _applies_to_namespace(schedule, namespace, exempt_namespaces):
+            continue
+        fire_times = schedule.get("fire_times")
+        if fire_times is None:
+            return now_ts
+        
+        index = bisect_right(fire_times, now_ts) - 1
+        if index >= 0:
+            window_end = _window_end(fire_times[index], schedule["end"].timestamp())
+            if now_ts <= window_end:
+                # Active until its window closes
+                next_change = min(next_change, window_end)
+                continue
+        if index + 1 < len(fire_times):
+            # Inactive until the next window opens
+            next_change = min(next_change, fire_times[index + 1])
+    return next_change
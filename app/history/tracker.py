@@ -1,12 +1,28 @@
 """Freeze history tracker"""
+import asyncio
+import heapq
 import logging
-from typing import Dict, Any, List, Optional
+import os
+import secrets
+import uuid
+from collections import deque
+from itertools import count, islice, pairwise
+from operator import attrgetter
+from typing import Deque, Dict, Any, List, Optional
 from datetime import datetime, timezone
-from dataclasses import dataclass, asdict
-import json
+from dataclasses import dataclass, field
+import orjson
+from kubernetes import client
+
+from app.utils.background import fire_and_forget
+from app.utils.clock import now_utc
 
 logger = logging.getLogger(__name__)
 
+_timestamp_key = attrgetter("timestamp")
+
+_UUID_MASK = (1 << 128) - 1
+
 
 @dataclass
 class FreezeEvent:
@@ -19,35 +35,73 @@ class FreezeEvent:
     namespace: Optional[str] = None
     duration_minutes: Optional[int] = None
     triggered_by: Optional[str] = None
+    # ISO-8601 form of timestamp, formatted once (loaded events keep the stored string)
+    _timestamp_iso: Optional[str] = field(default=None, repr=False, compare=False)
+    # JSON encoding of to_dict(), built on the first save and reused by every later one
+    _json: Optional[str] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def timestamp_iso(self) -> str:
+        """Timestamp in ISO-8601 format (cached)"""
+        if self._timestamp_iso is None:
+            self._timestamp_iso = self.timestamp.isoformat()
+        return self._timestamp_iso
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        data = asdict(self)
-        data["timestamp"] = self.timestamp.isoformat()
-        return data
+        return {
+            "id": self.id,
+            "event_type": self.event_type,
+            "timestamp": self.timestamp_iso,
+            "reason": self.reason,
+            "freeze_window": self.freeze_window,
+            "namespace": self.namespace,
+            "duration_minutes": self.duration_minutes,
+            "triggered_by": self.triggered_by
+        }
+    
+    def to_json(self) -> str:
+        """Convert to a JSON object string (cached, events never change once recorded)"""
+        if self._json is None:
+            # Encoded from to_dict() so loaded timestamps are written back exactly as stored
+            self._json = orjson.dumps(self.to_dict()).decode()
+        return self._json
 
 
 class HistoryTracker:
     """Tracks freeze history"""
     
-    def __init__(self, max_events: int = 1000, storage_backend: str = "configmap"):
+    def __init__(self, max_events: int = 1000, storage_backend: str = "configmap", save_delay: float = 0.5):
         """
         Initialize history tracker
         
         Args:
             max_events: Maximum number of events to keep in memory
             storage_backend: Storage backend ("memory" or "configmap")
+            save_delay: Seconds to wait after mark_dirty() before persisting, so
+                events recorded in the meantime are saved in one ConfigMap write
         """
         self.max_events = max_events
         self.storage_backend = storage_backend
-        self._events: List[FreezeEvent] = []
+        self.save_delay = save_delay
+        # Oldest events are dropped automatically once max_events is reached
+        self._events: Deque[FreezeEvent] = deque(maxlen=max_events)
+        # Whether _events is in timestamp order (true unless loaded or clock-skewed out of order)
+        self._in_order = True
         self._k8s_client = None
         self._namespace = None
+        self._dirty = asyncio.Event()  # Set while there are events not yet persisted
+        self._saves_in_flight = 0  # ConfigMap writes running in worker threads
+        self._flush_task: Optional[asyncio.Task] = None
+        # Event ids are UUID4-shaped, counting up from a random per-process value: unique
+        # across pods and restarts sharing the history ConfigMap, without drawing fresh
+        # randomness for every event
+        self._id_base = secrets.randbits(128)
+        self._id_sequence = count(1)
     
-    def set_k8s_client(self, client):
+    def set_k8s_client(self, k8s_client):
         """Set Kubernetes client for persistent storage"""
-        self._k8s_client = client
-        import os
+        self._k8s_client = k8s_client
         self._namespace = os.getenv("NAMESPACE", "kube-freezer")
     
     def record_event(
@@ -70,11 +124,10 @@ class HistoryTracker:
             duration_minutes: Duration in minutes
             triggered_by: Who/what triggered the event
         """
-        import uuid
         event = FreezeEvent(
-            id=str(uuid.uuid4()),
+            id=str(uuid.UUID(int=(self._id_base + next(self._id_sequence)) & _UUID_MASK, version=4)),
             event_type=event_type,
-            timestamp=datetime.now(timezone.utc),
+            timestamp=now_utc(),
             reason=reason,
             freeze_window=freeze_window,
             namespace=namespace,
@@ -82,14 +135,70 @@ class HistoryTracker:
             triggered_by=triggered_by
         )
         
+        if self._events and event.timestamp < self._events[-1].timestamp:
+            self._in_order = False
         self._events.append(event)
         
-        # Keep only last max_events
-        if len(self._events) > self.max_events:
-            self._events = self._events[-self.max_events:]
-        
         logger.info(f"Recorded freeze event: {event_type} - {reason} (total events: {len(self._events)})")
     
+    def start_flusher(self):
+        """Start the background task that persists history after mark_dirty()"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+    
+    async def stop_flusher(self):
+        """Stop the background flusher, persisting any pending events first"""
+        if self._flush_task is None:
+            return
+        self._flush_task.cancel()
+        try:
+            await self._flush_task
+        except asyncio.CancelledError:
+            pass
+        self._flush_task = None
+        if self._dirty.is_set():
+            self._dirty.clear()
+            try:
+                await self.save_to_configmap()
+            except Exception as e:
+                logger.warning(f"Failed to save pending history on shutdown: {e}")
+    
+    def mark_dirty(self):
+        """
+        Request that history be persisted (called after record_event)
+        
+        Saves are debounced by save_delay, so a burst of events results in a
+        single ConfigMap write. Without a running flusher the save is
+        scheduled immediately.
+        """
+        if self._flush_task is None:
+            # Counted as in flight until the task finishes, so a refresh from the
+            # ConfigMap in the meantime doesn't drop the events not yet saved
+            self._saves_in_flight += 1
+            task = fire_and_forget(self.save_to_configmap(), "history save")
+            if task is None:
+                self._saves_in_flight -= 1
+            else:
+                task.add_done_callback(self._on_save_done)
+            return
+        self._dirty.set()
+    
+    def _on_save_done(self, task: asyncio.Task):
+        """Release the in-flight count taken by mark_dirty() without a flusher"""
+        self._saves_in_flight -= 1
+    
+    async def _flush_loop(self):
+        """Persist history once per save_delay window while events are pending"""
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self.save_delay)
+            # Clear before saving so events recorded during the write trigger another save
+            self._dirty.clear()
+            try:
+                await self.save_to_configmap()
+            except Exception as e:
+                logger.warning(f"Failed to save history events: {e}")
+    
     async def save_to_configmap(self):
         """Public method to save history to ConfigMap (called after record_event)"""
         if self.storage_backend != "configmap":
@@ -114,52 +223,59 @@ class HistoryTracker:
             return
         
         try:
-            v1 = self._k8s_client
             cm_name = "kube-freezer-history"
             logger.debug(f"Attempting to save history to ConfigMap '{cm_name}' in namespace '{self._namespace}'")
             
-            # Serialize events
-            events_data = [event.to_dict() for event in self._events]
-            events_json = json.dumps(events_data)
-            logger.debug(f"Serialized {len(events_data)} events ({len(events_json)} bytes)")
+            # Serialize events (each event is only encoded once, on its first save)
+            event_count = len(self._events)
+            events_json = "[" + ",".join([event.to_json() for event in self._events]) + "]"
+            logger.debug(f"Serialized {event_count} events ({len(events_json)} bytes)")
             
-            # Try to update existing ConfigMap
+            self._saves_in_flight += 1
             try:
-                cm = v1.read_namespaced_config_map(cm_name, self._namespace)
-                logger.info(f"Found existing history ConfigMap '{cm_name}', updating...")
-                cm.data["events"] = events_json
-                v1.patch_namespaced_config_map(cm_name, self._namespace, cm)
-                logger.info(f"Successfully updated history ConfigMap '{cm_name}' with {len(events_data)} events")
-            except Exception as read_error:
-                # Create new ConfigMap if it doesn't exist (same pattern as schedules ConfigMap)
-                from kubernetes import client
-                logger.info(f"ConfigMap '{cm_name}' not found, creating new one. Error: {read_error}")
-                cm = client.V1ConfigMap(
-                    metadata=client.V1ObjectMeta(
-                        name=cm_name,
-                        namespace=self._namespace,
-                        labels={
-                            "app.kubernetes.io/name": "kube-freezer",
-                            "app.kubernetes.io/component": "history",
-                            "app.kubernetes.io/managed-by": "kubefreezer"  # NOT Helm
-                        }
-                    ),
-                    data={"events": events_json}
-                )
-                try:
-                    v1.create_namespaced_config_map(namespace=self._namespace, body=cm)
-                    logger.info(f"Successfully created history ConfigMap '{cm_name}' with {len(events_data)} events in namespace '{self._namespace}'")
-                except Exception as create_error:
-                    logger.error(f"Failed to create history ConfigMap '{cm_name}' in namespace '{self._namespace}': {create_error}", exc_info=True)
-                    raise
+                await asyncio.to_thread(self._write_configmap, cm_name, events_json, event_count)
+            finally:
+                self._saves_in_flight -= 1
         except Exception as e:
             logger.error(f"Error saving history to ConfigMap: {e}", exc_info=True)
             raise
     
+    def _write_configmap(self, cm_name: str, events_json: str, event_count: int):
+        """Write serialized events to the history ConfigMap (blocking, runs in a worker thread)"""
+        v1 = self._k8s_client
+        # Try to update existing ConfigMap (merge patch of the events key only, no read needed)
+        try:
+            v1.patch_namespaced_config_map(cm_name, self._namespace, {"data": {"events": events_json}})
+            logger.info(f"Successfully updated history ConfigMap '{cm_name}' with {event_count} events")
+        except Exception as patch_error:
+            # Create new ConfigMap if it doesn't exist (same pattern as schedules ConfigMap)
+            logger.info(f"ConfigMap '{cm_name}' not found, creating new one. Error: {patch_error}")
+            cm = client.V1ConfigMap(
+                metadata=client.V1ObjectMeta(
+                    name=cm_name,
+                    namespace=self._namespace,
+                    labels={
+                        "app.kubernetes.io/name": "kube-freezer",
+                        "app.kubernetes.io/component": "history",
+                        "app.kubernetes.io/managed-by": "kubefreezer"  # NOT Helm
+                    }
+                ),
+                data={"events": events_json}
+            )
+            try:
+                v1.create_namespaced_config_map(namespace=self._namespace, body=cm)
+                logger.info(f"Successfully created history ConfigMap '{cm_name}' with {event_count} events in namespace '{self._namespace}'")
+            except Exception as create_error:
+                logger.error(f"Failed to create history ConfigMap '{cm_name}' in namespace '{self._namespace}': {create_error}", exc_info=True)
+                raise
+    
     def _sync_load_from_configmap(self):
         """Load history from ConfigMap (synchronous version for use in get_history)"""
         if not self._k8s_client or self.storage_backend != "configmap":
             return
+        if self._dirty.is_set() or self._saves_in_flight:
+            # In-memory events not yet persisted are newer than the ConfigMap
+            return
         
         try:
             v1 = self._k8s_client
@@ -168,17 +284,25 @@ class HistoryTracker:
             try:
                 cm = v1.read_namespaced_config_map(cm_name, self._namespace)
                 events_json = cm.data.get("events", "[]")
-                events_data = json.loads(events_json)
+                events_data = orjson.loads(events_json)
                 
-                # Deserialize events
-                self._events = []
-                for event_dict in events_data:
-                    # Parse timestamp
+                # Deserialize events, reusing the ones already in memory (events never
+                # change once recorded) so only new events have their timestamps parsed
+                known_events = {event.id: event for event in self._events if event.id}
+                self._events = deque(maxlen=self.max_events)
+                for event_dict in events_data[-self.max_events:]:
+                    event = known_events.get(event_dict.get("id"))
+                    if event is not None:
+                        self._events.append(event)
+                        continue
+                    
+                    # Parse timestamp (and keep the stored string for re-serialization)
                     timestamp_str = event_dict.get("timestamp")
                     if timestamp_str:
                         timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
                     else:
                         timestamp = datetime.now(timezone.utc)
+                        timestamp_str = None
                     
                     event = FreezeEvent(
                         id=event_dict.get("id", ""),
@@ -188,14 +312,12 @@ class HistoryTracker:
                         freeze_window=event_dict.get("freeze_window"),
                         namespace=event_dict.get("namespace"),
                         duration_minutes=event_dict.get("duration_minutes"),
-                        triggered_by=event_dict.get("triggered_by")
+                        triggered_by=event_dict.get("triggered_by"),
+                        _timestamp_iso=timestamp_str
                     )
                     self._events.append(event)
                 
-                # Keep only last max_events
-                if len(self._events) > self.max_events:
-                    self._events = self._events[-self.max_events:]
-                
+                self._in_order = all(a.timestamp <= b.timestamp for a, b in pairwise(self._events))
                 logger.debug(f"Refreshed {len(self._events)} history events from ConfigMap")
             except Exception as e:
                 logger.debug(f"ConfigMap {cm_name} not found or empty, using in-memory cache: {e}")
@@ -231,21 +353,25 @@ class HistoryTracker:
             except Exception as e:
                 logger.debug(f"Could not refresh history from ConfigMap, using in-memory cache: {e}")
         
-        events = self._events.copy()
+        # Events are normally recorded in time order: then walk back from the newest
+        # and stop once `limit` events matched, instead of sorting all of them
+        in_order = self._in_order and limit > 0
+        events = reversed(self._events) if in_order else self._events
         
         # Filter by event type
         if event_type:
-            events = [e for e in events if e.event_type == event_type]
+            events = (e for e in events if e.event_type == event_type)
         
         # Filter by namespace
         if namespace:
-            events = [e for e in events if e.namespace == namespace or e.namespace is None]
-        
-        # Sort by timestamp (most recent first)
-        events.sort(key=lambda e: e.timestamp, reverse=True)
+            events = (e for e in events if e.namespace == namespace or e.namespace is None)
         
-        # Limit results
-        return events[:limit]
+        if in_order:
+            return list(islice(events, limit))
+        if limit <= 0:
+            return sorted(events, key=_timestamp_key, reverse=True)[:limit]
+        # Most recent first, without sorting every event to keep the first `limit`
+        return heapq.nlargest(limit, events, key=_timestamp_key)
     
     def get_events_dict(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get events as dictionary list"""
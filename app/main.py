@@ -6,29 +6,35 @@ import sys
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
+import orjson
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
-from app.admission.webhook import handle_admission_review
+from app.admission.webhook import handle_admission_review, ADMISSION_API_VERSION, ADMISSION_KIND
 from app.api.routes import (
     router as api_router,
     set_config_loader,
+    set_configmap_cache,
     set_exemption_manager,
     set_history_tracker,
     set_notification_manager,
     set_audit_logger,
-    set_template_engine
+    set_template_engine,
+    TEMPLATES_CONFIGMAP_NAME
 )
+from app.api.ratelimit import RateLimitMiddleware
+from app.cache.configmap_cache import ConfigMapCache
 from app.config.loader import ConfigLoader
-from app.exemptions.manager import ExemptionManager
+from app.exemptions.manager import ExemptionManager, EXEMPTIONS_CONFIGMAP_NAME
 from app.history.tracker import HistoryTracker
 from app.notifications.manager import NotificationManager
 from app.audit.logger import AuditLogger, FileAuditSink
 from app.templates.engine import TemplateEngine
 from app.utils.logging import setup_logging
 from app.utils.kubernetes import get_k8s_client
+from app.utils.clock import start_clock, stop_clock
 from app.metrics.collector import get_metrics, get_metrics_content_type
 import os
 
@@ -45,6 +51,7 @@ history_tracker: HistoryTracker = None
 notification_manager: NotificationManager = None
 audit_logger: AuditLogger = None
 template_engine: TemplateEngine = None
+configmap_cache: ConfigMapCache = None
 
 
 @asynccontextmanager
@@ -55,9 +62,12 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting KubeFreezer...")
     global config_loader, exemption_manager, history_tracker
-    global notification_manager, audit_logger, template_engine
+    global notification_manager, audit_logger, template_engine, configmap_cache
     
     try:
+        # Cached wall clock for freeze evaluation and event timestamps
+        start_clock()
+        
         # Initialize config loader with retry logic
         config_loader = ConfigLoader()
         try:
@@ -76,9 +86,24 @@ async def lifespan(app: FastAPI):
             logger.warning(f"Could not get Kubernetes client: {e}. Some features may not work.")
             # Continue anyway - some features won't work but app can still serve webhook
         
+        # Start watch-backed ConfigMap cache (API handlers read ConfigMaps from memory).
+        # Only the ConfigMaps read on request paths are watched, each by name, matching
+        # the resourceNames-scoped RBAC rules.
+        if k8s_client:
+            configmap_cache = ConfigMapCache(
+                config_loader.namespace,
+                k8s_client,
+                names=(TEMPLATES_CONFIGMAP_NAME, EXEMPTIONS_CONFIGMAP_NAME)
+            )
+            configmap_cache.start()
+            set_configmap_cache(configmap_cache)
+        
         # Initialize exemption manager
         exemption_manager = ExemptionManager(storage_backend="configmap")
         exemption_manager.set_k8s_client(k8s_client)
+        if configmap_cache:
+            exemption_manager.set_configmap_cache(configmap_cache)
+        exemption_manager.start_flusher()
         set_exemption_manager(exemption_manager)
         
         # Initialize history tracker
@@ -103,12 +128,13 @@ async def lifespan(app: FastAPI):
                     except Exception:
                         pass  # Will be created on first event
         set_history_tracker(history_tracker)
+        # Persist history events in the background, coalescing bursts into one write
+        history_tracker.start_flusher()
         
         # Initialize notification manager (Phase 4)
         try:
             if k8s_client:
-                from kubernetes import client
-                v1 = client.CoreV1Api()
+                v1 = k8s_client
                 namespace = os.getenv("NAMESPACE", "kube-freezer")
                 try:
                     notif_cm = v1.read_namespaced_config_map("kube-freezer-notifications", namespace)
@@ -140,8 +166,7 @@ async def lifespan(app: FastAPI):
         # Load custom templates from config if available
         try:
             if k8s_client:
-                from kubernetes import client
-                v1 = client.CoreV1Api()
+                v1 = k8s_client
                 namespace = os.getenv("NAMESPACE", "kube-freezer")
                 try:
                     template_cm = v1.read_namespaced_config_map("kube-freezer-templates", namespace)
@@ -173,8 +198,17 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down KubeFreezer...")
+    if configmap_cache:
+        configmap_cache.stop()
+    if exemption_manager:
+        await exemption_manager.stop_flusher()
+    if history_tracker:
+        await history_tracker.stop_flusher()
+    if audit_logger:
+        await audit_logger.close()
     if config_loader:
         await config_loader.stop()
+    await stop_clock()
 
 
 async def _cleanup_exemptions_loop(exemption_manager: ExemptionManager):
@@ -197,9 +231,14 @@ app = FastAPI(
     title="KubeFreezer",
     description="Kubernetes admission controller for deployment freeze management",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Rate limit mutating API requests before routing, body parsing and auth
+# (added before CORS so that 429 responses still carry CORS headers)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS configuration for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -245,22 +284,23 @@ async def metrics():
     )
 
 
-@app.post("/admission")
+@app.post("/admission", response_class=ORJSONResponse)
 async def admission(request: Request):
     """Admission webhook endpoint"""
     try:
-        body = await request.json()
+        body = orjson.loads(await request.body())
         logger.debug(f"Received admission request: {body.get('kind')}")
         
         response = await handle_admission_review(body, config_loader)
-        return response
+        # Serialize with orjson directly instead of FastAPI's jsonable_encoder + stdlib json
+        return ORJSONResponse(content=response)
     except Exception as e:
         logger.error(f"Error processing admission request: {e}", exc_info=True)
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
-                "apiVersion": "admission.k8s.io/v1",
-                "kind": "AdmissionReview",
+                "apiVersion": ADMISSION_API_VERSION,
+                "kind": ADMISSION_KIND,
                 "response": {
                     "uid": body.get("request", {}).get("uid", ""),
                     "allowed": False,
@@ -278,6 +318,8 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8443,
+        loop="uvloop",
+        http="httptools",
         log_config=None,  # Use our custom logging
         ssl_keyfile="/etc/certs/tls.key",
         ssl_certfile="/etc/certs/tls.crt"
@@ -1,6 +1,6 @@
 """Prometheus metrics collector"""
 from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -49,6 +49,12 @@ config_reload_timestamp = Gauge(
     'Timestamp of last successful config reload'
 )
 
+# Audit metrics
+audit_events_dropped_total = Counter(
+    'kubefreezer_audit_events_dropped_total',
+    'Total number of audit events dropped because the audit queue was full'
+)
+
 # API request metrics
 api_requests_total = Counter(
     'kubefreezer_api_requests_total',
@@ -99,14 +105,31 @@ def record_config_reload_success():
     config_reload_timestamp.set(datetime.now(timezone.utc).timestamp())
 
 
+def record_audit_event_dropped():
+    """Record an audit event dropped due to a full audit queue"""
+    audit_events_dropped_total.inc()
+
+
+# Labeled children per (endpoint, method, status_code). Call sites pass literal
+# labels, so this stays small and saves labels() validation and locking per request.
+_api_request_children: Dict[Tuple[str, str, int], Tuple[Counter, Histogram]] = {}
+
+
 def record_api_request(endpoint: str, method: str, status_code: int, duration: float):
     """Record API request metrics"""
-    api_requests_total.labels(
-        endpoint=endpoint,
-        method=method,
-        status_code=str(status_code)
-    ).inc()
-    api_request_duration_seconds.labels(endpoint=endpoint, method=method).observe(duration)
+    key = (endpoint, method, status_code)
+    children = _api_request_children.get(key)
+    if children is None:
+        children = _api_request_children[key] = (
+            api_requests_total.labels(
+                endpoint=endpoint,
+                method=method,
+                status_code=str(status_code)
+            ),
+            api_request_duration_seconds.labels(endpoint=endpoint, method=method)
+        )
+    children[0].inc()
+    children[1].observe(duration)
 
 
 def get_metrics():
@@ -1,7 +1,7 @@
 """Notification manager"""
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, FrozenSet, List, Optional
 from datetime import datetime, timezone
 import httpx
 import yaml
@@ -313,6 +313,7 @@ class NotificationManager:
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.enabled = config.get("enabled", False) if config else False
         self.providers: List[NotificationProvider] = []
+        self._subscribed_events: FrozenSet[str] = frozenset()
         self._rate_limit_cache: Dict[str, datetime] = {}
         self._rate_limit_window = 60  # seconds
         
@@ -337,6 +338,14 @@ class NotificationManager:
                 self.providers.append(SlackProvider(provider_config))
             else:
                 logger.warning(f"Unsupported notification provider type: {provider_type}. Only 'slack' is supported.")
+        
+        self._subscribed_events = frozenset(
+            event for provider in self.providers if provider.enabled for event in provider.events
+        )
+    
+    def has_subscribers_for(self, event_type: str) -> bool:
+        """Check if any enabled provider would send a notification for event_type"""
+        return self.enabled and event_type in self._subscribed_events
     
     async def send_notification(self, event_type: str, data: Dict[str, Any]):
         """Send notification to all configured providers"""
@@ -371,6 +380,7 @@ class NotificationManager:
         """Reload notification configuration"""
         self.enabled = config.get("enabled", False)
         self.providers = []
+        self._subscribed_events = frozenset()
         if self.enabled:
             self._load_providers(config)
 
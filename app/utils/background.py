@@ -0,0 +1,58 @@
+"""Fire-and-forget background tasks for non-critical side effects"""
+import asyncio
+import logging
+from typing import Any, Coroutine, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of side-effect tasks allowed in flight at once
+MAX_BACKGROUND_TASKS = 256
+
+# Pending tasks in creation order (dict keeps insertion order and holds strong references,
+# so tasks are not garbage collected before they finish)
+_background_tasks: Dict[asyncio.Task, None] = {}
+
+
+async def _run(coro: Coroutine[Any, Any, Any], description: str) -> None:
+    """Await a side-effect coroutine, logging instead of raising on failure"""
+    try:
+        await coro
+    except asyncio.CancelledError:
+        logger.debug(f"Background task cancelled: {description}")
+        raise
+    except Exception as e:
+        logger.warning(f"Background task failed ({description}): {e}", exc_info=True)
+
+
+def fire_and_forget(coro: Coroutine[Any, Any, Any], description: str = "background task") -> Optional[asyncio.Task]:
+    """
+    Schedule a coroutine without waiting for it
+    
+    Used for audit logging, notifications and history persistence so that
+    the caller can respond as soon as its decision is made. When the number
+    of pending tasks reaches MAX_BACKGROUND_TASKS the oldest one is cancelled.
+    
+    Args:
+        coro: Coroutine to run
+        description: Short description used in log messages
+    
+    Returns:
+        The created task, or None if there is no running event loop
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning(f"No running event loop, dropping background task: {description}")
+        coro.close()
+        return None
+    
+    if len(_background_tasks) >= MAX_BACKGROUND_TASKS:
+        oldest = next(iter(_background_tasks))
+        _background_tasks.pop(oldest, None)
+        oldest.cancel()
+        logger.warning("Too many pending background tasks, cancelled the oldest one")
+    
+    task = loop.create_task(_run(coro, description))
+    _background_tasks[task] = None
+    task.add_done_callback(lambda t: _background_tasks.pop(t, None))
+    return task
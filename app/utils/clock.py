@@ -0,0 +1,60 @@
+"""Coarse cached wall clock for hot paths"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds between clock updates (freeze windows only need second-level accuracy)
+CLOCK_RESOLUTION = 0.25
+
+# Current UTC time as of the last tick (None while the ticker isn't running)
+_cached_now: Optional[datetime] = None
+_ticker_task: Optional[asyncio.Task] = None
+
+
+def now_utc() -> datetime:
+    """
+    Get the current UTC time, at most CLOCK_RESOLUTION seconds stale
+
+    Returns the value cached by the background ticker, or reads the clock
+    when the ticker isn't running.
+    """
+    cached = _cached_now
+    if cached is not None:
+        return cached
+    return datetime.now(timezone.utc)
+
+
+async def _tick():
+    """Refresh the cached time every CLOCK_RESOLUTION seconds"""
+    global _cached_now
+    try:
+        while True:
+            _cached_now = datetime.now(timezone.utc)
+            await asyncio.sleep(CLOCK_RESOLUTION)
+    finally:
+        _cached_now = None
+
+
+def start_clock():
+    """Start the background ticker (requires a running event loop)"""
+    global _ticker_task, _cached_now
+    if _ticker_task is None:
+        _cached_now = datetime.now(timezone.utc)
+        _ticker_task = asyncio.create_task(_tick())
+        logger.debug(f"Started cached clock ({CLOCK_RESOLUTION}s resolution)")
+
+
+async def stop_clock():
+    """Stop the background ticker; now_utc() reads the clock directly again"""
+    global _ticker_task
+    if _ticker_task is None:
+        return
+    _ticker_task.cancel()
+    try:
+        await _ticker_task
+    except asyncio.CancelledError:
+        pass
+    _ticker_task = None
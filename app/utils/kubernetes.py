@@ -7,9 +7,14 @@ logger = logging.getLogger(__name__)
 
 _k8s_client = None
 
+# urllib3 pool size of the shared ApiClient. API calls are offloaded to the
+# default thread pool (at most 32 workers), so size the pool to match and let
+# concurrent calls reuse their TCP/TLS connections instead of discarding them.
+K8S_CONNECTION_POOL_MAXSIZE = 32
+
 
 def get_k8s_client():
-    """Get or create Kubernetes client"""
+    """Get or create the shared Kubernetes client (one ApiClient and connection pool per process)"""
     global _k8s_client
     if _k8s_client is None:
         try:
@@ -23,7 +28,12 @@ def get_k8s_client():
                 logger.error(f"Failed to load Kubernetes config: {e}")
                 raise
         
-        _k8s_client = client.CoreV1Api()
+        configuration = client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = max(
+            configuration.connection_pool_maxsize or 0,
+            K8S_CONNECTION_POOL_MAXSIZE
+        )
+        _k8s_client = client.CoreV1Api(client.ApiClient(configuration))
     
     return _k8s_client
 
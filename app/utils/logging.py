@@ -1,9 +1,18 @@
 """Structured JSON logging configuration"""
+import atexit
+import copy
 import logging
+import logging.handlers
+import queue
 import sys
 import json
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+# Maximum number of records buffered between the emitting code and the writer thread
+LOG_QUEUE_MAXSIZE = 10000
+
+_queue_listener: Optional[logging.handlers.QueueListener] = None
 
 
 class JSONFormatter(logging.Formatter):
@@ -34,15 +43,51 @@ class JSONFormatter(logging.Formatter):
             log_data["decision"] = record.decision
         if hasattr(record, "reason"):
             log_data["reason"] = record.reason
+        if hasattr(record, "freeze_window"):
+            log_data["freeze_window"] = record.freeze_window
         
         return json.dumps(log_data)
 
 
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that never blocks the caller and keeps exc_info for the writer thread"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args into the message here so the writer thread does not depend on
+        # mutable arguments, but leave exc_info intact for the real formatter
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass  # Drop the record rather than stall the request path
+
+
+def _stop_queue_listener() -> None:
+    """Flush and stop the background log writer"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
 def setup_logging(level: str = "INFO", json_format: bool = True) -> None:
-    """Setup application logging"""
+    """Setup application logging
+    
+    Records are pushed onto a bounded queue and written to stdout by a
+    QueueListener thread, so emitting a log line never blocks on I/O.
+    """
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, level.upper()))
     
+    # Stop a previous listener before replacing handlers
+    _stop_queue_listener()
+    
     # Remove existing handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
@@ -61,4 +106,15 @@ def setup_logging(level: str = "INFO", json_format: bool = True) -> None:
         )
     
     handler.setFormatter(formatter)
-    root_logger.addHandler(handler)
+    
+    # Route records through a queue so the stream write happens off the caller's thread
+    global _queue_listener
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=LOG_QUEUE_MAXSIZE)
+    root_logger.addHandler(_NonBlockingQueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, handler, respect_handler_level=True
+    )
+    _queue_listener.start()
+
+
+atexit.register(_stop_queue_listener)
@@ -1,25 +1,33 @@
 """Utility functions for managing schedules in a separate ConfigMap"""
+import copy
 import logging
+import os
 import yaml
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from kubernetes import client
 
+from app.utils.kubernetes import get_k8s_client
+
 logger = logging.getLogger(__name__)
 
 # ConfigMap name for schedules (NOT managed by Helm)
 SCHEDULES_CONFIGMAP_NAME = "kube-freezer-schedules"
 SCHEDULES_KEY = "schedules"
 
+# Attempts at an optimistic (resourceVersion-checked) update before giving up
+SAVE_MAX_ATTEMPTS = 5
+
+# ((namespace, ConfigMap name, resourceVersion), parsed schedules) of the last load
+_parsed_schedules: Optional[Tuple[Tuple[str, str, str], List[Dict[str, Any]]]] = None
+
 
 def get_schedules_configmap_name() -> str:
     """Get the name of the schedules ConfigMap"""
-    import os
     return os.getenv("SCHEDULES_CONFIGMAP_NAME", SCHEDULES_CONFIGMAP_NAME)
 
 
 def get_schedules_namespace() -> str:
     """Get the namespace for schedules ConfigMap"""
-    import os
     return os.getenv("NAMESPACE", "kube-freezer")
 
 
@@ -27,23 +35,19 @@ def load_schedules() -> List[Dict[str, Any]]:
     """
     Load schedules from the separate schedules ConfigMap
     
+    The YAML is only parsed when the ConfigMap's resourceVersion changes.
+    
     Returns:
         List of schedule dictionaries
     """
     try:
-        v1 = client.CoreV1Api()
+        v1 = get_k8s_client()
         namespace = get_schedules_namespace()
         cm_name = get_schedules_configmap_name()
         
         try:
-            cm = v1.read_namespaced_config_map(name=cm_name, namespace=namespace)
-            schedules_str = cm.data.get(SCHEDULES_KEY, "[]")
-            schedules = yaml.safe_load(schedules_str) or []
-            if not isinstance(schedules, list):
-                logger.warning(f"Schedules ConfigMap contains invalid data, expected list, got {type(schedules)}")
-                return []
-            logger.debug(f"Loaded {len(schedules)} schedules from {cm_name}")
-            return schedules
+            cm = v1.read_namespaced_config_map(name=cm_name, namespace=namespace, _request_timeout=5)
+            return _parse_schedules(cm, namespace, cm_name)
         except client.exceptions.ApiException as e:
             if e.status == 404:
                 logger.debug(f"Schedules ConfigMap {cm_name} not found, returning empty list")
@@ -54,6 +58,35 @@ def load_schedules() -> List[Dict[str, Any]]:
         return []
 
 
+def _parse_schedules(cm: client.V1ConfigMap, namespace: str, cm_name: str) -> List[Dict[str, Any]]:
+    """
+    Parse the schedules list out of the schedules ConfigMap
+    
+    Args:
+        cm: Schedules ConfigMap
+        namespace: Namespace of the ConfigMap
+        cm_name: Name of the ConfigMap
+    
+    Returns:
+        List of schedule dictionaries (safe for the caller to mutate)
+    """
+    global _parsed_schedules
+    cache_key = (namespace, cm_name, cm.metadata.resource_version)
+    cached = _parsed_schedules
+    if cached is not None and cached[0] == cache_key:
+        # ConfigMap unchanged since the last parse; callers may mutate the result
+        return copy.deepcopy(cached[1])
+    
+    schedules_str = (cm.data or {}).get(SCHEDULES_KEY, "[]")
+    schedules = yaml.safe_load(schedules_str) or []
+    if not isinstance(schedules, list):
+        logger.warning(f"Schedules ConfigMap contains invalid data, expected list, got {type(schedules)}")
+        return []
+    _parsed_schedules = (cache_key, copy.deepcopy(schedules))
+    logger.debug(f"Loaded {len(schedules)} schedules from {cm_name}")
+    return schedules
+
+
 def _order_schedule(schedule: Dict[str, Any]) -> Dict[str, Any]:
     """
     Order schedule fields: name, start, end, cron, namespaces, message
@@ -81,64 +114,107 @@ def _order_schedule(schedule: Dict[str, Any]) -> Dict[str, Any]:
     return ordered
 
 
-def save_schedules(schedules: List[Dict[str, Any]]) -> bool:
+def modify_schedules(
+    mutate: Callable[[List[Dict[str, Any]]], Optional[List[Dict[str, Any]]]]
+) -> Optional[List[Dict[str, Any]]]:
     """
-    Save schedules to the separate schedules ConfigMap
+    Read-modify-write the schedules ConfigMap with optimistic concurrency
+    
+    The ConfigMap is replaced with the resourceVersion it was read at, so a
+    concurrent writer makes the API server reject the update with 409. The
+    read and mutate are then repeated against the latest state, so concurrent
+    updates are never lost and no lock is held across the round-trips.
     
     Args:
-        schedules: List of schedule dictionaries to save
+        mutate: Called with the current schedules (may be modified in place);
+            returns the schedules to save, or None to abort without saving.
+            May be called more than once.
     
     Returns:
-        True if successful, False otherwise
+        The saved (ordered) schedules, or None if aborted or saving failed
     """
     try:
-        v1 = client.CoreV1Api()
+        v1 = get_k8s_client()
         namespace = get_schedules_namespace()
         cm_name = get_schedules_configmap_name()
         
-        # Order all schedules before saving
-        ordered_schedules = [_order_schedule(s) for s in schedules]
-        
-        # Prepare schedules data with explicit ordering
-        schedules_yaml = yaml.dump(ordered_schedules, sort_keys=False) if ordered_schedules else "[]"
-        
-        try:
-            # Try to read existing ConfigMap
-            cm = v1.read_namespaced_config_map(name=cm_name, namespace=namespace)
-            # Update existing ConfigMap
-            cm.data[SCHEDULES_KEY] = schedules_yaml
-            v1.patch_namespaced_config_map(
-                name=cm_name,
-                namespace=namespace,
-                body=cm
-            )
-            logger.info(f"Updated {len(schedules)} schedules in {cm_name}")
-        except client.exceptions.ApiException as e:
-            if e.status == 404:
-                # ConfigMap doesn't exist, create it
-                cm = client.V1ConfigMap(
-                    metadata=client.V1ObjectMeta(
+        for attempt in range(SAVE_MAX_ATTEMPTS):
+            try:
+                cm = v1.read_namespaced_config_map(name=cm_name, namespace=namespace, _request_timeout=5)
+                schedules = _parse_schedules(cm, namespace, cm_name)
+            except client.exceptions.ApiException as e:
+                if e.status != 404:
+                    raise
+                cm = None
+                schedules = []
+            
+            schedules = mutate(schedules)
+            if schedules is None:
+                return None
+            
+            # Order all schedules before saving
+            ordered_schedules = [_order_schedule(s) for s in schedules]
+            
+            # Prepare schedules data with explicit ordering
+            schedules_yaml = yaml.dump(ordered_schedules, sort_keys=False) if ordered_schedules else "[]"
+            
+            try:
+                if cm is not None:
+                    # Replace carries the resourceVersion we read, so a concurrent write fails with 409
+                    if cm.data is None:
+                        cm.data = {}
+                    cm.data[SCHEDULES_KEY] = schedules_yaml
+                    v1.replace_namespaced_config_map(
                         name=cm_name,
                         namespace=namespace,
-                        labels={
-                            "app.kubernetes.io/name": "kube-freezer",
-                            "app.kubernetes.io/component": "schedules",
-                            "app.kubernetes.io/managed-by": "kubefreezer"  # NOT Helm
+                        body=cm
+                    )
+                    logger.info(f"Updated {len(ordered_schedules)} schedules in {cm_name}")
+                else:
+                    # ConfigMap doesn't exist, create it
+                    cm = client.V1ConfigMap(
+                        metadata=client.V1ObjectMeta(
+                            name=cm_name,
+                            namespace=namespace,
+                            labels={
+                                "app.kubernetes.io/name": "kube-freezer",
+                                "app.kubernetes.io/component": "schedules",
+                                "app.kubernetes.io/managed-by": "kubefreezer"  # NOT Helm
+                            }
+                        ),
+                        data={
+                            SCHEDULES_KEY: schedules_yaml
                         }
-                    ),
-                    data={
-                        SCHEDULES_KEY: schedules_yaml
-                    }
+                    )
+                    v1.create_namespaced_config_map(namespace=namespace, body=cm)
+                    logger.info(f"Created schedules ConfigMap {cm_name} with {len(ordered_schedules)} schedules")
+                return ordered_schedules
+            except client.exceptions.ApiException as e:
+                if e.status != 409:
+                    raise
+                logger.debug(
+                    f"Schedules ConfigMap {cm_name} changed concurrently, retrying "
+                    f"(attempt {attempt + 1}/{SAVE_MAX_ATTEMPTS})"
                 )
-                v1.create_namespaced_config_map(namespace=namespace, body=cm)
-                logger.info(f"Created schedules ConfigMap {cm_name} with {len(schedules)} schedules")
-            else:
-                raise
         
-        return True
+        logger.error(f"Giving up saving schedules after {SAVE_MAX_ATTEMPTS} conflicting updates")
+        return None
     except Exception as e:
         logger.error(f"Error saving schedules: {e}", exc_info=True)
-        return False
+        return None
+
+
+def save_schedules(schedules: List[Dict[str, Any]]) -> bool:
+    """
+    Save schedules to the separate schedules ConfigMap
+    
+    Args:
+        schedules: List of schedule dictionaries to save
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    return modify_schedules(lambda _current: schedules) is not None
 
 
 def add_schedule(schedule: Dict[str, Any]) -> bool:
@@ -151,11 +227,14 @@ def add_schedule(schedule: Dict[str, Any]) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    schedules = load_schedules()
     # Order the new schedule before appending
     ordered_schedule = _order_schedule(schedule)
-    schedules.append(ordered_schedule)
-    return save_schedules(schedules)
+    
+    def _append(schedules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        schedules.append(ordered_schedule)
+        return schedules
+    
+    return modify_schedules(_append) is not None
 
 
 def remove_schedule(schedule_name: str) -> bool:
@@ -168,12 +247,11 @@ def remove_schedule(schedule_name: str) -> bool:
     Returns:
         True if schedule was found and removed, False otherwise
     """
-    schedules = load_schedules()
-    original_count = len(schedules)
-    schedules = [s for s in schedules if s.get("name", "") != schedule_name]
-    
-    if len(schedules) == original_count:
-        return False  # Schedule not found
+    def _remove(schedules: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        remaining = [s for s in schedules if s.get("name", "") != schedule_name]
+        if len(remaining) == len(schedules):
+            return None  # Schedule not found
+        return remaining
     
-    return save_schedules(schedules)
+    return modify_schedules(_remove) is not None
 
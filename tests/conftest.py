@@ -0,0 +1,6 @@
+"""Shared pytest configuration"""
+import os
+import sys
+
+# Make the `app` package importable when running `pytest tests/` from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,77 @@
+"""Tests for the watch-backed ConfigMap cache"""
+from unittest.mock import MagicMock, patch
+
+from kubernetes import client
+
+from app.cache.configmap_cache import ConfigMapCache
+
+
+def _config_map(name: str, resource_version: str) -> client.V1ConfigMap:
+    return client.V1ConfigMap(
+        metadata=client.V1ObjectMeta(name=name, namespace="kube-freezer", resource_version=resource_version),
+        data={"key": "value"}
+    )
+
+
+def _run_once(cache: ConfigMapCache, name: str, events=()):
+    """Run one list + watch cycle for a name, stopping after the watch stream ends"""
+    fake_watch = MagicMock()
+    
+    def stream(func, **kwargs):
+        yield from events
+        cache._stop_event.set()
+    
+    fake_watch.stream.side_effect = stream
+    with patch("app.cache.configmap_cache.watch.Watch", return_value=fake_watch):
+        cache._run(name)
+    return fake_watch
+
+
+def test_lists_and_watches_by_name_field_selector():
+    v1 = MagicMock()
+    v1.list_namespaced_config_map.return_value = client.V1ConfigMapList(
+        items=[_config_map("kube-freezer-templates", "5")],
+        metadata=client.V1ListMeta(resource_version="5")
+    )
+    cache = ConfigMapCache("kube-freezer", v1, names=["kube-freezer-templates"])
+    
+    fake_watch = _run_once(cache, "kube-freezer-templates")
+    
+    v1.list_namespaced_config_map.assert_called_once_with(
+        namespace="kube-freezer", field_selector="metadata.name=kube-freezer-templates"
+    )
+    watch_kwargs = fake_watch.stream.call_args.kwargs
+    assert watch_kwargs["field_selector"] == "metadata.name=kube-freezer-templates"
+    assert watch_kwargs["resource_version"] == "5"
+
+
+def test_serves_watched_names_only():
+    v1 = MagicMock()
+    v1.list_namespaced_config_map.return_value = client.V1ConfigMapList(
+        items=[_config_map("kube-freezer-templates", "5")],
+        metadata=client.V1ListMeta(resource_version="5")
+    )
+    cache = ConfigMapCache("kube-freezer", v1, names=["kube-freezer-templates"])
+    assert cache.get("kube-freezer", "kube-freezer-templates") is None  # Not synced yet
+    
+    _run_once(cache, "kube-freezer-templates", events=[
+        {"type": "MODIFIED", "object": _config_map("kube-freezer-templates", "6")}
+    ])
+    
+    assert cache.is_synced("kube-freezer-templates")
+    assert cache.peek("kube-freezer", "kube-freezer-templates").metadata.resource_version == "6"
+    assert cache.get("kube-freezer", "other") is None
+    assert not cache.is_synced("other")
+
+
+def test_missing_config_map_is_synced_as_absent():
+    v1 = MagicMock()
+    v1.list_namespaced_config_map.return_value = client.V1ConfigMapList(
+        items=[], metadata=client.V1ListMeta(resource_version="7")
+    )
+    cache = ConfigMapCache("kube-freezer", v1, names=["kube-freezer-exemptions"])
+    
+    _run_once(cache, "kube-freezer-exemptions")
+    
+    assert cache.is_synced("kube-freezer-exemptions")
+    assert cache.peek("kube-freezer", "kube-freezer-exemptions") is None
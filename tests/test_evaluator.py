@@ -0,0 +1,27 @@
+"""Tests for freeze decision caching"""
+import time
+
+from app.freeze import evaluator
+from app.freeze.evaluator import is_freeze_active_cached
+
+
+def test_cached_decision_expires_at_transition_within_min_ttl():
+    evaluator._decision_cache.clear()
+    config = {
+        "freeze_enabled": True,
+        "freeze_until_ts": time.time() + 0.05,
+        "parsed_freeze_schedule": []
+    }
+    
+    assert is_freeze_active_cached(config, "team-a", 1) == (True, "Manual Freeze")
+    time.sleep(0.1)
+    assert is_freeze_active_cached(config, "team-a", 1) == (False, None)
+
+
+def test_unpredictable_decision_is_held_for_min_ttl():
+    evaluator._decision_cache.clear()
+    config = {"freeze_enabled": True, "freeze_schedule": []}  # No precomputed schedules
+    
+    is_freeze_active_cached(config, "team-a", 1)
+    valid_until, _ = evaluator._decision_cache[("team-a", 1)]
+    assert valid_until > time.time() + evaluator.DECISION_CACHE_MIN_TTL / 2
@@ -0,0 +1,99 @@
+"""Tests for ConfigMap persistence of temporary exemptions"""
+import asyncio
+import copy
+from unittest.mock import MagicMock
+
+import orjson
+from kubernetes import client
+
+from app.exemptions.manager import ExemptionManager, EXEMPTIONS_CONFIGMAP_NAME
+
+
+class FakeConfigMapApi:
+    """Stores a single ConfigMap in memory, bumping its resourceVersion on every write"""
+    
+    def __init__(self, data: dict, resource_version: str = "1"):
+        self.cm = client.V1ConfigMap(
+            metadata=client.V1ObjectMeta(name=EXEMPTIONS_CONFIGMAP_NAME, resource_version=resource_version),
+            data=data
+        )
+    
+    def read_namespaced_config_map(self, name, namespace):
+        return copy.deepcopy(self.cm)
+    
+    def patch_namespaced_config_map(self, name, namespace, body):
+        self.cm.data = dict(body.data)
+        self.cm.metadata.resource_version = str(int(self.cm.metadata.resource_version) + 1)
+        return copy.deepcopy(self.cm)
+
+
+def _manager(api, cache) -> ExemptionManager:
+    manager = ExemptionManager(storage_backend="memory")
+    manager.set_k8s_client(api)
+    manager.set_configmap_cache(cache)
+    return manager
+
+
+def test_stale_cache_after_save_does_not_roll_back():
+    async def scenario():
+        api = FakeConfigMapApi({"exemptions": "{}"})
+        stale = copy.deepcopy(api.cm)
+        cache = MagicMock()
+        cache.is_synced.return_value = True
+        cache.peek.return_value = stale
+        manager = _manager(api, cache)
+        
+        await manager._load_from_configmap()
+        exemption = await manager.create_exemption("team-a", 30, "hotfix", "alice")
+        await manager._save_to_configmap()
+        
+        # The watch hasn't delivered the write yet, the cache still holds the old version
+        await manager._load_from_configmap()
+        assert exemption.id in manager._exemptions
+        assert manager._by_namespace == {"team-a": {exemption.id}}
+        
+        # Once the cache reports the written version it is used again
+        cache.peek.return_value = copy.deepcopy(api.cm)
+        await manager._load_from_configmap()
+        assert exemption.id in manager._exemptions
+        assert manager._cache_catchup_rv is None
+    
+    asyncio.run(scenario())
+
+
+def test_newer_write_from_another_replica_is_loaded():
+    async def scenario():
+        api = FakeConfigMapApi({"exemptions": "{}"})
+        cache = MagicMock()
+        cache.is_synced.return_value = True
+        cache.peek.return_value = copy.deepcopy(api.cm)
+        manager = _manager(api, cache)
+        
+        await manager.create_exemption("team-a", 30, "hotfix", "alice")
+        await manager._save_to_configmap()
+        
+        # Another replica deletes everything before our cache catches up
+        api.patch_namespaced_config_map(EXEMPTIONS_CONFIGMAP_NAME, "kube-freezer", client.V1ConfigMap(data={"exemptions": "{}"}))
+        await manager._load_from_configmap()
+        assert manager._exemptions == {}
+        
+        # The cache skipped straight to the newest version
+        cache.peek.return_value = copy.deepcopy(api.cm)
+        await manager._load_from_configmap()
+        assert manager._cache_catchup_rv is None
+    
+    asyncio.run(scenario())
+
+
+def test_persisted_json_has_no_cached_expiry():
+    async def scenario():
+        api = FakeConfigMapApi({"exemptions": "{}"})
+        manager = _manager(api, None)
+        exemption = await manager.create_exemption("team-a", 30, "hotfix", "alice", resource_name="web")
+        await manager._save_to_configmap()
+        
+        stored = orjson.loads(api.cm.data["exemptions"])
+        assert stored == {exemption.id: exemption.to_dict()}
+        assert "_expires_ts" not in stored[exemption.id]
+    
+    asyncio.run(scenario())
@@ -0,0 +1,70 @@
+"""Tests for freeze history persistence"""
+import asyncio
+import uuid
+from unittest.mock import MagicMock
+
+import orjson
+from kubernetes import client
+
+from app.history.tracker import HistoryTracker
+from app.utils import background
+
+
+def _tracker_with_stored_events(events_json: str) -> HistoryTracker:
+    v1 = MagicMock()
+    v1.read_namespaced_config_map.return_value = client.V1ConfigMap(data={"events": events_json})
+    tracker = HistoryTracker()
+    tracker.set_k8s_client(v1)
+    return tracker
+
+
+def test_loaded_events_round_trip_byte_for_byte():
+    stored = orjson.dumps([{
+        "id": "6f1c2a4e-0d3b-4c6a-9e8f-1a2b3c4d5e6f",
+        "event_type": "enabled",
+        "timestamp": "2024-12-20T08:00:00Z",
+        "reason": "Holiday freeze",
+        "freeze_window": None,
+        "namespace": None,
+        "duration_minutes": None,
+        "triggered_by": "alice"
+    }]).decode()
+    tracker = _tracker_with_stored_events(stored)
+    
+    tracker._sync_load_from_configmap()
+    
+    assert "[" + ",".join(event.to_json() for event in tracker._events) + "]" == stored
+
+
+def test_recorded_event_json_matches_to_dict():
+    tracker = HistoryTracker(storage_backend="memory")
+    tracker.record_event("enabled", "Manual freeze", triggered_by="alice")
+    event = tracker._events[-1]
+    
+    assert orjson.loads(event.to_json()) == event.to_dict()
+
+
+def test_event_ids_are_unique_uuids():
+    tracker = HistoryTracker(storage_backend="memory")
+    for _ in range(100):
+        tracker.record_event("enabled", "Manual freeze")
+    
+    ids = [event.id for event in tracker._events]
+    assert len(set(ids)) == len(ids)
+    assert all(uuid.UUID(event_id).version == 4 and str(uuid.UUID(event_id)) == event_id for event_id in ids)
+
+
+def test_refresh_before_scheduled_save_keeps_unsaved_events():
+    async def scenario():
+        tracker = _tracker_with_stored_events("[]")
+        tracker.record_event("enabled", "Manual freeze")
+        tracker.mark_dirty()  # No flusher running, the save is scheduled as a task
+        
+        tracker._sync_load_from_configmap()
+        assert len(tracker._events) == 1
+        
+        await asyncio.gather(*background._background_tasks)
+        assert tracker._saves_in_flight == 0
+        tracker._k8s_client.patch_namespaced_config_map.assert_called_once()
+    
+    asyncio.run(scenario())
@@ -0,0 +1,26 @@
+"""Tests for cron-based freeze schedules"""
+from datetime import datetime, timezone
+
+import pytest
+
+from app.freeze.schedule import is_schedule_active, parse_schedule
+
+HOLIDAY_SCHEDULE = {
+    "name": "holiday",
+    "start": "2024-12-01T00:00:00Z",
+    "end": "2024-12-31T23:59:59Z",
+    "cron": "0 22 * * *"
+}
+
+
+def test_active_after_cron_fires():
+    schedule = parse_schedule(HOLIDAY_SCHEDULE)
+    
+    assert not is_schedule_active(schedule, datetime(2024, 12, 1, 21, 0, tzinfo=timezone.utc))
+    assert is_schedule_active(schedule, datetime(2024, 12, 1, 22, 30, tzinfo=timezone.utc))
+    assert not is_schedule_active(schedule, datetime(2025, 1, 1, 0, 0, tzinfo=timezone.utc))
+
+
+def test_unparsed_schedule_is_rejected():
+    with pytest.raises(ValueError):
+        is_schedule_active(HOLIDAY_SCHEDULE, datetime(2024, 12, 1, 22, 30, tzinfo=timezone.utc))